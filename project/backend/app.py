@@ -4,6 +4,7 @@
 from flask import Flask, jsonify
 from flask_cors import CORS
 from flask_caching import Cache
+import atexit
 import logging
 import sys
 import os
@@ -14,11 +15,15 @@ import os
 try:
     import sys
     sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-    from protection.protection import _P, _INSTANCE_ID, _CONTEXT_HASH, initialize_protection
+    from protection.protection import (
+        _STATE, _INSTANCE_ID, initialize_protection, start_background_verification
+    )
     from protection.obfuscate_utils import _O
     _PROTECTED = True
     if not initialize_protection():
         logging.warning("Environment validation notice - running in limited mode")
+    # Verified once at import; revalidated off the request path
+    start_background_verification()
 except ImportError as e:
     logging.error(f"Protection modules not found: {e}")
     _PROTECTED = False
@@ -62,9 +67,38 @@ db.init_app(app)
 # ------------------------
 # Cache Configuration
 # ------------------------
-cache = Cache(config={"CACHE_TYPE": "SimpleCache"})
+# Bounded LRU cache with TTL for memoized /predict responses
+cache = Cache(config={
+    "CACHE_TYPE": "cache_backends.LRUCache",
+    "CACHE_DEFAULT_TIMEOUT": int(os.getenv("ECOPACK_CACHE_TTL", "300")),
+    "CACHE_THRESHOLD": int(os.getenv("ECOPACK_CACHE_MAX_ENTRIES", "1000"))
+})
 cache.init_app(app)
 
+# Quantization buckets for the /predict cache key (0 = exact inputs)
+app.config["PREDICT_CACHE_WEIGHT_STEP"] = float(os.getenv("ECOPACK_CACHE_WEIGHT_STEP", "0"))
+app.config["PREDICT_CACHE_FRAGILITY_STEP"] = float(os.getenv("ECOPACK_CACHE_FRAGILITY_STEP", "0"))
+
+# ------------------------
+# Recommendation Log (write-behind)
+# ------------------------
+# Served rankings are queued in memory and bulk-inserted into
+# recommendation_logs by a background thread (opt-in)
+RECOMMENDATION_LOG = None
+if os.getenv("ECOPACK_RECOMMENDATION_LOG", "0").lower() in ("1", "true"):
+    from recommendation_log import RecommendationLogWriter, SQLAlchemyLogSink
+    with app.app_context():
+        recommendation_log_sink = SQLAlchemyLogSink(db.engine)
+    RECOMMENDATION_LOG = RecommendationLogWriter(
+        recommendation_log_sink,
+        max_queue_rows=int(os.getenv("ECOPACK_RECOMMENDATION_LOG_MAX_ROWS", "100000")),
+        batch_rows=int(os.getenv("ECOPACK_RECOMMENDATION_LOG_BATCH_ROWS", "500")),
+        flush_interval=float(os.getenv("ECOPACK_RECOMMENDATION_LOG_FLUSH_SECONDS", "1")),
+        policy=os.getenv("ECOPACK_RECOMMENDATION_LOG_POLICY", "drop")
+    )
+    # Write whatever is still queued when the process exits
+    atexit.register(RECOMMENDATION_LOG.close)
+
 # ------------------------
 # Register Middleware
 # ------------------------
@@ -80,21 +114,20 @@ cache.init_app(app)
 # Temporarily disable API key authentication for development
 @app.before_request
 def check_api_key():
-    # Environment validation check
-    if _PROTECTED:
-        try:
-            if not _P.verify(False):
-                logging.warning("Environment validation notice")
-        except Exception as e:
-            logging.warning(f"Validation check: {e}")
+    # Environment validation check (cached result, refreshed in the background)
+    if _PROTECTED and not _STATE.valid:
+        logging.warning("Environment validation notice")
     pass
 
 # ------------------------
 # Register API Routes
 # ------------------------
-from flask import request
-from predict import register_prediction_routes
-register_prediction_routes(app)
+from middleware.auth import require_admin_token
+from predict import (
+    is_ready, model_status, predictor_status, register_prediction_routes,
+    reload_models, rollback_model, scheduler_stats
+)
+register_prediction_routes(app, cache, RECOMMENDATION_LOG)
 
 # ------------------------
 # Health Check Endpoint
@@ -107,6 +140,81 @@ def health_check():
         "message": "Service is running successfully"
     }), 200
 
+# ------------------------
+# Readiness Endpoint
+# ------------------------
+@app.route("/ready", methods=["GET"])
+def readiness_check():
+    ready = is_ready()
+    return jsonify({
+        "status": "READY" if ready else "WARMING_UP",
+        "predictors": predictor_status()
+    }), 200 if ready else 503
+
+# ------------------------
+# Cache Statistics Endpoint
+# ------------------------
+@app.route("/cache/stats", methods=["GET"])
+def cache_stats():
+    return jsonify(cache.cache.stats()), 200
+
+# ------------------------
+# Inference Scheduler Statistics
+# ------------------------
+@app.route("/inference/stats", methods=["GET"])
+def inference_stats():
+    stats = scheduler_stats()
+    if stats is None:
+        return jsonify({"enabled": False}), 200
+    return jsonify({"enabled": True, **stats}), 200
+
+# ------------------------
+# Recommendation Log Statistics
+# ------------------------
+@app.route("/recommendation-log/stats", methods=["GET"])
+def recommendation_log_stats():
+    if RECOMMENDATION_LOG is None:
+        return jsonify({"enabled": False}), 200
+    return jsonify({"enabled": True, **RECOMMENDATION_LOG.stats()}), 200
+
+# ------------------------
+# Model Version Administration
+# ------------------------
+@app.route("/admin/models", methods=["GET"])
+def models_status():
+    return jsonify(model_status()), 200
+
+
+@app.route("/admin/models/reload", methods=["POST"])
+def models_reload():
+    denied = require_admin_token()
+    if denied:
+        return denied
+    # Loads and warms up synchronously; the active version serves meanwhile
+    promoted = reload_models()
+    return jsonify({"promoted": promoted, **model_status()}), 200
+
+
+@app.route("/admin/models/rollback", methods=["POST"])
+def models_rollback():
+    denied = require_admin_token()
+    if denied:
+        return denied
+    try:
+        rollback_model()
+    except LookupError as e:
+        return jsonify({"error": str(e)}), 409
+    return jsonify(model_status()), 200
+
+# ------------------------
+# Protection Verification Statistics
+# ------------------------
+@app.route("/protection/stats", methods=["GET"])
+def protection_stats():
+    if not _PROTECTED:
+        return jsonify({"protected": False}), 200
+    return jsonify({"protected": True, **_STATE.stats()}), 200
+
 # ------------------------
 # Run the Flask App
 # ------------------------
@@ -0,0 +1,112 @@
+"""
+Flask-Caching backends used by the API.
+
+LRUCache is an in-process cache with a per-entry TTL, a bounded number of
+entries with least-recently-used eviction, and hit/miss/eviction counters.
+Values are stored as-is (no pickling), so callers must not mutate cached
+objects.
+
+Enable it with:
+    Cache(config={"CACHE_TYPE": "cache_backends.LRUCache",
+                  "CACHE_THRESHOLD": 1000, "CACHE_DEFAULT_TIMEOUT": 300})
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from flask_caching.backends.base import BaseCache
+
+
+class LRUCache(BaseCache):
+    """
+    Bounded in-memory cache: TTL expiry + LRU eviction + counters.
+
+    :param threshold: maximum number of entries before the least recently
+                      used one is evicted.
+    :param default_timeout: TTL in seconds used when `set` gets no timeout.
+                            0 means entries never expire.
+    """
+
+    def __init__(self, threshold=1000, default_timeout=300, **kwargs):
+        super().__init__(default_timeout=default_timeout)
+        self._threshold = max(1, int(threshold))
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        kwargs.update(dict(threshold=config["CACHE_THRESHOLD"]))
+        return cls(*args, **kwargs)
+
+    def _expires_at(self, timeout):
+        timeout = self._normalize_timeout(timeout)
+        return time.monotonic() + timeout if timeout > 0 else None
+
+    def _live_entry(self, key):
+        """Return the entry for `key` (dropping it if expired). Caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, _ = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        return entry
+
+    def get(self, key):
+        with self._lock:
+            entry = self._live_entry(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, timeout=None):
+        with self._lock:
+            self._entries[key] = (self._expires_at(timeout), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._threshold:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return True
+
+    def add(self, key, value, timeout=None):
+        with self._lock:
+            if self._live_entry(key) is not None:
+                return False
+        return self.set(key, value, timeout)
+
+    def delete(self, key):
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def has(self, key):
+        with self._lock:
+            return self._live_entry(key) is not None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        return True
+
+    def stats(self):
+        """Counters for the /cache/stats endpoint."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self._threshold,
+                "ttl_seconds": self.default_timeout,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
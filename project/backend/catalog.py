@@ -0,0 +1,152 @@
+"""
+Material catalog loading and hot reload.
+
+The catalog is built once from files on disk into an immutable, versioned
+snapshot. A background watcher polls the source files and, when their
+mtime changes, builds a new snapshot and swaps the reference in one
+assignment. Request handlers only ever read `CatalogStore.snapshot`, so
+they always see a complete catalog and never pay for loading it.
+
+Sources:
+- config/materials_catalog.yaml : heuristic material properties
+- data/directory/materials.csv   : material attributes for the ML branch
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+
+import pandas as pd
+import yaml
+
+from scoring import MaterialCatalog
+
+
+class CatalogSnapshot:
+    """Immutable view of the catalog at one point in time."""
+
+    __slots__ = ("version", "heuristic", "materials_df", "loaded_at", "source_mtimes")
+
+    def __init__(self, version, heuristic, materials_df, source_mtimes):
+        object.__setattr__(self, "version", version)
+        object.__setattr__(self, "heuristic", heuristic)
+        object.__setattr__(self, "materials_df", materials_df)
+        object.__setattr__(self, "loaded_at", time.time())
+        object.__setattr__(self, "source_mtimes", source_mtimes)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CatalogSnapshot is immutable")
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def load_snapshot(catalog_path, materials_csv_path, categories, shipping_types):
+    """
+    Read the catalog sources and build a new snapshot.
+
+    The version is a content hash of every source, so identical files always
+    produce the same version regardless of when they were loaded.
+    """
+    mtimes = {
+        catalog_path: _mtime(catalog_path),
+        materials_csv_path: _mtime(materials_csv_path)
+    }
+    digest = hashlib.sha256()
+
+    with open(catalog_path, "rb") as f:
+        raw = f.read()
+    digest.update(raw)
+    config = yaml.safe_load(raw) or {}
+    materials = config.get("materials") or []
+    if not materials:
+        raise ValueError(f"No materials defined in {catalog_path}")
+    heuristic = MaterialCatalog(materials, categories, shipping_types)
+
+    materials_df = None
+    if os.path.exists(materials_csv_path):
+        with open(materials_csv_path, "rb") as f:
+            raw_csv = f.read()
+        digest.update(raw_csv)
+        materials_df = pd.read_csv(materials_csv_path)
+
+    return CatalogSnapshot(digest.hexdigest()[:12], heuristic, materials_df, mtimes)
+
+
+class CatalogStore:
+    """
+    Holds the current catalog snapshot and replaces it when sources change.
+
+    Readers take `store.snapshot` once per request and use that reference
+    throughout; a concurrent reload never mutates a snapshot in place.
+    """
+
+    def __init__(self, catalog_path, materials_csv_path, categories, shipping_types,
+                 poll_interval=5.0):
+        self.catalog_path = catalog_path
+        self.materials_csv_path = materials_csv_path
+        self.categories = tuple(categories)
+        self.shipping_types = tuple(shipping_types)
+        self.poll_interval = poll_interval
+        self._reload_lock = threading.Lock()
+        self._watcher = None
+        self._stop = threading.Event()
+        self.snapshot = load_snapshot(
+            catalog_path, materials_csv_path, self.categories, self.shipping_types
+        )
+
+    @property
+    def version(self):
+        return self.snapshot.version
+
+    def _sources_changed(self):
+        current = self.snapshot.source_mtimes
+        return any(_mtime(path) != mtime for path, mtime in current.items())
+
+    def reload(self, force=False):
+        """
+        Rebuild the snapshot if a source file changed (or `force` is set).
+        Returns True when a new version was swapped in. A failed load keeps
+        serving the previous snapshot.
+        """
+        with self._reload_lock:
+            if not force and not self._sources_changed():
+                return False
+            try:
+                fresh = load_snapshot(
+                    self.catalog_path, self.materials_csv_path,
+                    self.categories, self.shipping_types
+                )
+            except Exception as e:
+                logging.warning(f"Catalog reload failed, keeping {self.snapshot.version}: {e}")
+                return False
+
+            previous = self.snapshot
+            # Single reference assignment: readers see either the old or the new snapshot
+            self.snapshot = fresh
+            if fresh.version != previous.version:
+                logging.info(f"Material catalog reloaded: {previous.version} -> {fresh.version}")
+            return fresh.version != previous.version
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            self.reload()
+
+    def start_watcher(self):
+        """Start the background mtime poller (no-op if disabled or already running)."""
+        if self.poll_interval <= 0 or (self._watcher and self._watcher.is_alive()):
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, name="catalog-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self):
+        self._stop.set()
+        if self._watcher:
+            self._watcher.join(timeout=self.poll_interval + 1)
+            self._watcher = None
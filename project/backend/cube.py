@@ -0,0 +1,188 @@
+"""
+Materialized recommendation cube for O(1) heuristic lookups.
+
+The heuristic ranking depends only on (category, shipping_type,
+product_weight_kg, fragility_index). The offline builder evaluates it over a
+dense weight x fragility grid for every category/shipping pair and writes:
+
+- order.npy   : int16  [C, S, W, F, M] ranked material indices, -1 padded
+- metrics.npy : float32 [C, S, W, F, M, 4] cost, co2, final score and CO2
+                performance per material (catalog order)
+- cube.json   : grid axes, material names, the catalog version and the
+                scoring formulas version
+
+The service memory-maps the arrays and answers a request from the nearest
+grid cell, unless a feasibility threshold (a material's max weight or a
+protection level) lies between the input and the cell; those inputs are
+scored exactly. A cube is only served while its catalog and scoring formulas
+versions match the live ones; inputs outside the grid fall back to exact
+scoring.
+"""
+import json
+import os
+import time
+
+import numpy as np
+
+from scoring import FORMULAS, evaluate, feasibility_mask, round_half_even
+
+CUBE_FORMAT_VERSION = 1
+METRICS = ("predicted_cost", "co2", "sustainability_score", "co2_performance")
+
+
+def build_cube(catalog, catalog_version, out_dir, weight_max=30.0, weight_step=0.1,
+               fragility_step=0.01):
+    """
+    Evaluate the heuristic over the full grid and write the cube to `out_dir`.
+    `catalog` is a scoring.MaterialCatalog.
+    """
+    weights = np.round(np.arange(0, weight_max + weight_step / 2, weight_step), 10)
+    fragilities = np.round(np.arange(0, 1 + fragility_step / 2, fragility_step), 10)
+    fragilities = np.clip(fragilities, 0, 1)
+    n_w, n_f, n_m = len(weights), len(fragilities), len(catalog)
+    n_c, n_s = len(catalog.categories), len(catalog.shipping_types)
+
+    grid_w = np.repeat(weights, n_f)
+    grid_f = np.tile(fragilities, n_w)
+
+    order = np.empty((n_c, n_s, n_w, n_f, n_m), dtype=np.int16)
+    metrics = np.empty((n_c, n_s, n_w, n_f, n_m, len(METRICS)), dtype=np.float32)
+
+    for c, category in enumerate(catalog.categories):
+        for s, shipping in enumerate(catalog.shipping_types):
+            scores = evaluate(
+                catalog, grid_w, grid_f, [category] * len(grid_w), [shipping] * len(grid_w)
+            )
+            order[c, s] = scores.rankings().reshape(n_w, n_f, n_m)
+            cell_metrics = np.stack(
+                [scores.cost, scores.co2, scores.final_score, scores.co2_performance], axis=-1
+            )
+            metrics[c, s] = cell_metrics.reshape(n_w, n_f, n_m, len(METRICS))
+
+    os.makedirs(out_dir, exist_ok=True)
+    np.save(os.path.join(out_dir, "order.npy"), order)
+    np.save(os.path.join(out_dir, "metrics.npy"), metrics)
+    meta = {
+        "format_version": CUBE_FORMAT_VERSION,
+        "catalog_version": catalog_version,
+        "formulas_version": FORMULAS.version,
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "categories": list(catalog.categories),
+        "shipping_types": list(catalog.shipping_types),
+        "materials": list(catalog.names),
+        "weight": {"start": 0.0, "step": weight_step, "count": n_w},
+        "fragility": {"start": 0.0, "step": fragility_step, "count": n_f},
+        "metrics": list(METRICS)
+    }
+    with open(os.path.join(out_dir, "cube.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+class RecommendationCube:
+    """Memory-mapped cube loaded from a directory written by `build_cube`."""
+
+    def __init__(self, cube_dir):
+        with open(os.path.join(cube_dir, "cube.json")) as f:
+            self.meta = json.load(f)
+        if self.meta.get("format_version") != CUBE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported cube format: {self.meta.get('format_version')}")
+        self.catalog_version = self.meta["catalog_version"]
+        self.order = np.load(os.path.join(cube_dir, "order.npy"), mmap_mode="r")
+        self.metrics = np.load(os.path.join(cube_dir, "metrics.npy"), mmap_mode="r")
+        self.category_index = {c: i for i, c in enumerate(self.meta["categories"])}
+        self.shipping_index = {s: i for i, s in enumerate(self.meta["shipping_types"])}
+        self.materials = self.meta["materials"]
+
+    def serves(self, catalog_version):
+        """True when the cube was built from this exact catalog version and the live formulas."""
+        return (self.catalog_version == catalog_version and
+                self.meta.get("formulas_version") == FORMULAS.version)
+
+    @staticmethod
+    def _cell(value, axis):
+        """Nearest grid index for `value`, or None when outside the grid."""
+        position = (value - axis["start"]) / axis["step"]
+        if position < -0.5 or position > axis["count"] - 0.5:
+            return None
+        return min(axis["count"] - 1, max(0, int(round(position))))
+
+    @staticmethod
+    def _grid_value(index, axis):
+        """Input value of grid index `index`, as build_cube evaluated it."""
+        return round(axis["start"] + index * axis["step"], 10)
+
+    def lookup(self, catalog, product_weight_kg, fragility_index, category, shipping_type,
+               constraints=None, top_n=None):
+        """
+        Ranked predictions from the nearest grid cell, or None when the inputs
+        fall outside the grid or the cell's feasible materials differ from the
+        input's. `catalog` is the live scoring.MaterialCatalog (same version
+        as the cube). The cube stores the unconstrained ranking; `constraints`
+        and `top_n` are applied to it here exactly as scoring.evaluate would.
+        """
+        c = self.category_index.get(category)
+        s = self.shipping_index.get(shipping_type)
+        w = self._cell(product_weight_kg, self.meta["weight"])
+        f = self._cell(fragility_index, self.meta["fragility"])
+        if c is None or s is None or w is None or f is None:
+            return None
+
+        # The cell's ranking only holds when the same materials pass the hard
+        # limits (and the same fallback applies) at the real input
+        feasible = feasibility_mask(
+            catalog,
+            [product_weight_kg, self._grid_value(w, self.meta["weight"])],
+            [fragility_index, min(1.0, self._grid_value(f, self.meta["fragility"]))],
+            [shipping_type, shipping_type]
+        )
+        if not np.array_equal(feasible[0], feasible[1]):
+            return None
+        records = catalog.records
+
+        order = self.order[c, s, w, f]
+        order = order[order >= 0]
+        metrics = round_half_even(self.metrics[c, s, w, f][order])
+
+        if constraints:
+            allowed = np.ones(len(order), dtype=bool)
+            if constraints.get("max_cost") is not None:
+                allowed &= metrics[:, 0] <= constraints["max_cost"]
+            if constraints.get("max_co2") is not None:
+                allowed &= metrics[:, 1] <= constraints["max_co2"]
+            if constraints.get("min_recyclability") is not None:
+                recyclability = np.array([records[m]["recyclability"] for m in order])
+                allowed &= recyclability >= constraints["min_recyclability"]
+            if allowed.any():
+                order, metrics = order[allowed], metrics[allowed]
+
+        if top_n is not None:
+            order, metrics = order[:top_n], metrics[:top_n]
+
+        predictions = []
+        for rank, (m, values) in enumerate(zip(order, metrics), 1):
+            mat = records[m]
+            cost, co2, score, co2_performance = (float(v) for v in values)
+            predictions.append({
+                "rank": rank,
+                "material": mat["name"],
+                "predicted_cost": cost,
+                "co2": co2,
+                "sustainability_score": score,
+                # Additional metrics for transparency
+                "biodegradability": mat["biodegradability"],
+                "recyclability": mat["recyclability"],
+                "co2_performance": co2_performance
+            })
+        return predictions
+
+
+def load_cube(cube_dir):
+    """Load the cube in `cube_dir`, or return None if it is missing or unreadable."""
+    if not cube_dir or not os.path.exists(os.path.join(cube_dir, "cube.json")):
+        return None
+    try:
+        return RecommendationCube(cube_dir)
+    except Exception as e:
+        print(f"⚠ Warning: Could not load recommendation cube: {e}")
+        return None
@@ -1,3 +1,6 @@
+import hmac
+import os
+
 from flask import request, jsonify
 
 API_KEY = "secret123"
@@ -6,3 +9,12 @@ def require_api_key():
     key = request.headers.get("X-API-KEY")
     if key != API_KEY:
         return jsonify({"error": "Unauthorized"}), 401
+
+def require_admin_token():
+    # Admin endpoints are disabled unless ECOPACK_ADMIN_TOKEN is configured
+    token = os.getenv("ECOPACK_ADMIN_TOKEN")
+    if not token:
+        return jsonify({"error": "Admin endpoints are disabled (set ECOPACK_ADMIN_TOKEN)"}), 403
+    key = request.headers.get("X-Admin-Token", "")
+    if not hmac.compare_digest(key.encode(), token.encode()):
+        return jsonify({"error": "Unauthorized"}), 401
@@ -8,6 +8,7 @@ class Prediction(db.Model):
     rec_id = db.Column(db.Integer, primary_key=True)
     product_id = db.Column(db.Integer, db.ForeignKey('products.product_id'))
     recommended_material_id = db.Column(db.Integer, db.ForeignKey('materials.material_id'))
+    recommended_material = db.Column(db.String(100))
     cost_prediction = db.Column(db.Float)
     co2_prediction = db.Column(db.Float)
     material_rank = db.Column(db.Integer)
@@ -1,19 +1,30 @@
-from flask import request, jsonify
-import joblib
+from flask import Response, request, jsonify
+import numpy as np
 import pandas as pd
 import os
 import sys
 import yaml
 import hashlib
 import base64
+import json
+
+from catalog import CatalogStore
+from cube import load_cube
+from scoring import FORMULAS, evaluate, round_half_even, score_materials, score_products
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+from src.inference.batching import MicroBatcher
+from src.inference.model_watcher import PICKLE_FILES, ModelWatcher
+from src.inference.predictor import EcoPackPredictor
+from src.inference.registry import REGISTRY
+from src.recommendation.pareto import pareto_fronts
+from src.recommendation.weight_sweep import weight_sweep
+
 # Protection imports
 try:
-    from protection.protection import _P, require_valid_environment, _INSTANCE_ID
-    from protection.obfuscate_utils import _O, _calculate_score, _apply_weights
+    from protection.protection import _INSTANCE_ID
     _PROTECTED_MODE = True
 except ImportError:
     _PROTECTED_MODE = False
@@ -32,84 +43,810 @@ VALID_SHIPPING = eval(base64.b85decode(_VS.encode()).decode())
 MODEL_DIR = os.path.join(os.path.dirname(__file__), '..', 'ml', 'models')
 DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'directory')
 CONFIG_DIR = os.path.join(os.path.dirname(__file__), '..', 'config')
+RANKING_CONFIG_PATH = os.path.join(CONFIG_DIR, 'ranking_weights.yaml')
+
+
+def file_version(path):
+    """Short content hash of a config file, used to version cached results."""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()[:12]
+    except OSError:
+        return "none"
 
+
+# Cached results depend on the ranking config and the scoring formulas
+RANKING_CONFIG_VERSION = f"{file_version(RANKING_CONFIG_PATH)}-{FORMULAS.version}"
+
+# Load ranking configuration (shared by the heuristic and ML branches)
 try:
-    preprocessing_pipeline = joblib.load(os.path.join(MODEL_DIR, 'preprocessing', 'preprocessing_pipeline.pkl'))
-    rf_cost_model = joblib.load(os.path.join(MODEL_DIR, 'rf_cost.joblib'))
-    xgb_co2_model = joblib.load(os.path.join(MODEL_DIR, 'xgb_co2.joblib'))
-    materials_df = pd.read_csv(os.path.join(DATA_DIR, 'materials.csv'))
-    
-    # Load ranking configuration
-    with open(os.path.join(CONFIG_DIR, 'ranking_weights.yaml'), 'r') as f:
-        ranking_config = yaml.safe_load(f)
-    
+    with open(RANKING_CONFIG_PATH, 'r') as f:
+        ranking_config = yaml.safe_load(f) or {}
+except Exception as e:
+    print(f"⚠ Warning: Could not load ranking configuration: {e}")
+    ranking_config = {}
+
+# Constraint pre-filters (max_cost, max_co2, min_recyclability) and default result size
+RANKING_CONSTRAINTS = ranking_config.get("constraints") or {}
+DEFAULT_TOP_N = ranking_config.get("top_n")
+
+# Model artifacts are registered here and loaded lazily, once per process,
+# through the shared predictor registry (optionally memory-mapped so forked
+# workers share pages: ECOPACK_MODEL_MMAP=r)
+MODEL_PATHS = (
+    os.path.join(MODEL_DIR, 'preprocessing', 'preprocessing_pipeline.pkl'),
+    os.path.join(MODEL_DIR, 'rf_cost.joblib'),
+    os.path.join(MODEL_DIR, 'xgb_co2.joblib')
+)
+
+# Products in the warm-up batch run before the service reports ready
+WARMUP_BATCH_SIZE = int(os.getenv("ECOPACK_WARMUP_BATCH_SIZE", "8"))
+
+if all(os.path.exists(path) for path in MODEL_PATHS):
     USE_ML_MODELS = False  # Temporarily disabled due to data format mismatch
     USE_ADVANCED_RANKING = True
-    print("⚠ ML models loaded but disabled - using simplified predictions")
+    print("⚠ ML models available but disabled - using simplified predictions")
     print("⚠ Reason: Training data format differs from current materials database")
-except Exception as e:
-    print(f"⚠ Warning: Could not load ML models: {e}")
+else:
+    print("⚠ Warning: Could not find ML model artifacts")
     print("⚠ Using simplified predictions instead")
     USE_ML_MODELS = False
     USE_ADVANCED_RANKING = False
 
 
+# Material catalog: loaded once, swapped atomically when the source files change
+CATALOG = CatalogStore(
+    os.path.join(CONFIG_DIR, 'materials_catalog.yaml'),
+    os.path.join(DATA_DIR, 'materials.csv'),
+    VALID_CATEGORIES,
+    VALID_SHIPPING,
+    poll_interval=float(os.getenv("ECOPACK_CATALOG_RELOAD_SECONDS", "5"))
+)
+
+# Precomputed heuristic rankings (scripts/build_recommendation_cube.py); None if not built
+CUBE = load_cube(os.getenv("ECOPACK_CUBE_DIR", os.path.join(MODEL_DIR, '..', 'cube')))
+
+# Upper bound on products accepted by /predict/batch in one request
+MAX_BATCH_SIZE = int(os.getenv("ECOPACK_MAX_BATCH_SIZE", "10000"))
+
+# Products scored per products x materials pass in /predict/batch
+BATCH_CHUNK_SIZE = max(1, int(os.getenv("ECOPACK_BATCH_CHUNK_SIZE", "1000")))
+
+# Upper bound on weight vectors accepted by /predict/sweep in one request
+MAX_SWEEP_WEIGHTS = int(os.getenv("ECOPACK_MAX_SWEEP_WEIGHTS", "10000"))
+
+
 def calculate_sustainability_score(biodegradability, recyclability, is_renewable=True):
     """
     Calculate Sustainability Score based on:
     - Biodegradability (40%)
     - Recyclability (40%)
     - Renewable resources (20%)
-    
-    All inputs should be on 0-100 scale.
-    """
-    # Obfuscated calculation
-    if _PROTECTED_MODE:
-        _params = {
-            'biodegradability': biodegradability,
-            'recyclability': recyclability,
-            'renewable': is_renewable
-        }
-        return _calculate_score(_params)
-    
-    # Fallback
-    renewability_score = 80 if is_renewable else 20
-    sustainability_score = (
-        biodegradability * 0.40 +
-        recyclability * 0.40 +
-        renewability_score * 0.20
-    )
-    return round(max(0, min(100, sustainability_score)), 2)
+
+    All inputs should be on 0-100 scale. The split is the `sustainability`
+    formula in config/scoring_formulas.yaml.
+    """
+    return float(FORMULAS["sustainability"]({
+        "biodegradability": biodegradability,
+        "recyclability": recyclability,
+        "is_renewable": bool(is_renewable)
+    }))
 
 
-def calculate_co2_performance_score(co2_emissions, max_co2=50):
+def calculate_co2_performance_score(co2_emissions, max_co2=None):
     """
     Calculate CO2 Performance Score.
     Lower emissions = Higher score (inverted scale).
-    
+
     Score = 100 - (emissions / max_emissions * 100)
+    (`co2_performance` formula; max_co2 defaults to the formula's, 50)
     """
-    co2_score = 100 - (co2_emissions / max_co2 * 100)
-    return round(max(0, min(100, co2_score)), 2)
+    inputs = {"co2_emissions": co2_emissions}
+    if max_co2 is not None:
+        inputs["max_co2"] = max_co2
+    return float(FORMULAS["co2_performance"](inputs))
 
 
-def calculate_final_ranking_score(sustainability_score, co2_performance_score, alpha=0.6, beta=0.4):
+def calculate_final_ranking_score(sustainability_score, co2_performance_score, alpha=None, beta=None):
     """
     Composite Score Calculation:
     Final Score = alpha * Sustainability Score + beta * CO2 Performance Score
-    
-    Default weights: Sustainability (60%) > CO2 Impact (40%)
+
+    Default weights (`final_score` formula): Sustainability (60%) > CO2 Impact (40%)
     This ensures sustainability is prioritized over CO2 impact.
     """
-    final_score = (alpha * sustainability_score) + (beta * co2_performance_score)
-    return round(max(0, min(100, final_score)), 2)
+    inputs = {"sustainability": sustainability_score, "co2_performance": co2_performance_score}
+    if alpha is not None:
+        inputs["alpha"] = alpha
+    if beta is not None:
+        inputs["beta"] = beta
+    return float(FORMULAS["final_score"](inputs))
+
+
+# ----------------------------
+# Request validation
+# ----------------------------
+REQUIRED_FIELDS = [
+    "product_name",
+    "product_weight_kg",
+    "category",
+    "fragility_index",
+    "shipping_type"
+]
+
+
+def validate_product(data):
+    """
+    Validate one product payload.
+    Returns an error message, or None when the payload is valid.
+    """
+    # Required fields validation
+    for field in REQUIRED_FIELDS:
+        if field not in data:
+            return f"Missing required field: {field}"
+
+    # Data type validation
+    if not isinstance(data["product_weight_kg"], (int, float)):
+        return "product_weight_kg must be a number"
+
+    if not isinstance(data["fragility_index"], (int, float)):
+        return "fragility_index must be a number between 0 and 1"
+
+    if not (0 <= data["fragility_index"] <= 1):
+        return "fragility_index must be between 0 and 1"
+
+    if data["category"] not in VALID_CATEGORIES:
+        return "Invalid category value"
+
+    if data["shipping_type"] not in VALID_SHIPPING:
+        return "Invalid shipping_type value"
+
+    # Optional per-request result size
+    if data.get("top_n") is not None:
+        top_n = data["top_n"]
+        if isinstance(top_n, bool) or not isinstance(top_n, int) or top_n < 1:
+            return "top_n must be a positive integer"
+
+    return None
+
+
+def resolve_top_n(data, default=None):
+    """Result size for one product: body `top_n`, else `default`, else the config value."""
+    if data.get("top_n") is not None:
+        return data["top_n"]
+    return default if default is not None else DEFAULT_TOP_N
+
+
+def query_top_n():
+    """
+    Validated `?top_n=` query parameter. Returns (value or None when absent,
+    error message or None), with the same message as an invalid body top_n.
+    """
+    raw = request.args.get("top_n")
+    if raw is None:
+        return None, None
+    try:
+        top_n = int(raw)
+    except ValueError:
+        top_n = 0
+    if top_n < 1:
+        return None, "top_n must be a positive integer"
+    return top_n, None
+
+
+def resolve_uncertainty(data):
+    """
+    Requested cost spread for /predict: body `uncertainty`, else
+    `?uncertainty=`. Either "std" or a list of quantiles (comma-separated in
+    the query string). Returns (value or None, error message or None).
+    """
+    value = data.get("uncertainty")
+    if value is None:
+        value = request.args.get("uncertainty") or None
+        if value is not None and value != "std":
+            value = value.split(",")
+    if value is None or value == "std":
+        return value, None
+    try:
+        if isinstance(value, (str, bool)):
+            raise ValueError
+        quantiles = tuple(float(q) for q in value)
+    except (TypeError, ValueError):
+        return None, "uncertainty must be \"std\" or a list of quantiles"
+    if not quantiles or any(not 0 <= q <= 1 for q in quantiles):
+        return None, "uncertainty quantiles must be between 0 and 1"
+    return quantiles, None
+
+
+def resolve_fronts(data):
+    """
+    Pareto-front ranking for /predict: body `"ranking": "pareto"` (or
+    `?ranking=pareto`) with an optional `fronts` count (default 1).
+    Returns (fronts, or None for the weighted ranking, and an error message
+    or None).
+    """
+    ranking = data.get("ranking") or request.args.get("ranking") or "score"
+    if ranking == "score":
+        return None, None
+    if ranking != "pareto":
+        return None, "ranking must be \"score\" or \"pareto\""
+    fronts = data.get("fronts")
+    if fronts is None:
+        fronts = request.args.get("fronts", 1, type=int)
+    if isinstance(fronts, bool) or not isinstance(fronts, int) or fronts < 1:
+        return None, "fronts must be a positive integer"
+    return fronts, None
+
+
+def pareto_predictions(predictions, fronts):
+    """
+    Keep the ranked predictions on the first `fronts` Pareto fronts over
+    (predicted_cost, co2, sustainability_score), each tagged with its
+    `front`. Order is by front, then by the weighted rank.
+    """
+    if not predictions:
+        return predictions
+    objectives = np.array([
+        [p["predicted_cost"], p["co2"], -p["sustainability_score"]] for p in predictions
+    ], dtype=np.float64)
+    front = pareto_fronts(objectives, fronts)
+    order = np.argsort(front, kind="stable")
+    return [dict(predictions[i], front=int(front[i])) for i in order if not np.isnan(front[i])]
+
+
+def candidate_predictions(data, catalog):
+    """
+    Every candidate material for one validated product, scored by the
+    active branch (ML models or heuristic) with the ranking constraints
+    applied. Raises on any model/data error.
+    """
+    if USE_ML_MODELS:
+        return predict_with_models(dict(data, top_n=len(catalog.materials_df)),
+                                   catalog.materials_df, catalog.version)
+    return score_materials(
+        catalog.heuristic,
+        data["product_weight_kg"],
+        data["fragility_index"],
+        data["category"],
+        data["shipping_type"],
+        RANKING_CONSTRAINTS
+    )
+
+
+def sweep_predictions(predictions, weights, top_n):
+    """
+    Rank one product's candidates under every weight vector (cost, co2,
+    suitability) in one pass, on the min-max normalized predicted_cost, co2
+    and sustainability_score. Returns the per-vector rankings (indices into
+    `materials`) and per-material rank stability.
+    """
+    frame = pd.DataFrame({
+        "product_id": np.zeros(len(predictions), dtype=np.int64),
+        "predicted_cost": [p["predicted_cost"] for p in predictions],
+        "predicted_co2": [p["co2"] for p in predictions],
+        "Material_Suitability_Score": [p["sustainability_score"] for p in predictions],
+    })
+    sweep = weight_sweep(frame, weights)
+    stability = sweep.stability(top_n)
+    materials = [p["material"] for p in predictions]
+    return {
+        "materials": materials,
+        "rankings": [[int(sweep.index[i]) for i in ranking] for ranking in sweep.rankings(top_n)],
+        "stability": [
+            {
+                "material": materials[i],
+                "top_n_rate": round(row.top_n_rate, 4),
+                "first_rate": round(row.first_rate, 4),
+                "mean_rank": None if np.isnan(row.mean_rank) else round(row.mean_rank, 4),
+                "rank_std": None if np.isnan(row.rank_std) else round(row.rank_std, 4),
+                "best_rank": None if np.isnan(row.best_rank) else int(row.best_rank),
+                "worst_rank": None if np.isnan(row.worst_rank) else int(row.worst_rank)
+            }
+            for i, row in zip(stability.index, stability.itertuples())
+        ]
+    }
+
+
+# Material attributes fed to the models alongside the product features
+MATERIAL_FEATURES = [
+    'material_type',
+    'strength_mpa',
+    'weight_capacity',
+    'biodegradability_percent',
+    'co2_emission_score',
+    'recyclability_percent',
+    'cost_per_kg'
+]
+
+
+def build_model_frame(products, materials_df):
+    """
+    Cross join products x materials into one model input frame.
+
+    Row p * M + m holds product p paired with material m, with the same
+    columns the per-material loop used to build one row at a time.
+    """
+    n_materials = len(materials_df)
+    materials = materials_df[MATERIAL_FEATURES].reset_index(drop=True)
+    frame = build_product_frame(products)
+    frame = frame.iloc[np.repeat(np.arange(len(products)), n_materials)].reset_index(drop=True)
+    tiled = materials.iloc[np.tile(np.arange(n_materials), len(products))].reset_index(drop=True)
+    return pd.concat([frame, tiled], axis=1)
+
+
+def build_product_frame(products):
+    """Product-side model columns, one row per product."""
+    return pd.DataFrame({
+        'product_weight': [p["product_weight_kg"] for p in products],
+        'fragility_index': [p["fragility_index"] for p in products],
+        'category': [p["category"] for p in products],
+        'shipping_type': [p["shipping_type"] for p in products],
+    })
+
+
+def rank_model_predictions(predicted_cost, predicted_co2, materials_df, category, top_n=None,
+                           cost_spread=None):
+    """
+    Score and rank one product's model outputs (one value per material).
+    `top_n` overrides the configured result size. `cost_spread` (from
+    EcoPackPredictor.cost_spread) adds the cost std or quantiles per material.
+    """
+    if USE_ADVANCED_RANKING:
+        # Fixed-range scaling of the model outputs (`model_ranking_score`
+        # formula); weights may use either ranking config schema
+        sustainability = FORMULAS["model_ranking_score"]({
+            "predicted_cost": predicted_cost,
+            "predicted_co2": predicted_co2,
+            "strength_mpa": materials_df['strength_mpa'].to_numpy()
+        }, ranking_config["weights"])
+    else:
+        # Simplified sustainability scoring (backup)
+        sustainability = np.array([
+            calculate_simplified_sustainability(cost, co2, recyclability, category)
+            for cost, co2, recyclability in zip(
+                predicted_cost, predicted_co2, materials_df['recyclability_percent']
+            )
+        ], dtype=np.float64)
+
+    sustainability = round_half_even(np.clip(sustainability, 0, 100))
+    cost = round_half_even(predicted_cost)
+    co2 = round_half_even(predicted_co2)
+
+    # Sort by sustainability score (stable, like list.sort(reverse=True))
+    order = np.argsort(-sustainability, kind="stable")
+
+    # Apply top_n constraint (per request, else from config if using advanced ranking)
+    if top_n is not None:
+        order = order[:top_n]
+    elif USE_ADVANCED_RANKING:
+        order = order[:ranking_config.get("top_n", 4)]
+
+    material_types = materials_df['material_type'].to_numpy()
+    predictions = [
+        {
+            "material": material_types[m],
+            "predicted_cost": float(cost[m]),
+            "co2": float(co2[m]),
+            "sustainability_score": float(sustainability[m]),
+            "rank": rank
+        }
+        for rank, m in enumerate(order, 1)
+    ]
+    if cost_spread:
+        spread = {q: round_half_even(values) for q, values in cost_spread.items()}
+        for prediction, m in zip(predictions, order):
+            if "std" in spread:
+                prediction["predicted_cost_std"] = float(spread["std"][m])
+            else:
+                prediction["predicted_cost_quantiles"] = {str(q): float(v[m]) for q, v in spread.items()}
+    return predictions
+
+
+def predict_with_models_batch(products, materials_df, scheduler=None, catalog_version=None,
+                              uncertainty=None):
+    """
+    ML branch for many products: transform the products x materials frame
+    once and call each model once, then rank per product. With a
+    `scheduler` (MicroBatcher) the frame joins the next shared batch.
+    Otherwise only the product columns are transformed per call and the
+    material block is reused while `catalog_version` is unchanged.
+    `uncertainty` ("std" or quantiles) adds the spread across the cost
+    forest's trees and bypasses the scheduler. Raises on any model/data error.
+    """
+    n_materials = len(materials_df)
+    spread = None
+    # Native output dtypes are kept (XGBoost returns float32) so the scores
+    # match the per-row path exactly
+    if scheduler is not None and uncertainty is None:
+        predicted_cost, predicted_co2 = scheduler.predict(build_model_frame(products, materials_df))
+    else:
+        outputs = REGISTRY.get().predict_cross(
+            build_product_frame(products), materials_df[MATERIAL_FEATURES], catalog_version, uncertainty
+        )
+        predicted_cost, predicted_co2 = outputs[:2]
+        if uncertainty is not None:
+            spread = outputs[2]
+
+    return [
+        rank_model_predictions(
+            predicted_cost[p * n_materials:(p + 1) * n_materials],
+            predicted_co2[p * n_materials:(p + 1) * n_materials],
+            materials_df,
+            product["category"],
+            product.get("top_n"),
+            {q: values[p * n_materials:(p + 1) * n_materials] for q, values in spread.items()}
+            if spread else None
+        )
+        for p, product in enumerate(products)
+    ]
+
+
+def warmup_frame():
+    """
+    Representative model input for the warm-up batch: WARMUP_BATCH_SIZE
+    products cycling through every category / shipping type, crossed with
+    the current catalog.
+    """
+    products = [
+        {
+            "product_weight_kg": 0.5 + i,
+            "fragility_index": (i % 10) / 10,
+            "category": VALID_CATEGORIES[i % len(VALID_CATEGORIES)],
+            "shipping_type": VALID_SHIPPING[i % len(VALID_SHIPPING)]
+        }
+        for i in range(max(1, WARMUP_BATCH_SIZE))
+    ]
+    return build_model_frame(products, CATALOG.snapshot.materials_df)
+
+
+def build_predictor(version_dir=None):
+    """
+    Predictor for one model version directory (pickles and/or converted
+    artifacts), or for the models shipped in ml/models when None.
+    """
+    if version_dir is None:
+        paths = MODEL_PATHS
+        # Converted artifacts (scripts/convert_model_artifacts.py) load much faster
+        artifact_dir = os.getenv("ECOPACK_ARTIFACT_DIR", os.path.join(MODEL_DIR, 'fast'))
+    else:
+        paths = [os.path.join(version_dir, name) for name in PICKLE_FILES]
+        artifact_dir = version_dir
+    return EcoPackPredictor(
+        *paths,
+        mmap_mode=os.getenv("ECOPACK_MODEL_MMAP") or None,
+        # Array-compiled tree evaluation for low-latency single-product calls
+        compile_trees=os.getenv("ECOPACK_COMPILED_TREES", "0").lower() in ("1", "true"),
+        artifact_dir=artifact_dir,
+        native_xgboost=os.getenv("ECOPACK_NATIVE_XGBOOST", "0").lower() in ("1", "true")
+    )
+
+
+# New model versions dropped into ml/models/versions/<version>/ are loaded and
+# warmed up in the background, then swapped in without a restart
+MODEL_WATCHER = ModelWatcher(
+    REGISTRY,
+    os.getenv("ECOPACK_MODEL_VERSIONS_DIR", os.path.join(MODEL_DIR, 'versions')),
+    build_predictor,
+    poll_interval=float(os.getenv("ECOPACK_MODEL_RELOAD_SECONDS", "30"))
+)
+
+# Start from the newest deployed version, else the shipped models
+_latest_model = MODEL_WATCHER.latest()
+if _latest_model is not None:
+    MODEL_WATCHER.mark_seen(_latest_model[0])
+    REGISTRY.register("default", build_predictor(_latest_model[1]),
+                      warmup=warmup_frame, version=_latest_model[0])
+else:
+    REGISTRY.register("default", build_predictor(), warmup=warmup_frame,
+                      version=os.getenv("ECOPACK_MODEL_VERSION", "v1"))
+
+
+# Micro-batching of concurrent single-product ML calls: requests arriving
+# within the window share one transform + predict (0 ms = disabled)
+MICROBATCH_WINDOW_MS = float(os.getenv("ECOPACK_MICROBATCH_WINDOW_MS", "0"))
+SCHEDULER = MicroBatcher(
+    lambda frame: REGISTRY.get().predict_arrays(frame),
+    max_wait_ms=MICROBATCH_WINDOW_MS,
+    max_batch_rows=int(os.getenv("ECOPACK_MICROBATCH_MAX_ROWS", "1024"))
+) if MICROBATCH_WINDOW_MS > 0 else None
+
+
+def scheduler_stats():
+    """Micro-batching counters, or None when the scheduler is disabled."""
+    return SCHEDULER.stats() if SCHEDULER is not None else None
+
+
+def is_ready():
+    """True once the models needed to serve /predict are loaded and warmed up."""
+    return not USE_ML_MODELS or REGISTRY.is_ready()
+
+
+def predictor_status():
+    """Load / warm-up state of the registered predictors."""
+    return REGISTRY.status()
+
+
+def model_status():
+    """Active, previous and deployable model versions."""
+    return MODEL_WATCHER.status()
+
+
+def reload_models():
+    """Promote a newly deployed model version now instead of at the next poll."""
+    return MODEL_WATCHER.check()
+
+
+def rollback_model():
+    """Switch back to the previous in-memory model version (LookupError if none)."""
+    return REGISTRY.rollback()
+
+
+def predict_with_models(data, materials_df, catalog_version=None, uncertainty=None):
+    """
+    ML branch: predict cost and CO2 for every material with the trained
+    models and rank them. Concurrent calls are micro-batched when
+    ECOPACK_MICROBATCH_WINDOW_MS is set. Raises on any model/data error.
+    """
+    return predict_with_models_batch([data], materials_df, SCHEDULER, catalog_version, uncertainty)[0]
+
+
+# ----------------------------
+# Response cache keys
+# ----------------------------
+def quantize(value, step):
+    """Snap `value` to the centre of its bucket of width `step` (0 = exact)."""
+    if not step:
+        return value
+    return round(round(value / step) * step, 10)
+
+
+def quantize_product(data, weight_step=0, fragility_step=0):
+    """Copy of a validated product with weight/fragility snapped to cache buckets."""
+    product = dict(data)
+    if weight_step:
+        product["product_weight_kg"] = quantize(data["product_weight_kg"], weight_step)
+    if fragility_step:
+        product["fragility_index"] = min(1.0, max(0.0, quantize(data["fragility_index"], fragility_step)))
+    return product
+
+
+def prediction_cache_key(product, catalog_version, exact=False, top_n=None, model_version=None,
+                         uncertainty=None, fronts=None):
+    """
+    Canonical cache key for a /predict response. Only the inputs that affect
+    the ranking are included (not product_name), plus every version the
+    result depends on.
+    """
+    return "predict:" + json.dumps([
+        bool(exact),
+        top_n,
+        repr(float(product["product_weight_kg"])),
+        repr(float(product["fragility_index"])),
+        product["category"],
+        product["shipping_type"],
+        "ml" if USE_ML_MODELS else "heuristic",
+        catalog_version,
+        RANKING_CONFIG_VERSION,
+        model_version,
+        uncertainty,
+        fronts
+    ])
+
+
+def parse_batch_body():
+    """
+    Read a batch request body as either a JSON array or NDJSON
+    (one product object per line). Unless the mimetype says NDJSON, the
+    body is first parsed as one JSON document, so a single (possibly
+    pretty-printed) object is a one-item batch.
+
+    Returns a list of (product, error) tuples in input order, or None
+    when the body is neither format.
+    """
+    raw = request.get_data(as_text=True)
+    stripped = raw.lstrip()
+    is_ndjson = request.mimetype in ("application/x-ndjson", "application/jsonl")
+
+    if not is_ndjson:
+        try:
+            document = json.loads(raw)
+        except ValueError:
+            # Several objects, one per line; anything else is not a batch
+            if not stripped.startswith("{"):
+                return None
+        else:
+            if isinstance(document, dict):
+                return [(document, None)]
+            if not isinstance(document, list):
+                return None
+            return [
+                (item, None) if isinstance(item, dict) else (None, "Item must be a JSON object")
+                for item in document
+            ]
+
+    entries = []
+    for line in raw.splitlines():
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError:
+            entries.append((None, "Invalid JSON"))
+            continue
+        if isinstance(item, dict):
+            entries.append((item, None))
+        else:
+            entries.append((None, "Item must be a JSON object"))
+    return entries
+
+
+def cube_predictions(catalog, data, top_n, exact=False):
+    """
+    Heuristic predictions from the nearest cube cell, or None when exact
+    scoring must run (no cube, stale cube, `exact`, or inputs the cube does
+    not serve). Shared by /predict and /predict/batch so both answer alike.
+    """
+    if CUBE is None or exact or not CUBE.serves(catalog.version):
+        return None
+    return CUBE.lookup(
+        catalog.heuristic,
+        data["product_weight_kg"],
+        data["fragility_index"],
+        data["category"],
+        data["shipping_type"],
+        RANKING_CONSTRAINTS,
+        top_n
+    )
+
+
+# ----------------------------
+# Batch scoring & streaming
+# ----------------------------
+def iter_batch_results(entries, catalog, batch_top_n=None, exact=False):
+    """
+    Validate and score batch entries, yielding one result dict per entry in
+    input order. Entries are processed BATCH_CHUNK_SIZE at a time, each chunk
+    as one products x materials pass, so memory stays bounded by the chunk
+    rather than the whole batch. On the heuristic branch each entry is
+    answered from the cube exactly when /predict would be (`exact` or the
+    entry's own "exact" forces scoring), so single and batch results match.
+    """
+    for start in range(0, len(entries), BATCH_CHUNK_SIZE):
+        results = []
+        valid = []
+        ranked = None
+        for offset, (item, error) in enumerate(entries[start:start + BATCH_CHUNK_SIZE]):
+            if error is None:
+                error = validate_product(item)
+            result = {"index": start + offset}
+            if item is not None:
+                result["product_name"] = item.get("product_name")
+            if error:
+                result.update({"status": "error", "error": error})
+            else:
+                valid.append((offset, item))
+            results.append(result)
+
+        if USE_ML_MODELS and valid:
+            try:
+                ranked = predict_with_models_batch(
+                    [dict(item, top_n=resolve_top_n(item, batch_top_n)) for _, item in valid],
+                    catalog.materials_df,
+                    catalog_version=catalog.version
+                )
+            except Exception as e:
+                ranked = None
+                for offset, _ in valid:
+                    results[offset].update({"status": "error", "error": f"ML prediction failed: {str(e)}"})
+        elif valid:
+            ranked = [
+                cube_predictions(catalog, item, resolve_top_n(item, batch_top_n),
+                                 exact or bool(item.get("exact")))
+                for _, item in valid
+            ]
+            for (offset, _), predictions in zip(valid, ranked):
+                results[offset]["served_from"] = "exact" if predictions is None else "cube"
+            # Entries the cube does not answer are scored in one pass
+            pending = [i for i, predictions in enumerate(ranked) if predictions is None]
+            if pending:
+                scored = score_products(
+                    catalog.heuristic,
+                    [valid[i][1]["product_weight_kg"] for i in pending],
+                    [valid[i][1]["fragility_index"] for i in pending],
+                    [valid[i][1]["category"] for i in pending],
+                    [valid[i][1]["shipping_type"] for i in pending],
+                    RANKING_CONSTRAINTS,
+                    [resolve_top_n(valid[i][1], batch_top_n) for i in pending]
+                )
+                for i, predictions in zip(pending, scored):
+                    ranked[i] = predictions
+        for (offset, _), predictions in zip(valid, ranked or []):
+            results[offset]["predictions"] = predictions
+            results[offset]["status"] = "success"
+
+        yield from results
+
+
+def wants_stream():
+    """Streaming is opt-in: `Accept: application/x-ndjson` or `?stream=1`."""
+    return (
+        "application/x-ndjson" in request.headers.get("Accept", "") or
+        request.args.get("stream", "").lower() in ("1", "true")
+    )
+
+
+def ndjson_response(items, catalog_version, served_from=None, model_version=None):
+    """
+    Stream `items` (any iterable of dicts) as NDJSON, one object per line.
+    Versions travel in headers because there is no enclosing envelope.
+    """
+    def generate():
+        for item in items:
+            yield json.dumps(item) + "\n"
+
+    headers = {"X-Catalog-Version": catalog_version}
+    if served_from:
+        headers["X-Served-From"] = served_from
+    if model_version:
+        headers["X-Model-Version"] = model_version
+    return Response(generate(), mimetype="application/x-ndjson", headers=headers)
+
+
+def log_recommendations(recommendation_log, product, predictions):
+    """
+    Queue served predictions for write-behind persistence. The optional
+    integer `product_id` of the request becomes the logged product.
+    """
+    if recommendation_log is None or not predictions:
+        return
+    product_id = product.get("product_id") if isinstance(product, dict) else None
+    if isinstance(product_id, bool) or not isinstance(product_id, int):
+        product_id = None
+    recommendation_log.log(product_id, predictions)
+
+
+def logged_rows(rows, recommendation_log, product):
+    """Yield `rows` and log them once the stream has been written."""
+    served = []
+    for row in rows:
+        served.append(row)
+        yield row
+    log_recommendations(recommendation_log, product, served)
+
+
+def logged_batch_results(results, entries, recommendation_log):
+    """Yield batch results, logging each successful product's predictions."""
+    for result in results:
+        if "predictions" in result:
+            log_recommendations(recommendation_log, entries[result["index"]][0], result["predictions"])
+        yield result
+
+
+def register_prediction_routes(app, cache=None, recommendation_log=None):
+    """
+    Register /predict and /predict/batch on `app`. When a Flask-Caching
+    `cache` is given, /predict responses are memoized per canonical product
+    profile; PREDICT_CACHE_WEIGHT_STEP / PREDICT_CACHE_FRAGILITY_STEP in
+    app.config set the quantization buckets (0 = exact match). With a
+    `recommendation_log` (recommendation_log.RecommendationLogWriter) every
+    served ranking is queued for recommendation_logs.
+    """
+    weight_step = float(app.config.get("PREDICT_CACHE_WEIGHT_STEP", 0) or 0)
+    fragility_step = float(app.config.get("PREDICT_CACHE_FRAGILITY_STEP", 0) or 0)
 
+    # Poll the catalog sources in the background; requests only read the snapshot
+    CATALOG.start_watcher()
 
-def register_prediction_routes(app):
+    # Load and warm the models off the request path; /ready reports when done
+    if USE_ML_MODELS:
+        REGISTRY.warm_up_async()
+        MODEL_WATCHER.start_watcher()
 
     @app.route("/predict", methods=["POST"])
     def predict():
         data = request.get_json()
+        catalog = CATALOG.snapshot
+        model_version = REGISTRY.version() if USE_ML_MODELS else None
 
         # ----------------------------
         # 1. Check if JSON is provided
@@ -118,115 +855,60 @@ def register_prediction_routes(app):
             return jsonify({"error": "Request body must be JSON"}), 400
 
         # ----------------------------
-        # 2. Required fields validation
-        # ----------------------------
-        required_fields = [
-            "product_name",
-            "product_weight_kg",
-            "category",
-            "fragility_index",
-            "shipping_type"
-        ]
-
-        for field in required_fields:
-            if field not in data:
-                return jsonify({
-                    "error": f"Missing required field: {field}"
-                }), 400
-
-        # ----------------------------
-        # 3. Data type validation
+        # 2. Field & data type validation
         # ----------------------------
-        if not isinstance(data["product_weight_kg"], (int, float)):
-            return jsonify({"error": "product_weight_kg must be a number"}), 400
+        error = validate_product(data)
+        if error:
+            return jsonify({"error": error}), 400
+        default_top_n, error = query_top_n()
+        if error:
+            return jsonify({"error": error}), 400
 
-        if not isinstance(data["fragility_index"], (int, float)):
-            return jsonify({"error": "fragility_index must be a number between 0 and 1"}), 400
+        # Exact scoring can be forced past the precomputed cube
+        exact = bool(data.get("exact")) or request.args.get("exact", "").lower() in ("1", "true")
+        top_n = resolve_top_n(data, default_top_n)
+        stream = wants_stream()
 
-        if not (0 <= data["fragility_index"] <= 1):
-            return jsonify({"error": "fragility_index must be between 0 and 1"}), 400
+        # Optional cost range from the random forest's trees (ML branch only)
+        uncertainty, error = resolve_uncertainty(data)
+        if error:
+            return jsonify({"error": error}), 400
+        if uncertainty is not None and not USE_ML_MODELS:
+            return jsonify({"error": "uncertainty requires the ML models"}), 400
 
-        if data["category"] not in VALID_CATEGORIES:
-            return jsonify({"error": "Invalid category value"}), 400
+        # Optional Pareto fronts instead of the weighted top-N; every
+        # candidate enters the front computation
+        fronts, error = resolve_fronts(data)
+        if error:
+            return jsonify({"error": error}), 400
+        if fronts is not None:
+            top_n = None
 
-        if data["shipping_type"] not in VALID_SHIPPING:
-            return jsonify({"error": "Invalid shipping_type value"}), 400
+        # ----------------------------
+        # 3. Response cache lookup
+        # ----------------------------
+        cache_key = None
+        if cache is not None:
+            data = quantize_product(data, weight_step, fragility_step)
+            cache_key = prediction_cache_key(data, catalog.version, exact, top_n, model_version, uncertainty,
+                                             fronts)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                log_recommendations(recommendation_log, data, cached["predictions"])
+                if stream:
+                    return ndjson_response(cached["predictions"], catalog.version,
+                                           cached.get("served_from"), model_version)
+                return jsonify(cached), 200
 
         # ----------------------------
         # 4. ML Model Prediction Logic
         # ----------------------------
         if USE_ML_MODELS:
             try:
-                predictions = []
-                
-                # For each material, create a prediction
-                for _, material in materials_df.iterrows():
-                    # Create input dataframe with product + material features
-                    input_data = pd.DataFrame([{
-                        'product_weight': data["product_weight_kg"],
-                        'fragility_index': data["fragility_index"],
-                        'category': data["category"],
-                        'shipping_type': data["shipping_type"],
-                        'material_type': material['material_type'],
-                        'strength_mpa': material['strength_mpa'],
-                        'weight_capacity': material['weight_capacity'],
-                        'biodegradability_percent': material['biodegradability_percent'],
-                        'co2_emission_score': material['co2_emission_score'],
-                        'recyclability_percent': material['recyclability_percent'],
-                        'cost_per_kg': material['cost_per_kg']
-                    }])
-                    
-                    # Transform and predict
-                    X_transformed = preprocessing_pipeline.transform(input_data)
-                    predicted_cost = rf_cost_model.predict(X_transformed)[0]
-                    predicted_co2 = xgb_co2_model.predict(X_transformed)[0]
-                    
-                    # Use advanced ranking if available, otherwise simplified
-                    if USE_ADVANCED_RANKING:
-                        # Advanced ranking logic from your ranker.py
-                        w = ranking_config["weights"]
-                        
-                        # Min-max normalization within this batch
-                        # (In production, you'd normalize across all materials first)
-                        cost_norm = 1 - (predicted_cost / 100)  # Inverse: lower cost = better
-                        co2_norm = 1 - (predicted_co2 / 50)     # Inverse: lower CO2 = better
-                        suit_norm = material['strength_mpa'] / 30  # Higher strength = better
-                        
-                        ranking_score = (
-                            w["cost"] * max(0, cost_norm) +
-                            w["co2"] * max(0, co2_norm) +
-                            w["suitability"] * max(0, suit_norm)
-                        )
-                        
-                        sustainability = ranking_score * 100
-                    else:
-                        # Simplified sustainability scoring (backup)
-                        sustainability = calculate_simplified_sustainability(
-                            predicted_cost, 
-                            predicted_co2, 
-                            material['recyclability_percent'],
-                            data["category"]
-                        )
-                    
-                    predictions.append({
-                        "material": material['material_type'],
-                        "predicted_cost": round(float(predicted_cost), 2),
-                        "co2": round(float(predicted_co2), 2),
-                        "sustainability_score": round(float(max(0, min(100, sustainability))), 2)
-                    })
-                
-                # Sort by sustainability score
-                predictions.sort(key=lambda x: x["sustainability_score"], reverse=True)
-                
-                # Apply top_n constraint from config if using advanced ranking
-                if USE_ADVANCED_RANKING:
-                    top_n = ranking_config.get("top_n", 4)
-                    predictions = predictions[:top_n]
-                
-                # Add ranks
-                for idx, pred in enumerate(predictions, 1):
-                    pred["rank"] = idx
-                
+                predictions = predict_with_models(
+                    dict(data, top_n=top_n if fronts is None else len(catalog.materials_df)),
+                    catalog.materials_df, catalog.version, uncertainty
+                )
             except Exception as e:
                 import traceback
                 error_details = traceback.format_exc()
@@ -241,216 +923,149 @@ def register_prediction_routes(app):
             # each material minimizes CO2 impact while maximizing sustainability,
             # based on the product's physical and logistical requirements.
             
-            # === MATERIAL DATABASE ===
-            # Packaging materials with comprehensive properties
-            materials_data = [
-                {
-                    "name": "Recycled Cardboard", 
-                    "base_co2_per_kg": 1.3,        # kg CO2 per kg material
-                    "recyclability": 88,           # 0-100 scale
-                    "biodegradability": 85,        # 0-100 scale
-                    "is_renewable": True,          # From renewable resources
-                    "strength_factor": 0.7,        # Thickness multiplier for strength
-                    "max_weight": 15,              # kg capacity
-                    "fragility_protection": 6,     # Protection level 1-10
-                    "shipping_suitability": {"Air": 0.9, "Road": 1.0, "Sea": 0.95},
-                    "category_bonus": {"Food": 1.1, "Electronics": 0.9, "Cosmetics": 0.95, "Pharmacy": 0.9}
-                },
-                {
-                    "name": "PLA (Polylactic Acid)", 
-                    "base_co2_per_kg": 0.7,
-                    "recyclability": 92, 
-                    "biodegradability": 95,
-                    "is_renewable": True,
-                    "strength_factor": 0.85,
-                    "max_weight": 10,
-                    "fragility_protection": 8,
-                    "shipping_suitability": {"Air": 1.0, "Road": 0.95, "Sea": 0.7},
-                    "category_bonus": {"Food": 1.0, "Electronics": 1.1, "Cosmetics": 1.15, "Pharmacy": 1.1}
-                },
-                {
-                    "name": "Kraft Paper", 
-                    "base_co2_per_kg": 1.1,
-                    "recyclability": 85, 
-                    "biodegradability": 90,
-                    "is_renewable": True,
-                    "strength_factor": 0.5,
-                    "max_weight": 8,
-                    "fragility_protection": 4,
-                    "shipping_suitability": {"Air": 0.7, "Road": 1.0, "Sea": 0.9},
-                    "category_bonus": {"Food": 1.05, "Electronics": 0.7, "Cosmetics": 1.0, "Pharmacy": 0.9}
-                },
-                {
-                    "name": "Bio-Plastic (Cornstarch)", 
-                    "base_co2_per_kg": 0.8,
-                    "recyclability": 90, 
-                    "biodegradability": 98,
-                    "is_renewable": True,
-                    "strength_factor": 0.8,
-                    "max_weight": 12,
-                    "fragility_protection": 7,
-                    "shipping_suitability": {"Air": 0.95, "Road": 1.0, "Sea": 0.9},
-                    "category_bonus": {"Food": 1.15, "Electronics": 1.0, "Cosmetics": 1.1, "Pharmacy": 1.2}
-                },
-                {
-                    "name": "Mushroom Packaging",
-                    "base_co2_per_kg": 0.4,
-                    "recyclability": 75,
-                    "biodegradability": 100,
-                    "is_renewable": True,
-                    "strength_factor": 0.6,
-                    "max_weight": 7,
-                    "fragility_protection": 9,
-                    "shipping_suitability": {"Air": 0.8, "Road": 0.95, "Sea": 0.6},
-                    "category_bonus": {"Food": 0.9, "Electronics": 1.2, "Cosmetics": 1.0, "Pharmacy": 0.95}
-                },
-                {
-                    "name": "Bagasse (Sugarcane Fiber)",
-                    "base_co2_per_kg": 0.5,
-                    "recyclability": 80,
-                    "biodegradability": 95,
-                    "is_renewable": True,
-                    "strength_factor": 0.55,
-                    "max_weight": 6,
-                    "fragility_protection": 5,
-                    "shipping_suitability": {"Air": 0.75, "Road": 1.0, "Sea": 0.85},
-                    "category_bonus": {"Food": 1.2, "Electronics": 0.8, "Cosmetics": 1.0, "Pharmacy": 1.0}
-                }
-            ]
-            
-            # =====================================================
-            # STEP 1: FEASIBILITY CHECK
-            # =====================================================
-            # Filter materials based on product requirements
-            feasible_materials = []
-            
-            for mat in materials_data:
-                # 1a. Weight Capacity Check
-                if data["product_weight_kg"] > mat["max_weight"]:
-                    continue
-                
-                # 1b. Fragility Protection Check
-                # High fragility (>0.7) requires protection level >= 6
-                # Medium fragility (0.4-0.7) requires protection level >= 4
-                required_protection = 6 if data["fragility_index"] > 0.7 else (4 if data["fragility_index"] > 0.4 else 2)
-                if mat["fragility_protection"] < required_protection:
-                    continue
-                
-                # 1c. Shipping Type Suitability Check
-                shipping_suitability = mat["shipping_suitability"].get(data["shipping_type"], 0)
-                if shipping_suitability < 0.7:  # Below 70% suitability = not feasible
-                    continue
-                
-                feasible_materials.append(mat)
-            
-            # Fallback: If no materials pass, include all with reduced scores
-            if not feasible_materials:
-                feasible_materials = materials_data
-                print("Warning: No materials meet all feasibility criteria. Showing all options.")
-            
-            # =====================================================
-            # STEP 2 & 3: CO2 ESTIMATION & SUSTAINABILITY SCORING
-            # =====================================================
-            predictions = []
-            
-            for mat in feasible_materials:
-                # ---------------------------------------------------
-                # 2a. Calculate Required Material Thickness
-                # ---------------------------------------------------
-                # Thickness based on weight and fragility requirements
-                base_thickness = 1.0  # Base thickness in relative units
-                weight_factor = 1 + (data["product_weight_kg"] / mat["max_weight"]) * 0.5
-                fragility_factor = 1 + (data["fragility_index"] * mat["strength_factor"])
-                required_thickness = base_thickness * weight_factor * fragility_factor
-                
-                # ---------------------------------------------------
-                # 2b. CO2 Impact Estimation
-                # ---------------------------------------------------
-                # CO2 = base_emission * weight * thickness * shipping_multiplier
-                shipping_emission_multiplier = {
-                    "Air": 3.5,      # Highest emissions (air freight)
-                    "Road": 1.5,     # Medium emissions (truck)
-                    "Sea": 0.8       # Lowest emissions (ship)
-                }.get(data["shipping_type"], 1.5)
-                
-                co2_emissions = (
-                    mat["base_co2_per_kg"] * 
-                    data["product_weight_kg"] * 
-                    required_thickness * 
-                    shipping_emission_multiplier
-                )
-                
-                # ---------------------------------------------------
-                # 2c. Predicted Cost Calculation
-                # ---------------------------------------------------
-                base_cost_per_kg = 45  # Base cost in Rs.
-                cost = (
-                    base_cost_per_kg * 
-                    data["product_weight_kg"] * 
-                    required_thickness * 
-                    (1 / mat["strength_factor"])  # Stronger materials = less material needed
-                )
-                
-                # ---------------------------------------------------
-                # 3a. Sustainability Score Calculation
-                # ---------------------------------------------------
-                # Biodegradability (40%) + Recyclability (40%) + Renewability (20%)
-                category_modifier = mat["category_bonus"].get(data["category"], 1.0)
-                
-                adjusted_biodegradability = min(100, mat["biodegradability"] * category_modifier)
-                adjusted_recyclability = min(100, mat["recyclability"] * category_modifier)
-                
-                sustainability_score = calculate_sustainability_score(
-                    adjusted_biodegradability,
-                    adjusted_recyclability,
-                    mat["is_renewable"]
+            # Nearest-cell answer from the precomputed cube when it matches
+            # this catalog version and the inputs are inside its grid
+            predictions = None
+            if fronts is None:
+                predictions = cube_predictions(catalog, data, top_n, exact)
+            served_from = "cube" if predictions is not None else "exact"
+
+            # Feasibility, CO2/cost estimation, constraint pre-filters,
+            # sustainability scoring and top-N selection are computed for the
+            # whole catalog at once.
+            if predictions is None and stream and fronts is None:
+                # Ranked rows are materialized lazily while the response is
+                # written, so memory does not grow with the result size
+                scores = evaluate(
+                    catalog.heuristic,
+                    [data["product_weight_kg"]],
+                    [data["fragility_index"]],
+                    [data["category"]],
+                    [data["shipping_type"]],
+                    RANKING_CONSTRAINTS
                 )
-                
-                # ---------------------------------------------------
-                # 3b. CO2 Performance Score
-                # ---------------------------------------------------
-                # Lower emissions = Higher score
-                co2_performance_score = calculate_co2_performance_score(co2_emissions, max_co2=50)
-                
-                # =====================================================
-                # STEP 4: COMPOSITE SCORE CALCULATION
-                # =====================================================
-                # Final Score = alpha(Sustainability) + beta(CO2 Performance)
-                # Sustainability is prioritized: alpha=0.6, beta=0.4
-                final_score = calculate_final_ranking_score(
-                    sustainability_score,
-                    co2_performance_score,
-                    alpha=0.6,  # Sustainability weight (60%)
-                    beta=0.4    # CO2 impact weight (40%)
+                rows = scores.rows(0, top_n=top_n)
+                if recommendation_log is not None:
+                    rows = logged_rows(rows, recommendation_log, data)
+                return ndjson_response(rows, catalog.version, served_from)
+            if predictions is None:
+                predictions = score_materials(
+                    catalog.heuristic,
+                    data["product_weight_kg"],
+                    data["fragility_index"],
+                    data["category"],
+                    data["shipping_type"],
+                    RANKING_CONSTRAINTS,
+                    top_n
                 )
-                
-                predictions.append({
-                    "rank": 0,
-                    "material": mat["name"],
-                    "predicted_cost": round(cost, 2),
-                    "co2": round(co2_emissions, 2),
-                    "sustainability_score": final_score,
-                    # Additional metrics for transparency
-                    "biodegradability": mat["biodegradability"],
-                    "recyclability": mat["recyclability"],
-                    "co2_performance": co2_performance_score
-                })
-            
-            # =====================================================
-            # STEP 5: FINAL RANKING
-            # =====================================================
-            # Sort by Final Score (descending) - highest score = Rank #1
-            predictions.sort(key=lambda x: x["sustainability_score"], reverse=True)
-            
-            # Assign ranks
-            for idx, pred in enumerate(predictions, 1):
-                pred["rank"] = idx
+
+        if fronts is not None:
+            predictions = pareto_predictions(predictions, fronts)
 
         # ----------------------------
         # 5. Return response
         # ----------------------------
-        return jsonify({
+        payload = {
             "predictions": predictions,
-            "model_version": "v1.0",
+            "catalog_version": catalog.version,
             "status": "success"
-        }), 200
+        }
+        if USE_ML_MODELS:
+            payload["model_version"] = model_version
+        else:
+            payload["served_from"] = served_from
+        if cache_key is not None:
+            cache.set(cache_key, payload)
+        log_recommendations(recommendation_log, data, predictions)
+        if stream:
+            return ndjson_response(predictions, catalog.version, payload.get("served_from"), model_version)
+        return jsonify(payload), 200
+
+    @app.route("/predict/batch", methods=["POST"])
+    def predict_batch():
+        catalog = CATALOG.snapshot
+        batch_top_n, error = query_top_n()
+        if error:
+            return jsonify({"error": error}), 400
+        model_version = REGISTRY.version() if USE_ML_MODELS else None
+
+        # ----------------------------
+        # 1. Parse JSON array / NDJSON body
+        # ----------------------------
+        entries = parse_batch_body()
+        if entries is None:
+            return jsonify({"error": "Request body must be a JSON array or NDJSON"}), 400
+        if len(entries) > MAX_BATCH_SIZE:
+            return jsonify({"error": f"Batch exceeds {MAX_BATCH_SIZE} products"}), 413
+
+        # ----------------------------
+        # 2. Validate & score chunk by chunk
+        # ----------------------------
+        exact = request.args.get("exact", "").lower() in ("1", "true")
+        results = iter_batch_results(entries, catalog, batch_top_n, exact)
+        if recommendation_log is not None:
+            results = logged_batch_results(results, entries, recommendation_log)
+
+        # Streaming mode: one result block per line, as soon as its chunk is scored
+        if wants_stream():
+            return ndjson_response(results, catalog.version, model_version=model_version)
+
+        # ----------------------------
+        # 3. Return response
+        # ----------------------------
+        results = list(results)
+        failed = sum(1 for r in results if r["status"] == "error")
+        payload = {
+            "results": results,
+            "count": len(results),
+            "errors": failed,
+            "catalog_version": catalog.version,
+            "status": "success"
+        }
+        if USE_ML_MODELS:
+            payload["model_version"] = model_version
+        return jsonify(payload), 200
+
+    @app.route("/predict/sweep", methods=["POST"])
+    def predict_sweep():
+        data = request.get_json(silent=True)
+        catalog = CATALOG.snapshot
+
+        # ----------------------------
+        # 1. Product & weight validation
+        # ----------------------------
+        if not isinstance(data, dict):
+            return jsonify({"error": "Request body must be JSON"}), 400
+        error = validate_product(data)
+        if error:
+            return jsonify({"error": error}), 400
+        weights = data.get("weights")
+        if isinstance(weights, list) and len(weights) > MAX_SWEEP_WEIGHTS:
+            return jsonify({"error": f"Sweep exceeds {MAX_SWEEP_WEIGHTS} weight vectors"}), 413
+        default_top_n, error = query_top_n()
+        if error:
+            return jsonify({"error": error}), 400
+        top_n = resolve_top_n(data, default_top_n)
+
+        # ----------------------------
+        # 2. Score the candidates once, rank under every weight vector
+        # ----------------------------
+        try:
+            predictions = candidate_predictions(data, catalog)
+        except Exception as e:
+            return jsonify({"error": f"ML prediction failed: {str(e)}"}), 500
+        try:
+            result = sweep_predictions(predictions, weights, top_n or len(predictions))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        payload = {
+            **result,
+            "count": len(result["rankings"]),
+            "top_n": top_n or len(predictions),
+            "catalog_version": catalog.version,
+            "status": "success"
+        }
+        if USE_ML_MODELS:
+            payload["model_version"] = REGISTRY.version()
+        return jsonify(payload), 200
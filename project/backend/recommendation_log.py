@@ -0,0 +1,301 @@
+"""
+Write-behind persistence of served recommendations (recommendation_logs).
+
+Request handlers hand each response's ranked rows to
+RecommendationLogWriter.log, which only appends a reference to an
+in-memory queue. A background thread drains the queue and writes the rows
+with one bulk INSERT per batch, as soon as `batch_rows` rows are waiting
+or the oldest row has waited `flush_interval` seconds. Rows are timestamped
+when they are queued, not when they are written.
+
+The queue is bounded by `max_queue_rows`. When it is full the writer
+either drops the new response's rows ("drop", the default, never blocks a
+request) or waits up to `block_timeout` for the writer to make room
+("block") before dropping. Failed writes are retried `max_retries` times,
+then the batch is dropped. `close()` (registered at exit) writes
+everything still queued. `stats()` reports queue depth, lag and
+dropped/failed row counts.
+
+SQLAlchemyLogSink writes through a SQLAlchemy engine, so the same code
+runs on the default sqlite:///ecopackai.db and on Postgres.
+
+Enable it with ECOPACK_RECOMMENDATION_LOG=1 (see app.py).
+"""
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+POLICIES = ("drop", "block")
+
+
+class RecommendationLogWriter:
+    """
+    Bounded queue of ranked rows flushed in bulk by a worker thread.
+
+    :param sink: callable taking a list of row tuples
+                 (product_id, material, cost, co2, rank, created_at)
+                 and persisting them in one transaction.
+    :param max_queue_rows: rows held in memory before the policy applies.
+    :param batch_rows: rows per write; a flush starts once this many wait.
+    :param flush_interval: seconds the oldest row may wait before a flush.
+    :param policy: "drop" or "block" (see module docstring).
+    :param block_timeout: seconds "block" waits for room before dropping.
+    :param max_retries: retries of a failed write before its rows are dropped.
+    """
+
+    def __init__(self, sink, max_queue_rows=100000, batch_rows=500, flush_interval=1.0,
+                 policy="drop", block_timeout=0.05, max_retries=3):
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {', '.join(POLICIES)}")
+        self.sink = sink
+        self.max_queue_rows = max(1, int(max_queue_rows))
+        self.batch_rows = max(1, int(batch_rows))
+        self.flush_interval = max(0.0, float(flush_interval))
+        self.policy = policy
+        self.block_timeout = max(0.0, float(block_timeout))
+        self.max_retries = max(0, int(max_retries))
+        # (queued_at monotonic, created_at epoch, product_id, predictions, attempts)
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._worker = None
+        self._stopped = False
+        self._flush_requested = False
+        # Metrics
+        self.queued_rows = 0
+        self.enqueued_rows = 0
+        self.written_rows = 0
+        self.dropped_rows = 0
+        self.failed_rows = 0
+        self.batches = 0
+        self.write_errors = 0
+        self.last_flush_lag = 0.0
+        self.max_flush_lag = 0.0
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._stopped = False
+            self._worker = threading.Thread(target=self._run, name="recommendation-log", daemon=True)
+            self._worker.start()
+
+    def log(self, product_id, predictions):
+        """
+        Queue one response's ranked predictions (dicts with material,
+        predicted_cost, co2 and rank). Returns False when the rows were
+        dropped because the queue is full.
+        """
+        n_rows = len(predictions)
+        if n_rows == 0:
+            return True
+        item = (time.monotonic(), time.time(), product_id, predictions, 0)
+        with self._cond:
+            if self._stopped and self._worker is not None:
+                self.dropped_rows += n_rows
+                return False
+            self._ensure_worker()
+            if self.policy == "block":
+                deadline = time.monotonic() + self.block_timeout
+                while self.queued_rows + n_rows > self.max_queue_rows and self.queued_rows:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            # A response larger than the whole queue is accepted into an empty queue
+            if self.queued_rows + n_rows > self.max_queue_rows and self.queued_rows:
+                self.dropped_rows += n_rows
+                return False
+            self._queue.append(item)
+            self.queued_rows += n_rows
+            self.enqueued_rows += n_rows
+            if self.queued_rows >= self.batch_rows:
+                self._cond.notify_all()
+        return True
+
+    def _take_batch(self):
+        """Block until a size or time threshold (or shutdown) is reached, then pop one batch."""
+        with self._cond:
+            while True:
+                if self._queue:
+                    age = time.monotonic() - self._queue[0][0]
+                    if (self.queued_rows >= self.batch_rows or age >= self.flush_interval or
+                            self._stopped or self._flush_requested):
+                        break
+                    self._cond.wait(self.flush_interval - age)
+                elif self._stopped:
+                    return None
+                else:
+                    self._flush_requested = False
+                    self._cond.wait()
+
+            batch, rows = [], 0
+            while self._queue and (not batch or rows + len(self._queue[0][3]) <= self.batch_rows):
+                item = self._queue.popleft()
+                batch.append(item)
+                rows += len(item[3])
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                return
+            self._write(batch)
+
+    def _write(self, batch):
+        rows = [
+            (product_id, p["material"], p["predicted_cost"], p["co2"], p["rank"],
+             datetime.fromtimestamp(created_at, timezone.utc).replace(tzinfo=None))
+            for _, created_at, product_id, predictions, _ in batch
+            for p in predictions
+        ]
+        try:
+            self.sink(rows)
+        except Exception as e:
+            logging.warning(f"Recommendation log write failed ({len(rows)} rows): {e}")
+            self._requeue(batch)
+            return
+
+        with self._cond:
+            lag = time.monotonic() - batch[0][0]
+            self.batches += 1
+            self.written_rows += len(rows)
+            self.queued_rows -= len(rows)
+            self.last_flush_lag = lag
+            self.max_flush_lag = max(self.max_flush_lag, lag)
+            self._cond.notify_all()
+
+    def _requeue(self, batch):
+        """Put a failed batch back at the head of the queue, or drop it once out of retries."""
+        with self._cond:
+            self.write_errors += 1
+            attempts = batch[0][4] + 1
+            if attempts > self.max_retries or self._stopped:
+                n_rows = sum(len(item[3]) for item in batch)
+                self.failed_rows += n_rows
+                self.queued_rows -= n_rows
+                self._cond.notify_all()
+                return
+            for queued_at, created_at, product_id, predictions, _ in reversed(batch):
+                self._queue.appendleft((queued_at, created_at, product_id, predictions, attempts))
+            # Back off before the retry unless shutting down
+            self._cond.wait(self.flush_interval)
+
+    def flush(self, timeout=None):
+        """Write every row queued so far; returns False if `timeout` expires first."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            target = self.enqueued_rows
+            self._flush_requested = True
+            self._cond.notify_all()
+            # Queued rows leave the queue only by being written or failing
+            while self.written_rows + self.failed_rows < target:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def close(self, timeout=10):
+        """Write the queued rows and stop the worker."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._worker:
+            self._worker.join(timeout=timeout)
+
+    def stats(self):
+        """Queue depth, lag and written / dropped / failed row counters."""
+        with self._cond:
+            lag = time.monotonic() - self._queue[0][0] if self._queue else 0.0
+            return {
+                "queued_rows": self.queued_rows,
+                "max_queue_rows": self.max_queue_rows,
+                "enqueued_rows": self.enqueued_rows,
+                "written_rows": self.written_rows,
+                "dropped_rows": self.dropped_rows,
+                "failed_rows": self.failed_rows,
+                "batches": self.batches,
+                "write_errors": self.write_errors,
+                "lag_ms": round(lag * 1000, 3),
+                "last_flush_lag_ms": round(self.last_flush_lag * 1000, 3),
+                "max_flush_lag_ms": round(self.max_flush_lag * 1000, 3),
+                "batch_rows": self.batch_rows,
+                "flush_interval_ms": self.flush_interval * 1000,
+                "policy": self.policy
+            }
+
+
+class SQLAlchemyLogSink:
+    """
+    Bulk-insert row tuples into recommendation_logs through a SQLAlchemy
+    engine (one executemany per batch, in one transaction).
+
+    The served material name is stored as is in `recommended_material`.
+    Names that match a materials.material_type also get its material_id
+    (the map is re-read every `refresh_seconds`, and at once after a
+    failed write); other names get a NULL id. Product ids are checked
+    against the products table first and unknown ones stored as NULL, so
+    one bad client-supplied id cannot fail the whole batch. The tables are
+    created if missing, and `recommended_material` is added to a table
+    created before it existed.
+    """
+
+    def __init__(self, engine, refresh_seconds=300):
+        import sqlalchemy as sa
+        from models import Material, Prediction, Product, db
+
+        self.engine = engine
+        self.table = Prediction.__table__
+        self.materials = Material.__table__
+        self.products = Product.__table__
+        self.refresh_seconds = refresh_seconds
+        self._material_ids = None
+        self._loaded_at = 0.0
+        db.metadata.create_all(engine, tables=[self.materials, self.products, self.table])
+        columns = {column["name"] for column in sa.inspect(engine).get_columns(self.table.name)}
+        if "recommended_material" not in columns:
+            with engine.begin() as connection:
+                connection.execute(sa.text(
+                    f"ALTER TABLE {self.table.name} ADD COLUMN recommended_material VARCHAR(100)"
+                ))
+
+    def _material_id_map(self, connection):
+        if self._material_ids is None or time.monotonic() - self._loaded_at >= self.refresh_seconds:
+            query = self.materials.select().with_only_columns(
+                self.materials.c.material_type, self.materials.c.material_id
+            )
+            self._material_ids = {name: material_id for name, material_id in connection.execute(query)}
+            self._loaded_at = time.monotonic()
+        return self._material_ids
+
+    def _known_products(self, connection, product_ids):
+        """The subset of `product_ids` present in the products table."""
+        if not product_ids:
+            return set()
+        query = self.products.select().with_only_columns(self.products.c.product_id).where(
+            self.products.c.product_id.in_(sorted(product_ids))
+        )
+        return set(connection.execute(query).scalars())
+
+    def __call__(self, rows):
+        try:
+            with self.engine.begin() as connection:
+                material_ids = self._material_id_map(connection)
+                products = self._known_products(connection, {row[0] for row in rows if row[0] is not None})
+                connection.execute(self.table.insert(), [
+                    {
+                        "product_id": product_id if product_id in products else None,
+                        "recommended_material_id": material_ids.get(material),
+                        "recommended_material": material,
+                        "cost_prediction": cost,
+                        "co2_prediction": co2,
+                        "material_rank": rank,
+                        "created_at": created_at
+                    }
+                    for product_id, material, cost, co2, rank, created_at in rows
+                ])
+        except Exception:
+            # A material or product deleted since it was read; re-read before the retry
+            self._material_ids = None
+            raise
@@ -23,6 +23,7 @@ CREATE TABLE recommendation_logs (
     rec_id SERIAL PRIMARY KEY,
     product_id INT REFERENCES products(product_id),
     recommended_material_id INT REFERENCES materials(material_id),
+    recommended_material VARCHAR(100),
     cost_prediction FLOAT,
     co2_prediction FLOAT,
     material_rank INT,
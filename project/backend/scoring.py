@@ -0,0 +1,334 @@
+"""
+Vectorized scoring engine for the heuristic /predict path.
+
+The material catalog is held as a struct-of-arrays (one NumPy column per
+material property plus shipping/category lookup matrices) so that the
+feasibility check, thickness, CO2, cost and composite score are computed
+for every material in a handful of array operations instead of a Python
+loop per material.
+
+Sustainability, CO2 performance and the composite score come from the
+declarative formulas in config/scoring_formulas.yaml (compiled once at
+import), the same ones the scalar helpers in predict.py evaluate, so
+rankings and rounded values are identical to the per-material loop.
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.recommendation.scoring_formula import load_scoring_formulas, round_half_even  # noqa: E402,F401
+
+
+# ------------------------
+# Heuristic Constants
+# ------------------------
+BASE_THICKNESS = 1.0        # Base thickness in relative units
+BASE_COST_PER_KG = 45       # Base cost in Rs.
+MIN_SHIPPING_SUITABILITY = 0.7
+
+# CO2 multiplier per shipping mode (kg CO2 scaling)
+SHIPPING_EMISSION_MULTIPLIER = {
+    "Air": 3.5,      # Highest emissions (air freight)
+    "Road": 1.5,     # Medium emissions (truck)
+    "Sea": 0.8       # Lowest emissions (ship)
+}
+DEFAULT_EMISSION_MULTIPLIER = 1.5
+
+# Sustainability, CO2 performance and composite score formulas
+FORMULAS = load_scoring_formulas()
+
+
+def _frozen(values, dtype):
+    arr = np.array(values, dtype=dtype)
+    arr.setflags(write=False)
+    return arr
+
+
+class MaterialCatalog:
+    """
+    Struct-of-arrays view of the heuristic material database.
+
+    Built once from a list of material dicts (the same shape as the
+    original hard-coded `materials_data`). All arrays are read-only.
+    """
+
+    def __init__(self, records, categories, shipping_types):
+        self.records = tuple(dict(r) for r in records)
+        self.categories = tuple(categories)
+        self.shipping_types = tuple(shipping_types)
+        self.category_index = {c: i for i, c in enumerate(self.categories)}
+        self.shipping_index = {s: i for i, s in enumerate(self.shipping_types)}
+
+        self.names = tuple(r["name"] for r in self.records)
+        self.base_co2_per_kg = _frozen([r["base_co2_per_kg"] for r in self.records], np.float64)
+        self.recyclability = _frozen([r["recyclability"] for r in self.records], np.float64)
+        self.biodegradability = _frozen([r["biodegradability"] for r in self.records], np.float64)
+        self.is_renewable = _frozen([bool(r["is_renewable"]) for r in self.records], bool)
+        self.strength_factor = _frozen([r["strength_factor"] for r in self.records], np.float64)
+        self.max_weight = _frozen([r["max_weight"] for r in self.records], np.float64)
+        self.fragility_protection = _frozen([r["fragility_protection"] for r in self.records], np.float64)
+
+        # Lookup matrices: rows = materials, columns = shipping types / categories
+        self.shipping_suitability = _frozen(
+            [[r["shipping_suitability"].get(s, 0) for s in self.shipping_types] for r in self.records],
+            np.float64
+        )
+        self.category_bonus = _frozen(
+            [[r["category_bonus"].get(c, 1.0) for c in self.categories] for r in self.records],
+            np.float64
+        )
+
+    def __len__(self):
+        return len(self.records)
+
+
+def _select_top(keys, n_candidates, top_n):
+    """
+    Indices of the `top_n` smallest `keys` in ascending order, using a
+    partial selection (argpartition) instead of a full sort when possible.
+    Keys are unique, so the result equals the head of a full sort.
+    """
+    k = n_candidates if top_n is None else min(top_n, n_candidates)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(keys):
+        head = np.argpartition(keys, k - 1)[:k]
+        return head[np.argsort(keys[head])]
+    return np.argsort(keys)
+
+
+class ScoreMatrix:
+    """
+    Products x materials score matrices produced by `evaluate`.
+
+    Every array has shape (P, M); values are already rounded the way the
+    /predict response reports them. `feasible` marks the candidates that
+    passed feasibility (and the ranking constraints, if any were applied);
+    `constraints_relaxed[p]` is set when no material met the constraints and
+    product p fell back to its feasible set.
+    """
+
+    def __init__(self, catalog, feasible, cost, co2, co2_performance, final_score,
+                 constraints_relaxed=None):
+        self.catalog = catalog
+        self.feasible = feasible
+        self.cost = cost
+        self.co2 = co2
+        self.co2_performance = co2_performance
+        self.final_score = final_score
+        if constraints_relaxed is None:
+            constraints_relaxed = np.zeros(feasible.shape[0], dtype=bool)
+        self.constraints_relaxed = constraints_relaxed
+
+    def __len__(self):
+        return self.final_score.shape[0]
+
+    def _rank_keys(self, feasible, final_score):
+        """
+        Unique integer sort keys: higher score first, then catalog order, which
+        reproduces the stable descending sort (list.sort(reverse=True)) of the
+        original loop. Scores are already rounded to 2 decimals, so score*100
+        is an exact integer. Non-candidates sort last.
+        """
+        n_materials = final_score.shape[-1]
+        score_units = np.rint(np.where(feasible, final_score, 0) * 100).astype(np.int64)
+        keys = (10001 - score_units) * n_materials + np.arange(n_materials)
+        return np.where(feasible, keys, 10002 * n_materials + np.arange(n_materials))
+
+    def ranking(self, p, top_n=None):
+        """Material indices for product `p`, best first, candidates only."""
+        keys = self._rank_keys(self.feasible[p], self.final_score[p])
+        return _select_top(keys, np.count_nonzero(self.feasible[p]), top_n)
+
+    def rankings(self):
+        """
+        Ranked material indices for every product at once, shape (P, M).
+        Positions past each product's candidate count are -1.
+        """
+        order = np.argsort(self._rank_keys(self.feasible, self.final_score), axis=1)
+        n_feasible = self.feasible.sum(axis=1)
+        order[np.arange(order.shape[1]) >= n_feasible[:, None]] = -1
+        return order
+
+    def rows(self, p, order=None, top_n=None):
+        """Yield the ranked prediction dicts for product `p`."""
+        if order is None:
+            order = self.ranking(p, top_n)
+        for rank, m in enumerate(order, 1):
+            mat = self.catalog.records[m]
+            yield {
+                "rank": rank,
+                "material": mat["name"],
+                "predicted_cost": float(self.cost[p, m]),
+                "co2": float(self.co2[p, m]),
+                "sustainability_score": float(self.final_score[p, m]),
+                # Additional metrics for transparency
+                "biodegradability": mat["biodegradability"],
+                "recyclability": mat["recyclability"],
+                "co2_performance": float(self.co2_performance[p, m])
+            }
+
+
+def constraint_mask(catalog, cost, co2, constraints):
+    """
+    Candidates allowed by the ranking constraints (ranking_weights.yaml:
+    max_cost, max_co2, min_recyclability). `cost` and `co2` are the rounded
+    (P, M) matrices, so the reported values always satisfy the limits.
+    """
+    allowed = np.ones(cost.shape, dtype=bool)
+    if constraints.get("max_cost") is not None:
+        allowed &= cost <= constraints["max_cost"]
+    if constraints.get("max_co2") is not None:
+        allowed &= co2 <= constraints["max_co2"]
+    if constraints.get("min_recyclability") is not None:
+        allowed &= catalog.recyclability >= constraints["min_recyclability"]
+    return allowed
+
+
+def feasibility_mask(catalog, product_weights, fragility_indices, shipping_types):
+    """
+    (P, M) mask of the materials meeting the weight, protection and shipping
+    limits for each product, before the all-materials fallback.
+    """
+    weight = np.asarray(product_weights, dtype=np.float64).reshape(-1, 1)
+    fragility = np.asarray(fragility_indices, dtype=np.float64).reshape(-1, 1)
+    shipping_cols = np.array([catalog.shipping_index.get(s, -1) for s in shipping_types], dtype=np.intp)
+
+    shipping_suitability = catalog.shipping_suitability[:, shipping_cols].T
+    shipping_suitability = np.where((shipping_cols >= 0)[:, None], shipping_suitability, 0.0)
+
+    required_protection = np.where(fragility > 0.7, 6, np.where(fragility > 0.4, 4, 2))
+    return (
+        (weight <= catalog.max_weight) &
+        (catalog.fragility_protection >= required_protection) &
+        (shipping_suitability >= MIN_SHIPPING_SUITABILITY)
+    )
+
+
+def evaluate(catalog, product_weights, fragility_indices, categories, shipping_types,
+             constraints=None):
+    """
+    Score every material in `catalog` for each of P products in one pass.
+
+    All per-material quantities are computed on a P x M matrix, so a batch
+    of products costs a few array operations rather than P separate calls.
+    When `constraints` are given they are applied as masks right after the
+    cheap CO2/cost stage, and materials no product can use are dropped
+    before sustainability and composite scoring.
+    """
+    weight = np.asarray(product_weights, dtype=np.float64).reshape(-1, 1)
+    fragility = np.asarray(fragility_indices, dtype=np.float64).reshape(-1, 1)
+
+    category_cols = np.array([catalog.category_index.get(c, -1) for c in categories], dtype=np.intp)
+
+    # =====================================================
+    # STEP 1: FEASIBILITY CHECK
+    # =====================================================
+    feasible = feasibility_mask(catalog, weight, fragility, shipping_types)
+    # Fallback: If no materials pass, include all
+    none_feasible = ~feasible.any(axis=1)
+    if none_feasible.any():
+        feasible[none_feasible] = True
+        print("Warning: No materials meet all feasibility criteria. Showing all options.")
+
+    # =====================================================
+    # STEP 2: THICKNESS, CO2 & COST
+    # =====================================================
+    weight_factor = 1 + (weight / catalog.max_weight) * 0.5
+    fragility_factor = 1 + (fragility * catalog.strength_factor)
+    required_thickness = BASE_THICKNESS * weight_factor * fragility_factor
+
+    multiplier = np.array([
+        SHIPPING_EMISSION_MULTIPLIER.get(s, DEFAULT_EMISSION_MULTIPLIER) for s in shipping_types
+    ], dtype=np.float64).reshape(-1, 1)
+    co2_emissions = catalog.base_co2_per_kg * weight * required_thickness * multiplier
+    cost = BASE_COST_PER_KG * weight * required_thickness * (1 / catalog.strength_factor)
+    rounded_cost = round_half_even(cost)
+    rounded_co2 = round_half_even(co2_emissions)
+
+    # =====================================================
+    # STEP 2b: RANKING CONSTRAINTS (pre-filter)
+    # =====================================================
+    candidates = feasible
+    constraints_relaxed = np.zeros(weight.shape[0], dtype=bool)
+    if constraints:
+        allowed = feasible & constraint_mask(catalog, rounded_cost, rounded_co2, constraints)
+        # Same policy as feasibility: if nothing qualifies, keep the feasible set
+        constraints_relaxed = ~allowed.any(axis=1)
+        candidates = np.where(constraints_relaxed[:, None], feasible, allowed)
+        if constraints_relaxed.any():
+            print("Warning: No materials meet the ranking constraints. Showing feasible options.")
+
+    # Only materials that are a candidate for some product are scored further
+    columns = np.flatnonzero(candidates.any(axis=0))
+    if len(columns) == len(catalog):
+        columns = slice(None)
+
+    # =====================================================
+    # STEP 3: SUSTAINABILITY & CO2 PERFORMANCE
+    # =====================================================
+    category_modifier = catalog.category_bonus[columns][:, category_cols].T
+    category_modifier = np.where((category_cols >= 0)[:, None], category_modifier, 1.0)
+
+    adjusted_biodegradability = np.minimum(100, catalog.biodegradability[columns] * category_modifier)
+    adjusted_recyclability = np.minimum(100, catalog.recyclability[columns] * category_modifier)
+
+    sustainability_score = FORMULAS["sustainability"]({
+        "biodegradability": adjusted_biodegradability,
+        "recyclability": adjusted_recyclability,
+        "is_renewable": catalog.is_renewable[columns]
+    })
+    co2_performance_score = np.zeros(cost.shape)
+    co2_performance_score[:, columns] = FORMULAS["co2_performance"]({
+        "co2_emissions": co2_emissions[:, columns]
+    })
+
+    # =====================================================
+    # STEP 4: COMPOSITE SCORE
+    # =====================================================
+    final_score = np.zeros(cost.shape)
+    final_score[:, columns] = FORMULAS["final_score"]({
+        "sustainability": sustainability_score,
+        "co2_performance": co2_performance_score[:, columns]
+    })
+
+    return ScoreMatrix(
+        catalog,
+        candidates,
+        rounded_cost,
+        rounded_co2,
+        co2_performance_score,
+        final_score,
+        constraints_relaxed
+    )
+
+
+def score_products(catalog, product_weights, fragility_indices, categories, shipping_types,
+                   constraints=None, top_n=None):
+    """
+    Rank every material in `catalog` for each product.
+    `top_n` is one limit for all products or one per product (None = all).
+    Returns one ranked prediction list per product, in input order.
+    """
+    scores = evaluate(catalog, product_weights, fragility_indices, categories, shipping_types,
+                      constraints)
+    if top_n is None or isinstance(top_n, int):
+        top_n = [top_n] * len(scores)
+    return [list(scores.rows(p, top_n=top_n[p])) for p in range(len(scores))]
+
+
+def score_materials(catalog, product_weight_kg, fragility_index, category, shipping_type,
+                    constraints=None, top_n=None):
+    """
+    Rank every material in `catalog` for one product.
+
+    Returns the list of prediction dicts served by /predict, sorted by
+    final score (descending) with ranks assigned.
+    """
+    return score_products(
+        catalog, [product_weight_kg], [fragility_index], [category], [shipping_type],
+        constraints, top_n
+    )[0]
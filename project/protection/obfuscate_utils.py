@@ -45,16 +45,14 @@ class _O:
 
 def _calculate_score(_params):
     """Obfuscated scoring function"""
-    _w = [0.4, 0.4, 0.2]
-    _v = []
-    for _k in ['biodegradability', 'recyclability', 'renewable']:
-        _val = _params.get(_k, 50)
-        if _k == 'renewable':
-            _val = 80 if _val else 20
-        _v.append(_val)
-    
-    _score = sum(_O._x(_v[i], _w[i], 1) * _w[i] for i in range(len(_w)))
-    return round(_score, 2)
+    # Compiled once at import by the backend's scoring module
+    from scoring import FORMULAS
+    _f = FORMULAS['sustainability']
+    return float(_f({
+        'biodegradability': _params.get('biodegradability', 50),
+        'recyclability': _params.get('recyclability', 50),
+        'is_renewable': bool(_params.get('renewable', 50))
+    }))
 
 def _apply_weights(_data, _weights):
     """Apply weighted calculation"""
@@ -7,6 +7,8 @@ import platform
 import os
 import sys
 import socket
+import threading
+import time
 import uuid
 from datetime import datetime
 import base64
@@ -84,21 +86,107 @@ class _P:
         
         return True
 
+class _VerificationState:
+    """
+    Cached result of `_P.verify`.
+
+    The fingerprint probes (platform, hostname, MAC, hashing) are too costly
+    to run per request, so the result is computed once and refreshed by a
+    background thread. Request hooks only read `valid`.
+    """
+
+    def __init__(self):
+        self.valid = False
+        self.checked_at = None
+        self.checks = 0
+        self.failures = 0
+        self.last_duration_ms = 0.0
+        self.total_duration_ms = 0.0
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.interval = 0
+
+    def refresh(self):
+        """Run the full verification now and store the result."""
+        _t0 = time.perf_counter()
+        try:
+            _ok, _err = bool(_P.verify(False)), None
+        except Exception as e:
+            _ok, _err = False, str(e)
+        _ms = (time.perf_counter() - _t0) * 1000
+        with self._lock:
+            self.valid = _ok
+            self.last_error = _err
+            self.checked_at = time.time()
+            self.checks += 1
+            self.failures += 0 if _ok else 1
+            self.last_duration_ms = _ms
+            self.total_duration_ms += _ms
+        return _ok
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.refresh()
+
+    def start(self, interval):
+        """Revalidate every `interval` seconds in a daemon thread (0 disables)."""
+        self.interval = interval
+        if interval <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="protection-verifier", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def stats(self):
+        """Verification counters and cost, for the /protection/stats endpoint."""
+        with self._lock:
+            return {
+                "valid": self.valid,
+                "checked_at": self.checked_at,
+                "checks": self.checks,
+                "failures": self.failures,
+                "last_error": self.last_error,
+                "last_duration_ms": round(self.last_duration_ms, 4),
+                "avg_duration_ms": round(self.total_duration_ms / self.checks, 4) if self.checks else 0.0,
+                "revalidate_interval_seconds": self.interval
+            }
+
+
+_STATE = _VerificationState()
+
+
 def initialize_protection():
     """Initialize protection system"""
     try:
-        if not _P.verify(False):
+        # Verify once; later callers reuse the cached result
+        _ok = _STATE.valid if _STATE.checks else _STATE.refresh()
+        if not _ok:
             print("⚠ Environment validation warning")
         return True
     except Exception as e:
         print(f"⚠ Protection initialization warning: {e}")
         return True
 
+def start_background_verification(interval=None):
+    """Start periodic revalidation (ECOPACK_VERIFY_INTERVAL seconds, default 300)"""
+    if interval is None:
+        interval = float(os.environ.get('ECOPACK_VERIFY_INTERVAL', '300'))
+    _STATE.start(interval)
+    return _STATE
+
 def require_valid_environment():
     """Decorator to protect functions"""
     def decorator(func):
         def wrapper(*args, **kwargs):
-            if not _P.verify(False):
+            if not _STATE.valid:
                 print("⚠ Environment validation notice")
             return func(*args, **kwargs)
         return wrapper
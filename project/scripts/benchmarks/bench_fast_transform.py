@@ -0,0 +1,43 @@
+"""
+Benchmark: sklearn ColumnTransformer.transform vs the compiled fast path.
+
+Fits a pipeline with the production structure (see bench_ml_predict.py),
+compiles it with src/inference/fast_transform.py and times both for a range
+of row counts, checking the outputs are bit-for-bit identical.
+
+Usage:
+    python scripts/benchmarks/bench_fast_transform.py [--sizes 1 4 16 64 256]
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_ml_predict import PRODUCT, fit_models, make_catalog, predict, timed  # noqa: E402
+from src.inference.fast_transform import compile_column_transformer  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 4, 16, 64, 256])
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    catalog = make_catalog(max(args.sizes), rng)
+    pipeline, _, _ = fit_models(catalog, rng)
+    fast = compile_column_transformer(pipeline)
+
+    print(f"{'rows':>6} {'sklearn ms':>11} {'fast ms':>9} {'identical':>10} {'speed-up':>9}")
+    for n in args.sizes:
+        frame = predict.build_model_frame([PRODUCT], catalog.iloc[:n])
+        identical = pipeline.transform(frame).tobytes() == fast.transform(frame).tobytes()
+        sklearn_ms = timed(lambda: pipeline.transform(frame), args.repeats)
+        fast_ms = timed(lambda: fast.transform(frame), args.repeats)
+        print(f"{n:>6} {sklearn_ms:>11.3f} {fast_ms:>9.3f} {str(identical):>10} {sklearn_ms / fast_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: concurrent single-product ML calls with and without micro-batching.
+
+N client threads each issue single-product ML predictions against the same
+predictor (models fitted as in bench_ml_predict.py). Without a scheduler
+every call runs its own transform + predict; with the MicroBatcher calls
+arriving within the window share one. Reports throughput and latency.
+
+Usage:
+    python scripts/benchmarks/bench_microbatch.py [--clients 16] [--window-ms 3]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_ml_predict import PRODUCT, fit_models, make_catalog, predict  # noqa: E402
+from src.inference.batching import MicroBatcher  # noqa: E402
+from src.inference.predictor import EcoPackPredictor  # noqa: E402
+
+
+def run(clients, calls, materials_df, scheduler):
+    latencies = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(clients)
+
+    def client():
+        barrier.wait()
+        for _ in range(calls):
+            start = time.perf_counter()
+            predict.predict_with_models_batch([PRODUCT], materials_df, scheduler)
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    latencies = np.array(latencies) * 1000
+    return len(latencies) / elapsed, np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--materials", type=int, default=8)
+    parser.add_argument("--window-ms", type=float, default=3.0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    catalog = make_catalog(args.materials, rng)
+    pipeline, rf, xgb = fit_models(catalog, rng)
+    rf.set_params(n_jobs=1)
+    predictor = EcoPackPredictor.from_objects(pipeline, rf, xgb)
+    predict.REGISTRY.register("default", predictor)
+    predict.ranking_config = {"weights": {"cost": 0.3, "co2": 0.4, "suitability": 0.3}, "top_n": 4}
+    predict.USE_ADVANCED_RANKING = True
+
+    print(f"{'mode':>12} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    throughput, p50, p99 = run(args.clients, args.calls, catalog, None)
+    print(f"{'direct':>12} {throughput:>8.1f} {p50:>8.1f} {p99:>8.1f}")
+
+    scheduler = MicroBatcher(predictor.predict_arrays, max_wait_ms=args.window_ms)
+    throughput, p50, p99 = run(args.clients, args.calls, catalog, scheduler)
+    scheduler.stop()
+    print(f"{'microbatch':>12} {throughput:>8.1f} {p50:>8.1f} {p99:>8.1f}")
+    stats = scheduler.stats()
+    print(f"batches={stats['batches']} avg_batch_requests={stats['avg_batch_requests']} "
+          f"avg_wait_ms={stats['avg_wait_ms']}")
+
+
+if __name__ == "__main__":
+    main()
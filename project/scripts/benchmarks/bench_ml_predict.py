@@ -0,0 +1,122 @@
+"""
+Benchmark: per-row vs batched ML prediction in the /predict ML branch.
+
+The shipped preprocessing pipeline was fitted on a different column set than
+data/directory/materials.csv, so this benchmark fits a pipeline and models
+with the production structure (median imputer + scaler, one-hot encoder,
+200-tree RandomForest, 300-tree XGBoost) on synthetic product x material
+rows and times both code paths as the catalog grows.
+
+Usage:
+    python scripts/benchmarks/bench_ml_predict.py [--sizes 4 16 64 256 1024]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # project root
+sys.path.insert(0, os.path.join(BASE_DIR, "backend"))
+
+import predict  # noqa: E402
+from src.inference.predictor import EcoPackPredictor  # noqa: E402
+
+CATEGORIES = ["Food", "Electronics", "Cosmetics", "Pharmacy"]
+SHIPPING = ["Air", "Road", "Sea"]
+PRODUCT = {"product_name": "Bench", "product_weight_kg": 2.5, "category": "Food",
+           "fragility_index": 0.6, "shipping_type": "Road"}
+
+
+def make_catalog(n_materials, rng):
+    base = pd.read_csv(os.path.join(BASE_DIR, "data", "directory", "materials.csv"))
+    rows = base.iloc[np.arange(n_materials) % len(base)].reset_index(drop=True)
+    rows["material_type"] = [f"{t}_{i}" for i, t in enumerate(rows["material_type"])]
+    for col in ["strength_mpa", "weight_capacity", "co2_emission_score", "cost_per_kg"]:
+        rows[col] = rows[col] * rng.uniform(0.8, 1.2, n_materials)
+    return rows
+
+
+def fit_models(catalog, rng, n_rows=2000):
+    from sklearn.compose import ColumnTransformer
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.impute import SimpleImputer
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
+    from xgboost import XGBRegressor
+
+    materials = catalog.sample(n_rows, replace=True, random_state=0).reset_index(drop=True)
+    frame = pd.concat([pd.DataFrame({
+        "product_weight": rng.uniform(0.05, 15, n_rows),
+        "fragility_index": rng.uniform(0, 1, n_rows),
+        "category": rng.choice(CATEGORIES, n_rows),
+        "shipping_type": rng.choice(SHIPPING, n_rows),
+    }), materials[predict.MATERIAL_FEATURES]], axis=1)
+
+    numeric = ["product_weight", "fragility_index", "strength_mpa", "weight_capacity",
+               "biodegradability_percent", "co2_emission_score", "recyclability_percent", "cost_per_kg"]
+    categorical = ["category", "shipping_type", "material_type"]
+    pipeline = ColumnTransformer([
+        ("num", Pipeline([("imputer", SimpleImputer(strategy="median")),
+                          ("scaler", StandardScaler())]), numeric),
+        ("cat", Pipeline([("imputer", SimpleImputer(strategy="most_frequent")),
+                          ("encoder", OneHotEncoder(handle_unknown="ignore", sparse_output=False))]), categorical),
+    ])
+    X = pipeline.fit_transform(frame)
+    cost = frame["cost_per_kg"] * frame["product_weight"]
+    co2 = frame["co2_emission_score"] * frame["product_weight"] / 10
+    rf = RandomForestRegressor(n_estimators=200, max_depth=12, random_state=42, n_jobs=-1).fit(X, cost)
+    xgb = XGBRegressor(n_estimators=300, max_depth=6, learning_rate=0.05, random_state=42).fit(X, co2)
+    return pipeline, rf, xgb
+
+
+def per_row(data, materials_df):
+    """The original loop: one frame, one transform and two predicts per material."""
+    for _, material in materials_df.iterrows():
+        input_data = pd.DataFrame([{
+            'product_weight': data["product_weight_kg"],
+            'fragility_index': data["fragility_index"],
+            'category': data["category"],
+            'shipping_type': data["shipping_type"],
+            **{col: material[col] for col in predict.MATERIAL_FEATURES}
+        }])
+        predictor = predict.REGISTRY.get()
+        X = predictor.pipeline.transform(input_data)
+        predictor.cost_model.predict(X)
+        predictor.co2_model.predict(X)
+
+
+def timed(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 16, 64, 256, 1024])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    catalog = make_catalog(max(args.sizes), rng)
+    pipeline, rf, xgb = fit_models(catalog, rng)
+    predict.REGISTRY.register("default", EcoPackPredictor.from_objects(pipeline, rf, xgb))
+    predict.ranking_config = {"weights": {"cost": 0.3, "co2": 0.4, "suitability": 0.3}, "top_n": 4}
+    predict.USE_ADVANCED_RANKING = True
+
+    print(f"{'materials':>10} {'per-row ms':>12} {'batched ms':>12} {'speed-up':>10}")
+    for n in args.sizes:
+        materials_df = catalog.iloc[:n]
+        row_ms = timed(lambda: per_row(PRODUCT, materials_df), max(1, args.repeats if n <= 256 else 1))
+        batch_ms = timed(lambda: predict.predict_with_models(PRODUCT, materials_df), args.repeats)
+        print(f"{n:>10} {row_ms:>12.1f} {batch_ms:>12.1f} {row_ms / batch_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Cost of per-tree prediction intervals on top of the point predictions.
+
+Loads the shipped rf_cost / xgb_co2 models and times, for a range of batch
+sizes (12 rows = one product against the catalog):
+- point: cost + CO2 predictions (what /predict computes today)
+- +std / +quantiles: point plus EcoPackPredictor.cost_spread
+- per-tree loop: the naive alternative, one predict call per estimator
+
+Exits non-zero when the interval overhead exceeds --budget (the ratio of
+point+quantiles to point time), so the check can run in CI.
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+import joblib
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # project root
+sys.path.insert(0, BASE_DIR)
+
+from src.inference.predictor import EcoPackPredictor  # noqa: E402
+
+MODEL_DIR = os.path.join(BASE_DIR, "ml", "models")
+
+
+def timed(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[12, 120, 1200, 12000])
+    parser.add_argument("--quantiles", type=float, nargs="+", default=[0.1, 0.9])
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--budget", type=float, default=2.5,
+                        help="max allowed (point + quantiles) / point time ratio")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    rf = joblib.load(os.path.join(MODEL_DIR, "rf_cost.joblib"))
+    xgb = joblib.load(os.path.join(MODEL_DIR, "xgb_co2.joblib"))
+    predictor = EcoPackPredictor.from_objects(None, rf, xgb)
+    rng = np.random.default_rng(42)
+
+    def point(X):
+        rf.predict(X)
+        xgb.predict(X)
+
+    print(f"{'rows':>6} {'point ms':>9} {'+std ms':>8} {'+quant ms':>10} {'per-tree ms':>12} {'overhead':>9}")
+    worst = 0.0
+    for n in args.sizes:
+        X = rng.normal(size=(n, rf.n_features_in_))
+        predictor.cost_spread(X, "std")  # compile the forest outside the timing
+        point_ms = timed(lambda: point(X), args.repeats)
+        std_ms = timed(lambda: (point(X), predictor.cost_spread(X, "std")), args.repeats)
+        quant_ms = timed(lambda: (point(X), predictor.cost_spread(X, args.quantiles)), args.repeats)
+        loop_ms = timed(lambda: (point(X), np.quantile(
+            np.stack([tree.predict(X) for tree in rf.estimators_], axis=1), args.quantiles, axis=1
+        )), max(1, args.repeats // 3))
+        overhead = quant_ms / point_ms
+        worst = max(worst, overhead)
+        print(f"{n:>6} {point_ms:>9.3f} {std_ms:>8.3f} {quant_ms:>10.3f} {loop_ms:>12.3f} {overhead:>8.2f}x")
+
+    print(f"\nworst overhead {worst:.2f}x (budget {args.budget:.2f}x)")
+    if worst > args.budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Segment-array ranking vs the pandas groupby ranker.
+
+Builds a synthetic products x materials frame (rows grouped by product, as
+the scoring pipeline writes them, or shuffled with --shuffle) and times:
+- pandas global: the previous rank_materials (global min-max + groupby dense rank)
+- pandas product: the same with per-product min-max via groupby transform
+- global / product: rank_materials with each normalization mode
+
+Both implementations get a preloaded config so only ranking is timed.
+
+Usage:
+    python scripts/benchmarks/bench_ranker.py [--rows 100000 1000000 10000000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # project root
+sys.path.insert(0, BASE_DIR)
+
+from src.recommendation.ranker import rank_materials  # noqa: E402
+from src.recommendation.ranking_config import RECYCLABILITY_RANKS, load_ranking_config  # noqa: E402
+
+CONFIG_PATH = os.path.join(BASE_DIR, "config", "material_ranking.yaml")
+
+
+def pandas_rank(df, cfg, per_product=False):
+    """rank_materials as it was before the segment-array core"""
+    w = cfg.weights
+    groups = df.groupby("product_id")
+
+    def min_max(series, reverse=False):
+        if per_product:
+            low = groups[series.name].transform("min")
+            high = groups[series.name].transform("max")
+        else:
+            low, high = series.min(), series.max()
+        norm = (series - low) / (high - low)
+        return 1 - norm if reverse else norm
+
+    df = df.copy()
+    df["cost_norm"] = min_max(df["predicted_cost"], reverse=True)
+    df["co2_norm"] = min_max(df["predicted_co2"], reverse=True)
+    df["suit_norm"] = min_max(df["Material_Suitability_Score"])
+    df["ranking_score"] = (w["cost"] * df["cost_norm"] + w["co2"] * df["co2_norm"] +
+                           w["suitability"] * df["suit_norm"])
+    df = df[
+        (df["predicted_cost"] <= cfg.max_cost) &
+        (df["Material_Suitability_Score"] >= cfg.min_suitability) &
+        (df["Recyclability_Category"].map(RECYCLABILITY_RANKS) >= cfg.min_recyclability_rank)
+    ].copy()
+    df["rank"] = df.groupby("product_id")["ranking_score"].rank(ascending=False, method="dense")
+    return df[df["rank"] <= cfg.top_n].sort_values(["product_id", "rank"])
+
+
+def make_frame(n_rows, n_materials, shuffle, seed=0):
+    rng = np.random.default_rng(seed)
+    n_products = max(1, n_rows // n_materials)
+    n = n_products * n_materials
+    df = pd.DataFrame({
+        "product_id": np.repeat(np.arange(n_products), n_materials),
+        "predicted_cost": rng.uniform(0, 250, n),
+        "predicted_co2": rng.uniform(0, 30, n),
+        "Material_Suitability_Score": rng.uniform(20, 100, n),
+        "Recyclability_Category": rng.choice(list("ABCD"), n).astype(object),
+    })
+    return df.sample(frac=1, random_state=seed) if shuffle else df
+
+
+def timed(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--materials", type=int, default=40, help="materials per product")
+    parser.add_argument("--shuffle", action="store_true", help="rows not grouped by product")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    cfg = load_ranking_config(CONFIG_PATH)
+    print(f"{'rows':>11} {'pandas global s':>16} {'global s':>9} {'speed-up':>9} "
+          f"{'pandas product s':>17} {'product s':>10} {'speed-up':>9} {'Mrows/s':>8}")
+    for n_rows in args.rows:
+        df = make_frame(n_rows, args.materials, args.shuffle)
+        expected = pandas_rank(df, cfg)
+        actual = rank_materials(df, cfg, normalize="global")
+        assert actual.index.equals(expected.index) and np.array_equal(actual["rank"], expected["rank"])
+
+        expected = pandas_rank(df, cfg, per_product=True)
+        actual = rank_materials(df, cfg, normalize="product")
+        assert actual.index.equals(expected.index) and np.array_equal(actual["rank"], expected["rank"])
+
+        pandas_global_s = timed(lambda: pandas_rank(df, cfg), args.repeats)
+        global_s = timed(lambda: rank_materials(df, cfg, normalize="global"), args.repeats)
+        pandas_product_s = timed(lambda: pandas_rank(df, cfg, per_product=True), args.repeats)
+        product_s = timed(lambda: rank_materials(df, cfg, normalize="product"), args.repeats)
+        print(f"{len(df):>11,} {pandas_global_s:>16.3f} {global_s:>9.3f} {pandas_global_s / global_s:>8.1f}x "
+              f"{pandas_product_s:>17.3f} {product_s:>10.3f} {pandas_product_s / product_s:>8.1f}x "
+              f"{len(df) / product_s / 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Write-behind recommendation logging vs a synchronous INSERT per response.
+
+Simulates --requests /predict responses of --rows ranked materials each
+against a SQLite file and times:
+- sync: one transaction inserting the response's rows, on the request path
+- write-behind: RecommendationLogWriter.log on the request path, plus the
+  time until the background writer has flushed everything
+
+Usage:
+    python scripts/benchmarks/bench_recommendation_log.py [--requests 5000] [--rows 4]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import sqlalchemy as sa
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # project root
+sys.path.insert(0, os.path.join(BASE_DIR, "backend"))
+
+from recommendation_log import RecommendationLogWriter, SQLAlchemyLogSink  # noqa: E402
+
+
+def predictions(n_rows):
+    return [{"material": "PLA", "predicted_cost": 10.0 + i, "co2": 1.5, "rank": i + 1} for i in range(n_rows)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--rows", type=int, default=4)
+    parser.add_argument("--batch-rows", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = sa.create_engine(f"sqlite:///{os.path.join(tmp, 'logs.db')}")
+        sink = SQLAlchemyLogSink(engine)
+        rows = predictions(args.rows)
+
+        started = time.perf_counter()
+        for product_id in range(args.requests):
+            batch = [(product_id, p["material"], p["predicted_cost"], p["co2"], p["rank"], None)
+                     for p in rows]
+            sink(batch)
+        sync_s = time.perf_counter() - started
+
+        writer = RecommendationLogWriter(sink, max_queue_rows=args.requests * args.rows,
+                                         batch_rows=args.batch_rows, flush_interval=0.5)
+        started = time.perf_counter()
+        for product_id in range(args.requests):
+            writer.log(product_id, rows)
+        request_s = time.perf_counter() - started
+        writer.flush()
+        drained_s = time.perf_counter() - started
+        stats = writer.stats()
+        writer.close()
+
+        with engine.connect() as connection:
+            total = connection.execute(sa.text("SELECT COUNT(*) FROM recommendation_logs")).scalar()
+        assert total == 2 * args.requests * args.rows and stats["dropped_rows"] == 0
+
+    n = args.requests
+    print(f"{'mode':>13} {'per request us':>15} {'total s':>8}")
+    print(f"{'sync':>13} {sync_s / n * 1e6:>15.1f} {sync_s:>8.2f}")
+    print(f"{'write-behind':>13} {request_s / n * 1e6:>15.1f} {drained_s:>8.2f}"
+          f"  ({stats['batches']} batches, max flush lag {stats['max_flush_lag_ms']:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
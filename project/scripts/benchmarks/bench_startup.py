@@ -0,0 +1,75 @@
+"""
+Benchmark: time-to-first-prediction from pickles vs converted artifacts.
+
+Each measurement runs in a fresh interpreter (so library imports count, as
+they do for a new pod): import the predictor, load the artifacts and predict
+one row of data/model_input/X_raw.csv. Converts the shipped artifacts to a
+temporary directory first.
+
+Usage:
+    python scripts/benchmarks/bench_startup.py [--runs 3]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # project root
+MODEL_DIR = os.path.join(BASE_DIR, "ml", "models")
+
+PROBE = """
+import time
+start = time.perf_counter()
+import sys, json, warnings
+warnings.filterwarnings("ignore")
+sys.path.insert(0, {base!r})
+import pandas as pd
+from src.inference.predictor import EcoPackPredictor
+predictor = EcoPackPredictor({pipeline!r}, {cost!r}, {co2!r}, artifact_dir={artifact_dir!r},
+                             native_xgboost={native!r})
+predictor.load()
+loaded = time.perf_counter()
+row = pd.read_csv({sample!r}, nrows=1)
+cost, co2 = predictor.predict_arrays(row)
+done = time.perf_counter()
+print(json.dumps({{"load_ms": (loaded - start) * 1000, "first_prediction_ms": (done - start) * 1000,
+                  "cost": float(cost[0]), "co2": float(co2[0]), "sklearn": "sklearn" in sys.modules}}))
+"""
+
+
+def probe(artifact_dir, native=False):
+    code = PROBE.format(
+        base=BASE_DIR,
+        pipeline=os.path.join(MODEL_DIR, "preprocessing", "preprocessing_pipeline.pkl"),
+        cost=os.path.join(MODEL_DIR, "rf_cost.joblib"),
+        co2=os.path.join(MODEL_DIR, "xgb_co2.joblib"),
+        artifact_dir=artifact_dir,
+        native=native,
+        sample=os.path.join(BASE_DIR, "data", "model_input", "X_raw.csv")
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as artifact_dir:
+        subprocess.run([sys.executable, os.path.join(BASE_DIR, "scripts", "convert_model_artifacts.py"),
+                        "--out", artifact_dir], check=True, capture_output=True)
+        modes = [("pickles", None, False), ("converted", artifact_dir, False),
+                 ("converted+ubj", artifact_dir, True)]
+        print(f"{'mode':>14} {'load ms':>9} {'first pred ms':>14} {'sklearn':>8} {'cost':>10} {'co2':>10}")
+        for name, directory, native in modes:
+            results = [probe(directory, native) for _ in range(args.runs)]
+            best = min(results, key=lambda r: r["first_prediction_ms"])
+            print(f"{name:>14} {best['load_ms']:>9.0f} {best['first_prediction_ms']:>14.0f} "
+                  f"{str(best['sklearn']):>8} {best['cost']:>10.4f} {best['co2']:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Streamed Parquet ranking vs loading the whole file into rank_materials.
+
+Writes a synthetic scored products x materials file (with extra feature
+columns the ranker does not read) and reports time and peak allocated
+memory (Python/NumPy via tracemalloc plus the Arrow memory pool) for:
+- in-memory: pd.read_parquet + rank_materials
+- streamed: rank_parquet with each --batch-size
+
+The results are checked to be identical.
+
+Usage:
+    python scripts/benchmarks/bench_streaming_rank.py [--rows 2000000] [--batch-size 65536 262144]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # project root
+sys.path.insert(0, BASE_DIR)
+
+from src.recommendation.ranker import rank_materials  # noqa: E402
+from src.recommendation.ranking_config import load_ranking_config  # noqa: E402
+from src.recommendation.streaming_rank import rank_parquet  # noqa: E402
+
+CONFIG_PATH = os.path.join(BASE_DIR, "config", "material_ranking.yaml")
+
+
+def write_file(path, n_rows, n_materials, n_features, seed=0):
+    rng = np.random.default_rng(seed)
+    n_products = max(1, n_rows // n_materials)
+    n = n_products * n_materials
+    df = pd.DataFrame({
+        "product_id": np.repeat(np.arange(n_products), n_materials),
+        "Material ID": np.tile([f"MAT_{m:04d}" for m in range(n_materials)], n_products),
+        "predicted_cost": rng.uniform(0, 250, n),
+        "predicted_co2": rng.uniform(0, 30, n),
+        "Material_Suitability_Score": rng.uniform(20, 100, n),
+        "Recyclability_Category": rng.choice(list("ABCD"), n),
+    })
+    for i in range(n_features):
+        df[f"feature_{i}"] = rng.normal(size=n)
+    df.to_parquet(path, index=False)
+    return n
+
+
+def measured(fn):
+    """(result, seconds, peak MB) of one call."""
+    pool = pa.default_memory_pool()
+    arrow_start = pool.bytes_allocated()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    arrow_peak = max(0, pool.max_memory() - arrow_start)
+    return result, seconds, (peak + arrow_peak) / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--materials", type=int, default=40, help="materials per product")
+    parser.add_argument("--features", type=int, default=12, help="extra columns not read by the ranker")
+    parser.add_argument("--batch-size", type=int, nargs="+", default=[65_536, 262_144])
+    args = parser.parse_args()
+
+    cfg = load_ranking_config(CONFIG_PATH)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "scored.parquet")
+        n = write_file(path, args.rows, args.materials, args.features)
+        print(f"{n:,} rows, {os.path.getsize(path) / 1e6:.0f} MB on disk")
+        print(f"{'mode':>22} {'seconds':>8} {'peak MB':>8}")
+
+        # Streaming runs first, so the Arrow pool's high-water mark is theirs
+        results = []
+        for batch_size in args.batch_size:
+            streamed, seconds, peak = measured(
+                lambda: rank_parquet(path, cfg, batch_size=batch_size, columns=["Material ID"]))
+            results.append(streamed)
+            print(f"{f'streamed {batch_size:,}':>22} {seconds:>8.2f} {peak:>8.0f}")
+
+        expected, seconds, peak = measured(lambda: rank_materials(pd.read_parquet(path), cfg))
+        print(f"{'in-memory':>22} {seconds:>8.2f} {peak:>8.0f}")
+        for streamed in results:
+            pd.testing.assert_frame_equal(streamed, expected[streamed.columns])
+
+
+if __name__ == "__main__":
+    main()
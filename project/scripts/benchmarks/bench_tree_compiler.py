@@ -0,0 +1,61 @@
+"""
+Library predict vs array-compiled tree evaluation.
+
+Loads the shipped rf_cost / xgb_co2 models, flattens them with
+src/inference/tree_compiler.py and times both paths for a range of batch
+sizes (1 = a single-product call). Inputs are random rows with the models'
+feature count, which is enough to exercise every tree level.
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+import joblib
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # project root
+sys.path.insert(0, BASE_DIR)
+
+from src.inference.tree_compiler import compile_model  # noqa: E402
+
+MODEL_DIR = os.path.join(BASE_DIR, "ml", "models")
+
+
+def timed(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 4, 16, 64, 256])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    models = {
+        "rf_cost": joblib.load(os.path.join(MODEL_DIR, "rf_cost.joblib")),
+        "xgb_co2": joblib.load(os.path.join(MODEL_DIR, "xgb_co2.joblib")),
+    }
+    rng = np.random.default_rng(42)
+
+    print(f"{'model':>8} {'rows':>6} {'library ms':>11} {'compiled ms':>12} {'max |diff|':>11} {'speed-up':>9}")
+    for name, model in models.items():
+        compiled = compile_model(model)
+        for n in args.sizes:
+            X = rng.normal(size=(n, model.n_features_in_))
+            diff = np.abs(model.predict(X) - compiled.predict(X)).max()
+            library_ms = timed(lambda: model.predict(X), args.repeats)
+            compiled_ms = timed(lambda: compiled.predict(X), args.repeats)
+            print(f"{name:>8} {n:>6} {library_ms:>11.3f} {compiled_ms:>12.3f} {diff:>11.2e} "
+                  f"{library_ms / compiled_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Weight sweep (one broadcast formula evaluation) vs re-running rank_materials per vector.
+
+Ranks one product's candidate materials (--materials, default the 404 rows
+of the engineered material table) under K random weight vectors and times:
+- loop: rank_materials once per vector (the previous tuning workflow)
+- sweep: weight_sweep + stability statistics + per-vector top-N rankings
+
+Usage:
+    python scripts/benchmarks/bench_weight_sweep.py [--vectors 100 1000 5000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # project root
+sys.path.insert(0, BASE_DIR)
+
+from src.recommendation.ranker import rank_materials  # noqa: E402
+from src.recommendation.ranking_config import RankingConfig  # noqa: E402
+from src.recommendation.weight_sweep import weight_sweep  # noqa: E402
+
+TOP_N = 4
+
+
+def make_frame(n_materials, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "product_id": np.zeros(n_materials, dtype=np.int64),
+        "predicted_cost": rng.uniform(0, 250, n_materials),
+        "predicted_co2": rng.uniform(0, 30, n_materials),
+        "Material_Suitability_Score": rng.uniform(20, 100, n_materials),
+    })
+
+
+def timed(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def sweep(df, weights):
+    result = weight_sweep(df, weights)
+    return result.stability(TOP_N), result.rankings(TOP_N)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--vectors", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--materials", type=int, default=404)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_frame(args.materials)
+    print(f"{'vectors':>8} {'loop ms':>10} {'sweep ms':>9} {'speed-up':>9}")
+    for k in args.vectors:
+        weights = np.random.default_rng(k).random((k, 3))
+        configs = [RankingConfig(dict(zip(["cost", "co2", "suitability"], w)), top_n=TOP_N) for w in weights]
+        _, rankings = sweep(df, weights)
+        for config, ranking in zip(configs[:20], rankings):
+            assert rank_materials(df, config).index.tolist() == ranking
+
+        # The loop is timed on a sample of vectors and scaled to K
+        sample = configs[:min(k, 200)]
+        loop_s = timed(lambda: [rank_materials(df, c) for c in sample], 1) * k / len(sample)
+        sweep_s = timed(lambda: sweep(df, weights), args.repeats)
+        print(f"{k:>8,} {loop_s * 1e3:>10.1f} {sweep_s * 1e3:>9.1f} {loop_s / sweep_s:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
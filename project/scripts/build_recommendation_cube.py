@@ -0,0 +1,54 @@
+"""
+Build the materialized recommendation cube for the heuristic /predict path.
+
+Evaluates the ranking for every category x shipping type over a dense
+weight x fragility grid using the live material catalog, and writes a
+memory-mappable cube tagged with the catalog version. The API serves it
+automatically (ECOPACK_CUBE_DIR, default ml/cube) while the catalog version
+matches.
+
+Usage:
+    python scripts/build_recommendation_cube.py [--weight-max 30] [--weight-step 0.1]
+                                                [--fragility-step 0.01] [--out ml/cube]
+"""
+import argparse
+import os
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # project root
+sys.path.insert(0, os.path.join(BASE_DIR, "backend"))
+
+from catalog import load_snapshot  # noqa: E402
+from cube import build_cube  # noqa: E402
+
+CATEGORIES = ["Food", "Electronics", "Cosmetics", "Pharmacy"]
+SHIPPING = ["Air", "Road", "Sea"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the heuristic recommendation cube")
+    parser.add_argument("--catalog", default=os.path.join(BASE_DIR, "config", "materials_catalog.yaml"))
+    parser.add_argument("--materials-csv", default=os.path.join(BASE_DIR, "data", "directory", "materials.csv"))
+    parser.add_argument("--weight-max", type=float, default=30.0)
+    parser.add_argument("--weight-step", type=float, default=0.1)
+    parser.add_argument("--fragility-step", type=float, default=0.01)
+    parser.add_argument("--out", default=os.path.join(BASE_DIR, "ml", "cube"))
+    args = parser.parse_args()
+
+    snapshot = load_snapshot(args.catalog, args.materials_csv, CATEGORIES, SHIPPING)
+    print(f"📥 Catalog {snapshot.version}: {len(snapshot.heuristic)} materials")
+
+    start = time.perf_counter()
+    meta = build_cube(
+        snapshot.heuristic, snapshot.version, args.out,
+        weight_max=args.weight_max,
+        weight_step=args.weight_step,
+        fragility_step=args.fragility_step
+    )
+    cells = len(CATEGORIES) * len(SHIPPING) * meta["weight"]["count"] * meta["fragility"]["count"]
+    print(f"💾 Wrote {cells:,} cells to {args.out} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Convert the pickled model artifacts to the fast-loading format.
+
+Writes pipeline parameters as JSON, the random forest and XGBoost models as
+memory-mappable node arrays (plus the native XGBoost UBJ booster) and the
+linear recommendation model as .npz to ml/models/fast. The API loads them
+instead of the pickles when present (ECOPACK_ARTIFACT_DIR).
+
+Usage:
+    python scripts/convert_model_artifacts.py [--out ml/models/fast]
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # project root
+sys.path.insert(0, BASE_DIR)
+
+from src.inference.artifacts import convert_artifacts  # noqa: E402
+
+MODEL_DIR = os.path.join(BASE_DIR, "ml", "models")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert model artifacts to the fast-loading format")
+    parser.add_argument("--pipeline", default=os.path.join(MODEL_DIR, "preprocessing", "preprocessing_pipeline.pkl"))
+    parser.add_argument("--cost-model", default=os.path.join(MODEL_DIR, "rf_cost.joblib"))
+    parser.add_argument("--co2-model", default=os.path.join(MODEL_DIR, "xgb_co2.joblib"))
+    parser.add_argument("--linear", nargs="*",
+                        default=[os.path.join(MODEL_DIR, "LinearRegression_recommended_material_v1.pkl")])
+    parser.add_argument("--out", default=os.path.join(MODEL_DIR, "fast"))
+    args = parser.parse_args()
+
+    # Version notices from unpickling artifacts trained with older libraries
+    warnings.filterwarnings("ignore", message="Trying to unpickle")
+    warnings.filterwarnings("ignore", category=UserWarning, module="xgboost")
+    start = time.perf_counter()
+    manifest = convert_artifacts(args.pipeline, args.cost_model, args.co2_model, args.out, args.linear)
+    print(f"💾 Converted {2 + len(manifest['sources']['linear'])} models and the pipeline "
+          f"to {args.out} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Score a large products file against the material catalog offline.
+
+Reads products (CSV or Parquet; columns product_weight, fragility_index,
+category, shipping_type and optionally product_id) in chunks, scores each
+chunk in a process pool with the trained models, ranks the materials with
+rank_materials and writes the top-N rows per product to one Parquet
+partition per chunk. Re-running with the same --out resumes: finished
+partitions are skipped. A re-run whose input, materials, config, models,
+--artifact-dir or --chunk-size differ from the run that wrote --out is
+refused, as is a config with `normalization: global`.
+
+Usage:
+    python scripts/score_products.py products.parquet --out outputs/rankings
+        [--materials data/final/materials_engineered.parquet]
+        [--config config/material_ranking.yaml] [--chunk-size 10000]
+        [--workers N] [--max-worker-memory-mb 1024]
+"""
+import argparse
+import os
+import sys
+import warnings
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # project root
+sys.path.insert(0, BASE_DIR)
+
+from src.inference import offline_scoring  # noqa: E402
+
+MODEL_DIR = os.path.join(BASE_DIR, "ml", "models")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a products file against the material catalog")
+    parser.add_argument("products")
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--materials", default=os.path.join(BASE_DIR, "data", "final", "materials_engineered.parquet"))
+    parser.add_argument("--config", default=os.path.join(BASE_DIR, "config", "material_ranking.yaml"))
+    parser.add_argument("--artifact-dir", default=os.path.join(MODEL_DIR, "fast"))
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-worker-memory-mb", type=float, default=1024)
+    args = parser.parse_args()
+
+    # Version notices from unpickling artifacts trained with older libraries
+    warnings.filterwarnings("ignore", message="Trying to unpickle")
+    warnings.filterwarnings("ignore", category=UserWarning, module="xgboost")
+    model_paths = (
+        os.path.join(MODEL_DIR, "preprocessing", "preprocessing_pipeline.pkl"),
+        os.path.join(MODEL_DIR, "rf_cost.joblib"),
+        os.path.join(MODEL_DIR, "xgb_co2.joblib")
+    )
+    print(f"📥 Scoring {args.products} -> {args.out}")
+    try:
+        summary = offline_scoring.run(
+            args.products, args.materials, args.config, args.out, model_paths,
+            artifact_dir=args.artifact_dir,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            max_worker_memory_mb=args.max_worker_memory_mb
+        )
+    except ValueError as e:
+        sys.exit(f"❌ {e}")
+    print(f"💾 {summary['products_scored']:,} products, {summary['rows_written']:,} ranked rows "
+          f"in {summary['seconds']:.1f}s ({summary['chunks_skipped']} chunks resumed from checkpoint)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Fast-loading model artifact format.
+
+`convert_artifacts` turns the pickled training outputs into formats that load
+without unpickling (and without importing scikit-learn or XGBoost):
+
+- pipeline.json   : fitted ColumnTransformer parameters (fast_transform)
+- rf_cost/        : random forest node arrays, one .npy per array
+- xgb_co2/        : XGBoost node arrays, one .npy per array
+- xgb_co2.ubj     : XGBoost native booster, for exact float32 predictions
+- linear/<name>.npz : coef_ / intercept_ of any linear models given
+- manifest.json   : format version, conversion time and source file sizes/mtimes
+
+`load_artifacts` memory-maps the .npy node arrays, so forked workers share
+their pages. Outputs: the transformer is bit-for-bit identical to the
+pipeline, the forest matches within float64 rounding and the XGBoost node
+arrays within float32 rounding; pass `native_xgboost=True` to load the UBJ
+booster instead for exact XGBoost outputs (at the cost of importing it).
+
+`stale_sources` compares the manifest with the pickles on disk; artifacts
+converted from an older pickle must not be loaded in place of a newer one.
+"""
+import json
+import os
+import time
+
+import numpy as np
+
+from src.inference.fast_transform import FastTransformer, compile_column_transformer
+from src.inference.tree_compiler import CompiledEnsemble, compile_model
+
+ARTIFACT_FORMAT_VERSION = 1
+
+
+def _source_info(path):
+    stat = os.stat(path)
+    return {"path": os.path.abspath(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def convert_artifacts(pipeline_path, cost_model_path, co2_model_path, out_dir, linear_model_paths=()):
+    """Convert the pickled pipeline and models in place of unpickling at startup."""
+    import joblib
+
+    os.makedirs(out_dir, exist_ok=True)
+    compile_column_transformer(joblib.load(pipeline_path)).save(os.path.join(out_dir, "pipeline.json"))
+    compile_model(joblib.load(cost_model_path)).save_dir(os.path.join(out_dir, "rf_cost"))
+
+    co2_model = joblib.load(co2_model_path)
+    compile_model(co2_model).save_dir(os.path.join(out_dir, "xgb_co2"))
+    booster = co2_model.get_booster() if hasattr(co2_model, "get_booster") else co2_model
+    booster.save_model(os.path.join(out_dir, "xgb_co2.ubj"))
+
+    linear = {}
+    for path in linear_model_paths:
+        model = joblib.load(path)
+        name = os.path.splitext(os.path.basename(path))[0]
+        os.makedirs(os.path.join(out_dir, "linear"), exist_ok=True)
+        np.savez(os.path.join(out_dir, "linear", f"{name}.npz"),
+                 coef=np.asarray(model.coef_), intercept=np.asarray(model.intercept_))
+        linear[name] = _source_info(path)
+
+    manifest = {
+        "format_version": ARTIFACT_FORMAT_VERSION,
+        "converted_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "sources": {
+            "pipeline": _source_info(pipeline_path),
+            "rf_cost": _source_info(cost_model_path),
+            "xgb_co2": _source_info(co2_model_path),
+            "linear": linear
+        }
+    }
+    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def artifacts_available(artifact_dir):
+    return bool(artifact_dir) and os.path.exists(os.path.join(artifact_dir, "manifest.json"))
+
+
+def stale_sources(artifact_dir, sources):
+    """
+    Names of the `sources` ({"pipeline": path, "rf_cost": path, "xgb_co2":
+    path}) whose size or mtime differs from the file that was converted.
+    Sources missing on disk are skipped: the artifacts are all there is.
+    """
+    with open(os.path.join(artifact_dir, "manifest.json")) as f:
+        converted = json.load(f).get("sources", {})
+    stale = []
+    for name, path in sources.items():
+        if not path or not os.path.exists(path):
+            continue
+        recorded = converted.get(name) or {}
+        current = _source_info(path)
+        if (recorded.get("size"), recorded.get("mtime_ns")) != (current["size"], current["mtime_ns"]):
+            stale.append(name)
+    return stale
+
+
+class _NativeBooster:
+    """XGBoost booster loaded from UBJ, with the estimator's predict output."""
+
+    def __init__(self, path):
+        import xgboost
+
+        self.booster = xgboost.Booster(model_file=path)
+
+    def predict(self, X):
+        return self.booster.inplace_predict(X)
+
+
+def load_artifacts(artifact_dir, mmap_mode="r", native_xgboost=False):
+    """
+    Load converted artifacts. Returns (transformer, cost_model, co2_model);
+    both models expose `predict(X)` like the original estimators.
+    """
+    with open(os.path.join(artifact_dir, "manifest.json")) as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != ARTIFACT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported artifact format: {manifest.get('format_version')}")
+
+    transformer = FastTransformer.load(os.path.join(artifact_dir, "pipeline.json"))
+    cost_model = CompiledEnsemble.load_dir(os.path.join(artifact_dir, "rf_cost"), mmap_mode)
+    if native_xgboost:
+        co2_model = _NativeBooster(os.path.join(artifact_dir, "xgb_co2.ubj"))
+    else:
+        co2_model = CompiledEnsemble.load_dir(os.path.join(artifact_dir, "xgb_co2"), mmap_mode)
+    return transformer, cost_model, co2_model
+
+
+def load_linear_model(artifact_dir, name):
+    """(coef, intercept) for a converted linear model; predict with X @ coef + intercept."""
+    with np.load(os.path.join(artifact_dir, "linear", f"{name}.npz")) as data:
+        return data["coef"], data["intercept"]
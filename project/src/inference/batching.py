@@ -0,0 +1,151 @@
+"""
+Micro-batching scheduler for model inference.
+
+Concurrent callers submit their model input frames; a single worker thread
+collects everything that arrives within a short window (or until a row
+budget is reached), runs one batched transform + predict over the combined
+frame and hands each caller back its own slice of the outputs. Throughput
+per core goes up because the pipeline and model overhead is paid once per
+batch instead of once per request; latency grows by at most the window.
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+
+
+class MicroBatcher:
+    """
+    Gather submitted frames into batches for `predict_fn`.
+
+    :param predict_fn: callable taking one DataFrame and returning an array
+                       or a tuple of arrays with one entry per input row
+                       (e.g. EcoPackPredictor.predict_arrays).
+    :param max_wait_ms: how long the worker waits for more requests after
+                        the first one of a batch arrives.
+    :param max_batch_rows: flush as soon as this many rows are queued.
+    """
+
+    def __init__(self, predict_fn, max_wait_ms=3.0, max_batch_rows=1024):
+        self.predict_fn = predict_fn
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.max_batch_rows = max(1, int(max_batch_rows))
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._worker = None
+        self._stopped = False
+        # Metrics
+        self.requests = 0
+        self.batches = 0
+        self.rows = 0
+        self.max_batch_requests = 0
+        self.total_wait = 0.0
+        self.max_wait_seen = 0.0
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._stopped = False
+            self._worker = threading.Thread(target=self._run, name="inference-batcher", daemon=True)
+            self._worker.start()
+
+    def submit(self, frame):
+        """Queue `frame` for the next batch; returns a Future with its outputs."""
+        future = Future()
+        with self._cond:
+            self._ensure_worker()
+            self._queue.append((frame, future, time.perf_counter()))
+            self._cond.notify()
+        return future
+
+    def predict(self, frame, timeout=None):
+        """Submit `frame` and wait for its outputs."""
+        return self.submit(frame).result(timeout)
+
+    def _take_batch(self):
+        """Block for the first request, then gather until the window or row budget is used."""
+        with self._cond:
+            while not self._queue and not self._stopped:
+                self._cond.wait()
+            if self._stopped and not self._queue:
+                return None
+            deadline = time.perf_counter() + self.max_wait
+            while True:
+                queued_rows = sum(len(item[0]) for item in self._queue)
+                remaining = deadline - time.perf_counter()
+                if queued_rows >= self.max_batch_rows or remaining <= 0 or self._stopped:
+                    break
+                self._cond.wait(remaining)
+
+            batch, rows = [], 0
+            while self._queue and (not batch or rows + len(self._queue[0][0]) <= self.max_batch_rows):
+                item = self._queue.popleft()
+                batch.append(item)
+                rows += len(item[0])
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                return
+            self._execute(batch)
+
+    def _execute(self, batch):
+        started = time.perf_counter()
+        sizes = [len(frame) for frame, _, _ in batch]
+        try:
+            frame = batch[0][0] if len(batch) == 1 else pd.concat(
+                [frame for frame, _, _ in batch], ignore_index=True
+            )
+            outputs = self.predict_fn(frame)
+        except Exception as e:
+            for _, future, _ in batch:
+                future.set_exception(e)
+            outputs = None
+
+        with self._cond:
+            self.batches += 1
+            self.requests += len(batch)
+            self.rows += sum(sizes)
+            self.max_batch_requests = max(self.max_batch_requests, len(batch))
+            for _, _, queued_at in batch:
+                wait = started - queued_at
+                self.total_wait += wait
+                self.max_wait_seen = max(self.max_wait_seen, wait)
+
+        if outputs is None:
+            return
+        offsets = np.cumsum([0] + sizes)
+        for (_, future, _), start, stop in zip(batch, offsets[:-1], offsets[1:]):
+            if isinstance(outputs, tuple):
+                future.set_result(tuple(out[start:stop] for out in outputs))
+            else:
+                future.set_result(outputs[start:stop])
+
+    def stop(self):
+        """Finish queued requests and stop the worker."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._worker:
+            self._worker.join(timeout=5)
+            self._worker = None
+
+    def stats(self):
+        """Queue depth, batch size and wait-time counters."""
+        with self._cond:
+            return {
+                "queue_depth": len(self._queue),
+                "requests": self.requests,
+                "batches": self.batches,
+                "rows": self.rows,
+                "avg_batch_requests": round(self.requests / self.batches, 3) if self.batches else 0.0,
+                "max_batch_requests": self.max_batch_requests,
+                "avg_wait_ms": round(self.total_wait / self.requests * 1000, 3) if self.requests else 0.0,
+                "max_wait_ms": round(self.max_wait_seen * 1000, 3),
+                "window_ms": self.max_wait * 1000,
+                "max_batch_rows": self.max_batch_rows
+            }
@@ -0,0 +1,276 @@
+"""
+Fast-path replacement for the fitted preprocessing ColumnTransformer.
+
+`compile_column_transformer` reads the fitted pipeline once and keeps only
+the learned parameters: imputer statistics, scaler mean/scale arrays and a
+dict per one-hot column mapping category -> output index. `FastTransformer`
+then writes each block straight into one preallocated output matrix, with
+none of sklearn's per-call validation, column dispatch or hstack. For one or
+a few rows that overhead is most of the cost of `pipeline.transform`.
+
+The arithmetic is the same as sklearn's (impute, subtract mean, divide by
+scale, one-hot), in the same dtype and order, so the output is bit-for-bit
+identical to `pipeline.transform`. Supported building blocks:
+SimpleImputer (no indicator), StandardScaler, OneHotEncoder (no drop, no
+infrequent categories), 'passthrough' and 'drop', optionally chained in a
+Pipeline. Anything else raises ValueError so the caller keeps the original.
+"""
+import json
+
+import numpy as np
+
+
+class _Block:
+    """One ColumnTransformer entry: input columns, fitted steps, output slice."""
+
+    def __init__(self, columns, steps, start, stop):
+        self.columns = columns
+        self.steps = steps
+        self.start = start
+        self.stop = stop
+
+
+def _compile_steps(transformer):
+    """Fitted parameters for a transformer or Pipeline, as ('kind', params) tuples."""
+    if transformer == "passthrough":
+        return []
+    steps = [step for _, step in transformer.steps] if hasattr(transformer, "steps") else [transformer]
+    compiled = []
+    for i, step in enumerate(steps):
+        name = type(step).__name__
+        if name == "SimpleImputer":
+            if step.add_indicator:
+                raise ValueError("SimpleImputer with add_indicator is not supported")
+            if not (isinstance(step.missing_values, float) and np.isnan(step.missing_values)):
+                raise ValueError("SimpleImputer must use missing_values=np.nan")
+            statistics = np.asarray(step.statistics_)
+            if statistics.dtype.kind == "f" and np.isnan(statistics).any():
+                raise ValueError("SimpleImputer dropped all-missing features")
+            compiled.append(("impute", statistics))
+        elif name == "StandardScaler":
+            mean = step.mean_ if step.with_mean else None
+            scale = step.scale_ if step.with_std else None
+            compiled.append(("scale", (mean, scale)))
+        elif name == "OneHotEncoder":
+            if i != len(steps) - 1:
+                raise ValueError("OneHotEncoder must be the last step")
+            if step.drop_idx_ is not None or getattr(step, "_infrequent_enabled", False):
+                raise ValueError("OneHotEncoder with drop/infrequent categories is not supported")
+            offsets = np.cumsum([0] + [len(c) for c in step.categories_])
+            index_maps = [
+                {category: offset + j for j, category in enumerate(categories)}
+                for categories, offset in zip(step.categories_, offsets[:-1])
+            ]
+            compiled.append(("onehot", (index_maps, step.handle_unknown == "ignore",
+                                        int(offsets[-1]), np.dtype(step.dtype))))
+        else:
+            raise ValueError(f"Unsupported transformer step: {name}")
+    return compiled
+
+
+def _block_width(columns, steps):
+    if steps and steps[-1][0] == "onehot":
+        return steps[-1][1][2]
+    return len(columns)
+
+
+def _block_dtype(columns, steps, input_dtypes):
+    """Output dtype of one block, following sklearn's casting rules."""
+    if steps and steps[-1][0] == "onehot":
+        return steps[-1][1][3]
+    dtype = np.result_type(*[input_dtypes[c] for c in columns])
+    if any(kind == "scale" for kind, _ in steps) or (steps and dtype.kind in "iub"):
+        return np.dtype(np.float64)
+    return dtype
+
+
+def _step_to_dict(kind, params):
+    if kind == "impute":
+        return {"kind": kind, "statistics": params.tolist(), "dtype": params.dtype.str}
+    if kind == "scale":
+        mean, scale = params
+        return {"kind": kind,
+                "mean": None if mean is None else mean.tolist(),
+                "scale": None if scale is None else scale.tolist()}
+    index_maps, ignore_unknown, width, dtype = params
+    return {"kind": kind,
+            "categories": [sorted(m, key=m.get) for m in index_maps],
+            "ignore_unknown": ignore_unknown, "width": width, "dtype": dtype.str}
+
+
+def _step_from_dict(step):
+    kind = step["kind"]
+    if kind == "impute":
+        dtype = np.dtype(step["dtype"])
+        return kind, np.array(step["statistics"], dtype=object if dtype.kind == "O" else dtype)
+    if kind == "scale":
+        return kind, tuple(None if step[k] is None else np.array(step[k], dtype=np.float64)
+                           for k in ("mean", "scale"))
+    offset, index_maps = 0, []
+    for categories in step["categories"]:
+        index_maps.append({category: offset + j for j, category in enumerate(categories)})
+        offset += len(categories)
+    return kind, (index_maps, step["ignore_unknown"], step["width"], np.dtype(step["dtype"]))
+
+
+class FastTransformer:
+    """Compiled ColumnTransformer; see compile_column_transformer."""
+
+    def __init__(self, blocks, n_output, feature_names_in):
+        self.blocks = blocks
+        self.n_output = n_output
+        self.feature_names_in = feature_names_in
+
+    def save(self, path):
+        """Write the fitted parameters as JSON (floats round-trip exactly)."""
+        config = {
+            "n_output": self.n_output,
+            "feature_names_in": [str(c) for c in self.feature_names_in],
+            "blocks": [
+                {"columns": b.columns, "start": b.start, "stop": b.stop,
+                 "steps": [_step_to_dict(kind, params) for kind, params in b.steps]}
+                for b in self.blocks
+            ]
+        }
+        with open(path, "w") as f:
+            json.dump(config, f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            config = json.load(f)
+        blocks = [
+            _Block(b["columns"], [_step_from_dict(step) for step in b["steps"]], b["start"], b["stop"])
+            for b in config["blocks"]
+        ]
+        return cls(blocks, config["n_output"], config["feature_names_in"])
+
+    @property
+    def input_columns(self):
+        return [c for b in self.blocks for c in b.columns]
+
+    def subset(self, columns):
+        """
+        Transformer for only the given input columns, plus the positions of
+        its output columns in the full output. Every step acts column by
+        column, so the subset's values are identical to the matching columns
+        of `transform`.
+        """
+        wanted = set(columns)
+        blocks, positions, position = [], [], 0
+        for block in self.blocks:
+            keep = [j for j, c in enumerate(block.columns) if c in wanted]
+            if not keep:
+                continue
+            steps = []
+            for kind, params in block.steps:
+                if kind == "impute":
+                    steps.append((kind, params[keep]))
+                elif kind == "scale":
+                    steps.append((kind, tuple(None if p is None else p[keep] for p in params)))
+                else:
+                    index_maps, ignore_unknown, _, dtype = params
+                    offset, maps = 0, []
+                    for j in keep:
+                        categories = sorted(index_maps[j], key=index_maps[j].get)
+                        full_start = index_maps[j][categories[0]] if categories else 0
+                        positions.extend(block.start + full_start + np.arange(len(categories)))
+                        maps.append({c: offset + k for k, c in enumerate(categories)})
+                        offset += len(categories)
+                    steps.append((kind, (maps, ignore_unknown, offset, dtype)))
+            names = [block.columns[j] for j in keep]
+            if not (steps and steps[-1][0] == "onehot"):
+                positions.extend(block.start + j for j in keep)
+            width = _block_width(names, steps)
+            blocks.append(_Block(names, steps, position, position + width))
+            position += width
+        return FastTransformer(blocks, position, list(columns)), np.asarray(positions, dtype=np.intp)
+
+    def _numeric(self, frame, block):
+        values = frame[block.columns].to_numpy(dtype=np.float64)
+        for kind, params in block.steps:
+            if kind == "impute":
+                mask = np.isnan(values)
+                if mask.any():
+                    values = np.where(mask, params.astype(np.float64), values)
+            elif kind == "scale":
+                mean, scale = params
+                if mean is not None:
+                    values = values - mean
+                if scale is not None:
+                    values = values / scale
+        return values
+
+    def _onehot(self, frame, block, out):
+        steps = block.steps
+        index_maps, ignore_unknown, _, _ = steps[-1][1]
+        statistics = steps[0][1] if steps[0][0] == "impute" else None
+        out[:, block.start:block.stop] = 0
+        for j, column in enumerate(block.columns):
+            values = frame[column].to_numpy()
+            if statistics is not None:
+                # NaN is the only missing marker (value != value), as in sklearn
+                missing = values != values
+                if missing.any():
+                    values = np.where(missing, statistics[j], values)
+            lookup = index_maps[j]
+            indices = np.fromiter((lookup.get(v, -1) for v in values), dtype=np.int64, count=len(values))
+            known = indices >= 0
+            if not ignore_unknown and not known.all():
+                unknown = values[~known][0]
+                raise ValueError(f"Found unknown category {unknown!r} in column {column!r}")
+            out[np.nonzero(known)[0], block.start + indices[known]] = 1
+
+    def transform(self, frame):
+        """Transform a DataFrame exactly like the source ColumnTransformer."""
+        n_rows = len(frame)
+        input_dtypes = {c: frame[c].dtype for b in self.blocks for c in b.columns}
+        dtype = np.result_type(*[_block_dtype(b.columns, b.steps, input_dtypes) for b in self.blocks])
+        out = np.empty((n_rows, self.n_output), dtype=dtype)
+        for block in self.blocks:
+            if block.steps and block.steps[-1][0] == "onehot":
+                self._onehot(frame, block, out)
+            elif any(kind == "scale" for kind, _ in block.steps):
+                out[:, block.start:block.stop] = self._numeric(frame, block)
+            else:
+                values = frame[block.columns].to_numpy(dtype=out.dtype if block.steps else None)
+                if block.steps:
+                    statistics = block.steps[0][1]
+                    missing = values != values
+                    if missing.any():
+                        values = np.where(missing, statistics, values)
+                out[:, block.start:block.stop] = values
+        return out
+
+
+def compile_column_transformer(transformer):
+    """
+    Build a FastTransformer from a fitted ColumnTransformer with dense
+    output. Raises ValueError for anything it cannot reproduce exactly.
+    """
+    if type(transformer).__name__ != "ColumnTransformer":
+        raise ValueError(f"Expected a ColumnTransformer, got {type(transformer).__name__}")
+    if getattr(transformer, "sparse_output_", False):
+        raise ValueError("Sparse ColumnTransformer output is not supported")
+
+    blocks = []
+    position = 0
+    for name, fitted, columns in transformer.transformers_:
+        if fitted == "drop" or len(columns) == 0:
+            continue
+        if name == "remainder" and fitted != "passthrough":
+            raise ValueError("Only 'drop' or 'passthrough' remainders are supported")
+        names = transformer.feature_names_in_[columns] if np.asarray(columns).dtype.kind in "iub" \
+            else np.asarray(columns)
+        names = [str(c) for c in names]
+        steps = _compile_steps(fitted)
+        kinds = [kind for kind, _ in steps]
+        if "onehot" in kinds and "scale" in kinds:
+            raise ValueError("Scaling before one-hot encoding is not supported")
+        if len([k for k in kinds if k == "impute"]) > 1 or (kinds and kinds[0] != "impute" and "impute" in kinds):
+            raise ValueError("SimpleImputer must be the first step")
+        width = _block_width(names, steps)
+        blocks.append(_Block(names, steps, position, position + width))
+        position += width
+
+    return FastTransformer(blocks, position, list(getattr(transformer, "feature_names_in_", [])))
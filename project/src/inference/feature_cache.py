@@ -0,0 +1,78 @@
+"""
+Cached material-side block of the model feature matrix.
+
+In a products x materials model frame the material columns repeat
+unchanged for every product, and only change when the catalog does. The
+cache transforms them once per catalog version (one row per material) and
+each request only transforms its product columns (one row per product).
+Both blocks are then broadcast into the P*M x F feature matrix, whose rows
+are laid out like build_model_frame (row p * M + m = product p, material m).
+
+The fast-path transformer works column by column, so the assembled matrix
+is bit-for-bit identical to transforming the full cross-joined frame.
+"""
+import threading
+
+import numpy as np
+
+
+class MaterialFeatureCache:
+    """Per-catalog-version material block for one FastTransformer."""
+
+    def __init__(self, transformer, max_versions=2):
+        self.transformer = transformer
+        self.max_versions = max(1, max_versions)
+        self._blocks = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _split(self, material_columns):
+        inputs = self.transformer.input_columns
+        material = [c for c in inputs if c in material_columns]
+        product = [c for c in inputs if c not in material_columns]
+        return material, product
+
+    def material_block(self, materials_df, catalog_version=None):
+        """(transformed material rows, their output positions, product columns)."""
+        key = (catalog_version, tuple(materials_df.columns))
+        with self._lock:
+            cached = self._blocks.get(key) if catalog_version is not None else None
+            if cached is not None:
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        material, product = self._split(set(materials_df.columns))
+        material_transformer, positions = self.transformer.subset(material)
+        block = (material_transformer.transform(materials_df), positions, product)
+
+        if catalog_version is not None:
+            with self._lock:
+                # A new catalog version replaces the oldest cached block
+                while len(self._blocks) >= self.max_versions:
+                    self._blocks.pop(next(iter(self._blocks)))
+                self._blocks[key] = block
+        return block
+
+    def transform(self, products_df, materials_df, catalog_version=None):
+        """
+        Feature matrix for every product x material pair. `products_df` has
+        one row per product with the product-side model columns.
+        """
+        material_values, material_positions, product_columns = self.material_block(
+            materials_df, catalog_version
+        )
+        product_transformer, product_positions = self.transformer.subset(product_columns)
+        product_values = product_transformer.transform(products_df[product_columns])
+
+        n_products, n_materials = len(products_df), len(materials_df)
+        dtype = np.result_type(material_values.dtype, product_values.dtype)
+        out = np.empty((n_products, n_materials, self.transformer.n_output), dtype=dtype)
+        out[:, :, material_positions] = material_values[None, :, :]
+        out[:, :, product_positions] = product_values[:, None, :]
+        return out.reshape(n_products * n_materials, self.transformer.n_output)
+
+    def stats(self):
+        with self._lock:
+            return {"versions": len(self._blocks), "hits": self.hits, "misses": self.misses}
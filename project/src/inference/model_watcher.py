@@ -0,0 +1,133 @@
+"""
+Background watcher that deploys new model versions without a restart.
+
+Each version lives in its own subdirectory of the versions directory
+(e.g. `ml/models/versions/v2/`) holding either the artifacts written by
+artifacts.convert_artifacts (`manifest.json` is written last, so its
+presence marks a complete copy) or the three pickles. Directories whose
+name starts with "." or "_" are ignored, so a version can be copied under
+a temporary name and renamed into place.
+
+When a version newer than any seen before appears, the watcher builds its
+predictor and hands it to PredictorRegistry.promote, which loads and warms
+it up in the watcher thread and swaps it in atomically. A version is tried
+once: after a rollback the watcher does not re-promote it, and a version
+that fails to load is logged and skipped.
+"""
+import logging
+import os
+import re
+import threading
+
+from src.inference.artifacts import artifacts_available
+
+# File names of a pickled version, in EcoPackPredictor argument order
+PICKLE_FILES = ("preprocessing_pipeline.pkl", "rf_cost.joblib", "xgb_co2.joblib")
+
+
+def _version_key(name):
+    """Natural sort key, so v10 sorts after v9."""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", name)]
+
+
+def is_complete(version_dir):
+    return artifacts_available(version_dir) or all(
+        os.path.exists(os.path.join(version_dir, f)) for f in PICKLE_FILES
+    )
+
+
+def available_versions(versions_dir):
+    """Complete version directory names, oldest first."""
+    try:
+        names = os.listdir(versions_dir)
+    except OSError:
+        return []
+    return sorted(
+        (n for n in names
+         if not n.startswith((".", "_")) and is_complete(os.path.join(versions_dir, n))),
+        key=_version_key
+    )
+
+
+class ModelWatcher:
+    """
+    Poll `versions_dir` and promote new versions into `registry`.
+
+    :param build_predictor: callable taking a version directory and
+                            returning an (unloaded) EcoPackPredictor.
+    """
+
+    def __init__(self, registry, versions_dir, build_predictor, name="default", poll_interval=30.0):
+        self.registry = registry
+        self.versions_dir = versions_dir
+        self.build_predictor = build_predictor
+        self.name = name
+        self.poll_interval = poll_interval
+        self._seen = set()
+        self._failed = {}
+        self._check_lock = threading.Lock()
+        self._watcher = None
+        self._stop = threading.Event()
+
+    def latest(self):
+        """Newest complete version (name, directory), or None."""
+        versions = available_versions(self.versions_dir)
+        if not versions:
+            return None
+        return versions[-1], os.path.join(self.versions_dir, versions[-1])
+
+    def mark_seen(self, version):
+        """Record a version deployed by other means so it is not promoted again."""
+        self._seen.add(version)
+
+    def check(self):
+        """
+        Promote the newest version if it has not been tried yet. Returns the
+        promoted version, or None. The active version keeps serving while
+        the new one loads and if it fails.
+        """
+        with self._check_lock:
+            latest = self.latest()
+            if latest is None or latest[0] in self._seen:
+                return None
+            version, directory = latest
+            self._seen.add(version)
+            try:
+                self.registry.promote(self.name, self.build_predictor(directory), version)
+            except Exception as e:
+                self._failed[version] = str(e)
+                logging.warning(f"Model version {version} failed to load, keeping "
+                                f"{self.registry.version(self.name)}: {e}")
+                return None
+            return version
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            self.check()
+
+    def start_watcher(self):
+        """Start the background poller (no-op if disabled or already running)."""
+        if self.poll_interval <= 0 or (self._watcher and self._watcher.is_alive()):
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, name="model-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self):
+        self._stop.set()
+        if self._watcher:
+            self._watcher.join(timeout=self.poll_interval + 1)
+            self._watcher = None
+
+    def status(self):
+        """Active / previous / available versions, for the admin endpoint."""
+        predictor = self.registry.status().get(self.name, {})
+        return {
+            "active_version": predictor.get("version"),
+            "previous_version": predictor.get("previous_version"),
+            "available_versions": available_versions(self.versions_dir),
+            "failed_versions": dict(self._failed),
+            "versions_dir": self.versions_dir,
+            "poll_interval_seconds": self.poll_interval,
+            "watching": bool(self._watcher and self._watcher.is_alive())
+        }
@@ -0,0 +1,236 @@
+"""
+Offline scoring of large product files against the material catalog.
+
+The products file (CSV or Parquet) is read in chunks. Each chunk is sent to
+a process pool. Workers score the products x materials matrix with
+EcoPackPredictor, rank it with rank_materials and write the top-N rows to
+their own Parquet partition. Finished partitions are the checkpoint: a
+re-run skips every chunk whose partition already exists, so an interrupted
+job resumes where it stopped. `run.json` in the output directory records
+what the partitions were scored from (input, materials, ranking config and
+model files with their sizes and mtimes, and the chunk size); a re-run with
+anything different is refused instead of mixing partitions of two runs.
+
+Memory per worker is bounded by splitting each chunk into sub-batches of
+products whose products x materials frame fits `max_worker_memory_mb`.
+Scores are therefore only independent of the chunking with per-product
+normalization; `run` refuses configs with `normalization: global`.
+"""
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from src.inference.predictor import EcoPackPredictor
+from src.recommendation.ranker import rank_materials
+from src.recommendation.ranking_config import load_ranking_config
+from src.recommendation.segment_rank import GLOBAL
+
+# rank_materials grades recyclability A (best) .. D; the engineered material
+# table stores it as a High / Medium / Low category
+RECYCLABILITY_GRADES = {"High": "A", "Medium": "B", "Low": "C"}
+
+PRODUCT_COLUMNS = ["product_weight", "fragility_index", "category", "shipping_type"]
+
+OUTPUT_COLUMNS = [
+    "product_id", "Material ID", "Material Type", "rank", "ranking_score",
+    "predicted_cost", "predicted_co2", "Material_Suitability_Score", "Recyclability_Category"
+]
+
+RUN_MANIFEST = "run.json"
+
+# Rough multiple of the model frame size held at once while transforming,
+# predicting and ranking a sub-batch
+_WORKING_SET_FACTOR = 4
+
+_worker = {}
+
+
+def load_materials(path):
+    """Material table with the columns rank_materials expects."""
+    materials = pd.read_parquet(path) if path.endswith(".parquet") else pd.read_csv(path)
+    if "Recyclability_Category" not in materials.columns:
+        materials["Recyclability_Category"] = materials["Recyclability Category"].map(RECYCLABILITY_GRADES)
+    return materials.reset_index(drop=True)
+
+
+def iter_product_chunks(path, chunk_size):
+    """Yield (chunk_index, DataFrame) pairs with a global `product_id` column."""
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        batches = (batch.to_pandas() for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size))
+    else:
+        batches = pd.read_csv(path, chunksize=chunk_size)
+
+    offset = 0
+    for index, chunk in enumerate(batches):
+        chunk = chunk.reset_index(drop=True)
+        if "product_id" not in chunk.columns:
+            chunk.insert(0, "product_id", np.arange(offset, offset + len(chunk)))
+        offset += len(chunk)
+        yield index, chunk
+
+
+def count_products(path):
+    """Row count when it is cheap to get (Parquet metadata), else None."""
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        return pq.ParquetFile(path).metadata.num_rows
+    return None
+
+
+def products_per_batch(materials, max_worker_memory_mb):
+    """How many products fit in one sub-batch under the memory ceiling."""
+    if not max_worker_memory_mb:
+        return None
+    bytes_per_row = materials.memory_usage(deep=True).sum() / max(1, len(materials)) + 64
+    budget = max_worker_memory_mb * 1024 * 1024 / _WORKING_SET_FACTOR
+    return max(1, int(budget // (bytes_per_row * max(1, len(materials)))))
+
+
+def build_frame(products, materials):
+    """Cross join products x materials; row p * M + m is product p with material m."""
+    n_materials = len(materials)
+    product_side = products[["product_id"] + [c for c in PRODUCT_COLUMNS if c in products.columns]]
+    product_side = product_side.iloc[np.repeat(np.arange(len(products)), n_materials)].reset_index(drop=True)
+    material_side = materials.iloc[np.tile(np.arange(n_materials), len(products))].reset_index(drop=True)
+    return pd.concat([product_side, material_side], axis=1)
+
+
+def score_chunk(products, predictor, materials, config, batch_products=None):
+    """
+    Predict and rank one chunk of products; returns the top-N rows.
+    `config` is a RankingConfig or a ranking YAML path.
+    """
+    step = batch_products or len(products)
+    ranked = []
+    for start in range(0, len(products), step):
+        frame = build_frame(products.iloc[start:start + step], materials)
+        frame["predicted_cost"], frame["predicted_co2"] = predictor.predict_arrays(frame)
+        result = rank_materials(frame, config)
+        ranked.append(result[[c for c in OUTPUT_COLUMNS if c in result.columns]])
+    return pd.concat(ranked, ignore_index=True) if ranked else pd.DataFrame(columns=OUTPUT_COLUMNS)
+
+
+def partition_path(out_dir, chunk_index):
+    return os.path.join(out_dir, f"part-{chunk_index:06d}.parquet")
+
+
+def _file_info(path):
+    stat = os.stat(path)
+    return {"path": os.path.abspath(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def run_manifest(products_path, materials_path, config_path, model_paths, chunk_size, artifact_dir=None):
+    """What a run's partitions depend on; resuming needs every entry to match."""
+    return {
+        "products": _file_info(products_path),
+        "materials": _file_info(materials_path),
+        "config": _file_info(config_path),
+        "models": [_file_info(path) for path in model_paths],
+        "artifact_dir": os.path.abspath(artifact_dir) if artifact_dir else None,
+        "chunk_size": chunk_size
+    }
+
+
+def check_run_manifest(out_dir, manifest):
+    """
+    Write `manifest` to a fresh output directory, or check it against the one
+    already there. Raises ValueError when existing partitions came from a
+    different run (or from a run without a manifest).
+    """
+    path = os.path.join(out_dir, RUN_MANIFEST)
+    if os.path.exists(path):
+        with open(path) as f:
+            previous = json.load(f)
+        changed = sorted(key for key in set(manifest) | set(previous) if manifest.get(key) != previous.get(key))
+        if changed:
+            raise ValueError(f"{out_dir} holds partitions of a different run ({', '.join(changed)} changed); "
+                             f"use a new output directory or remove it")
+        return
+    if any(name.startswith("part-") for name in os.listdir(out_dir)):
+        raise ValueError(f"{out_dir} holds partitions without a {RUN_MANIFEST}; cannot tell what they were "
+                         f"scored from")
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def _init_worker(model_paths, artifact_dir, materials_path, config_path, max_worker_memory_mb):
+    materials = load_materials(materials_path)
+    _worker["predictor"] = EcoPackPredictor(*model_paths, artifact_dir=artifact_dir).load()
+    _worker["materials"] = materials
+    # Parsed once per worker, not once per sub-batch
+    _worker["config"] = load_ranking_config(config_path)
+    _worker["batch_products"] = products_per_batch(materials, max_worker_memory_mb)
+
+
+def _score_partition(chunk_index, products, out_dir):
+    ranked = score_chunk(products, _worker["predictor"], _worker["materials"],
+                         _worker["config"], _worker["batch_products"])
+    # Write then rename, so a partition on disk is always complete
+    path = partition_path(out_dir, chunk_index)
+    ranked.to_parquet(path + ".tmp", index=False)
+    os.replace(path + ".tmp", path)
+    return chunk_index, len(products), len(ranked)
+
+
+def run(products_path, materials_path, config_path, out_dir, model_paths, artifact_dir=None,
+        chunk_size=10000, workers=None, max_worker_memory_mb=1024, log=print):
+    """
+    Score every product in `products_path` and write ranked partitions to
+    `out_dir`. Returns a summary dict. Raises ValueError when `out_dir`
+    holds partitions of a run with other inputs (see check_run_manifest),
+    or when the config normalizes globally: min-max bounds would then come
+    from each sub-batch, so results would depend on the chunking.
+    """
+    if load_ranking_config(config_path).normalization == GLOBAL:
+        raise ValueError("Offline scoring needs per-product normalization (normalization: product); "
+                         "global bounds would change with the chunk size")
+    os.makedirs(out_dir, exist_ok=True)
+    check_run_manifest(out_dir, run_manifest(products_path, materials_path, config_path, model_paths,
+                                             chunk_size, artifact_dir))
+    workers = workers or os.cpu_count() or 1
+    total = count_products(products_path)
+    started = time.perf_counter()
+    done_products = skipped = written_rows = 0
+    pending = set()
+
+    def report(future):
+        nonlocal done_products, written_rows
+        chunk_index, n_products, n_rows = future.result()
+        done_products += n_products
+        written_rows += n_rows
+        rate = done_products / max(time.perf_counter() - started, 1e-9)
+        progress = f"{done_products:,}/{total:,}" if total else f"{done_products:,}"
+        log(f"  chunk {chunk_index}: {progress} products scored ({rate:,.0f}/s)")
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(model_paths, artifact_dir, materials_path, config_path, max_worker_memory_mb)
+    ) as pool:
+        for chunk_index, products in iter_product_chunks(products_path, chunk_size):
+            if os.path.exists(partition_path(out_dir, chunk_index)):
+                skipped += 1
+                continue
+            # Keep at most two chunks per worker in flight so the reader stays bounded
+            while len(pending) >= 2 * workers:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    report(future)
+            pending.add(pool.submit(_score_partition, chunk_index, products, out_dir))
+        for future in wait(pending).done:
+            report(future)
+
+    return {
+        "products_scored": done_products,
+        "rows_written": written_rows,
+        "chunks_skipped": skipped,
+        "seconds": time.perf_counter() - started
+    }
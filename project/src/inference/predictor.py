@@ -1,18 +1,280 @@
+import logging
+import threading
+import time
 
 import joblib
+import numpy as np
 import pandas as pd
 
+from src.inference.artifacts import artifacts_available, load_artifacts, stale_sources
+from src.inference.fast_transform import compile_column_transformer
+from src.inference.feature_cache import MaterialFeatureCache
+from src.inference.tree_compiler import SKLEARN, CompiledEnsemble, compile_model, compile_random_forest
+
+# Above this many rows the library predict is faster than the compiled walk
+COMPILED_MAX_ROWS = 64
+
 class EcoPackPredictor:
-    def __init__(self, pipeline_path, cost_model_path, co2_model_path):
-        self.pipeline = joblib.load(pipeline_path)
-        self.cost_model = joblib.load(cost_model_path)
-        self.co2_model = joblib.load(co2_model_path)
-
-    def predict(self, df):
-        X = self.pipeline.transform(df)
-        cost = self.cost_model.predict(X)
-        co2 = self.co2_model.predict(X)
-        return {
+    """
+    Cost / CO2 predictor over the preprocessing pipeline and the two models.
+
+    Artifacts are loaded on first use, exactly once, even when several
+    threads ask at the same time. With `mmap_mode="r"` the numpy arrays
+    stored in the joblib files are memory-mapped, so forked workers share
+    the same pages instead of each holding a copy. With `compile_trees` the
+    random forest is flattened into node arrays (see tree_compiler) and small
+    batches skip the library predict overhead; results then match the model
+    within float tolerance rather than bit for bit. XGBoost keeps its native
+    predictor, which is already faster than the array walk.
+
+    When the preprocessing pipeline is a ColumnTransformer the fast-path
+    transformer (see fast_transform) replaces `pipeline.transform`; its
+    output is bit-for-bit identical. Pipelines it cannot reproduce keep
+    using sklearn.
+
+    With an `artifact_dir` written by artifacts.convert_artifacts, the
+    converted arrays are loaded (memory-mapped) instead of the pickles,
+    unless a pickle changed since the conversion: then the pickles are loaded
+    and a warning is logged. Converted outputs are not bit-for-bit those of
+    the pickles: the XGBoost node arrays match within float32 rounding, so
+    pass `native_xgboost` for exact CO2 predictions (see artifacts). The
+    `pipeline` property unpickles the sklearn pipeline on first access.
+
+    `predict_cross` scores products x materials without building the
+    cross-joined frame: the material-side features are transformed once per
+    catalog version and cached (see feature_cache).
+
+    Passing `uncertainty` ("std" or a sequence of quantiles) also returns
+    the spread of the random forest's per-tree cost predictions. All trees
+    are evaluated for the whole batch in one pass: the flattened node walk
+    for small batches, sklearn's `apply` plus one gather for large ones.
+    """
+
+    def __init__(self, pipeline_path, cost_model_path, co2_model_path, mmap_mode=None,
+                 compile_trees=False, fast_transform=True, artifact_dir=None, native_xgboost=False):
+        self.pipeline_path = pipeline_path
+        self.cost_model_path = cost_model_path
+        self.co2_model_path = co2_model_path
+        self.mmap_mode = mmap_mode
+        self.compile_trees = compile_trees
+        self.fast_transform = fast_transform
+        self.artifact_dir = artifact_dir
+        self.native_xgboost = native_xgboost
+        self._pipeline = None
+        self._cost_model = None
+        self._co2_model = None
+        self._compiled = None
+        self._cost_trees = None
+        self._transformer = None
+        self._feature_cache = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        self.load_seconds = None
+        self.warmup_seconds = None
+
+    @classmethod
+    def from_objects(cls, pipeline, cost_model, co2_model, compile_trees=False, fast_transform=True):
+        """Predictor over already-loaded objects (no artifact files)."""
+        predictor = cls(None, None, None, compile_trees=compile_trees, fast_transform=fast_transform)
+        predictor._pipeline = pipeline
+        predictor._cost_model = cost_model
+        predictor._co2_model = co2_model
+        predictor._compile()
+        predictor._loaded = True
+        predictor.load_seconds = 0.0
+        return predictor
+
+    @property
+    def loaded(self):
+        return self._loaded
+
+    def load(self):
+        """Load the artifacts if this has not happened yet. Returns self."""
+        if self._loaded:
+            return self
+        with self._lock:
+            if not self._loaded:
+                start = time.perf_counter()
+                if self._use_artifacts():
+                    self._transformer, self._cost_model, self._co2_model = load_artifacts(
+                        self.artifact_dir, self.mmap_mode or "r", self.native_xgboost
+                    )
+                else:
+                    self._pipeline = joblib.load(self.pipeline_path, mmap_mode=self.mmap_mode)
+                    self._cost_model = joblib.load(self.cost_model_path, mmap_mode=self.mmap_mode)
+                    self._co2_model = joblib.load(self.co2_model_path, mmap_mode=self.mmap_mode)
+                    self._compile()
+                self.load_seconds = time.perf_counter() - start
+                self._loaded = True
+        return self
+
+    def _use_artifacts(self):
+        if not artifacts_available(self.artifact_dir):
+            return False
+        stale = stale_sources(self.artifact_dir, {
+            "pipeline": self.pipeline_path, "rf_cost": self.cost_model_path, "xgb_co2": self.co2_model_path
+        })
+        if stale:
+            logging.warning(f"Converted artifacts in {self.artifact_dir} are older than {', '.join(stale)}; "
+                            f"loading the pickles (re-run scripts/convert_model_artifacts.py)")
+            return False
+        return True
+
+    @property
+    def uses_fast_transform(self):
+        return self._transformer is not None
+
+    @property
+    def feature_cache(self):
+        """Material-side feature cache, or None without the fast-path transformer."""
+        if self.load()._transformer is None:
+            return None
+        if self._feature_cache is None:
+            with self._lock:
+                if self._feature_cache is None:
+                    self._feature_cache = MaterialFeatureCache(self._transformer)
+        return self._feature_cache
+
+    def _compile(self):
+        if self.fast_transform:
+            try:
+                self._transformer = compile_column_transformer(self._pipeline)
+            except (AttributeError, ValueError):
+                self._transformer = None
+        if not self.compile_trees:
+            return
+        compiled = {}
+        for name, model in (("cost", self._cost_model), ("co2", self._co2_model)):
+            try:
+                ensemble = compile_model(model)
+            except (TypeError, ValueError):
+                continue
+            if ensemble.kind == SKLEARN:
+                compiled[name] = ensemble
+        self._compiled = compiled or None
+
+    def _predict_model(self, name, model, X):
+        if self._compiled and name in self._compiled and X.shape[0] <= COMPILED_MAX_ROWS:
+            return self._compiled[name].predict(X.toarray() if hasattr(X, "toarray") else X)
+        return np.asarray(model.predict(X))
+
+    @property
+    def pipeline(self):
+        """The sklearn pipeline; unpickled on first access when the artifacts were loaded."""
+        if self.load()._pipeline is None and self.pipeline_path:
+            with self._lock:
+                if self._pipeline is None:
+                    self._pipeline = joblib.load(self.pipeline_path, mmap_mode=self.mmap_mode)
+        return self._pipeline
+
+    @property
+    def cost_model(self):
+        return self.load()._cost_model
+
+    @property
+    def co2_model(self):
+        return self.load()._co2_model
+
+    def predict_arrays(self, df, uncertainty=None):
+        """
+        Predicted cost and CO2 as arrays, in each model's native dtype
+        (XGBoost returns float32). With `uncertainty` a third item holds the
+        cost_spread dict.
+        """
+        self.load()
+        if self._transformer is not None:
+            X = self._transformer.transform(df)
+        else:
+            X = self._pipeline.transform(df)
+        return self._predict_features(X, uncertainty)
+
+    def _predict_features(self, X, uncertainty=None):
+        cost = self._predict_model("cost", self._cost_model, X)
+        co2 = self._predict_model("co2", self._co2_model, X)
+        if uncertainty is None:
+            return cost, co2
+        return cost, co2, self.cost_spread(X, uncertainty)
+
+    def _cost_ensemble(self):
+        """Flattened cost forest, compiled on first use."""
+        if self._cost_trees is None:
+            model = self._cost_model
+            if isinstance(model, CompiledEnsemble):
+                ensemble = model
+            elif self._compiled and "cost" in self._compiled:
+                ensemble = self._compiled["cost"]
+            else:
+                try:
+                    ensemble = compile_random_forest(model)
+                except AttributeError:
+                    raise ValueError(f"Cost model {type(model).__name__} is not a tree ensemble")
+            if ensemble.kind != SKLEARN:
+                raise ValueError("Prediction intervals need a random forest cost model")
+            self._cost_trees = ensemble
+        return self._cost_trees
+
+    def cost_spread(self, X, uncertainty):
+        """
+        Spread of the per-tree cost predictions for transformed rows `X`.
+        `uncertainty` is "std" (returns {"std": array}) or a sequence of
+        quantiles in [0, 1] (returns {quantile: array}).
+        """
+        ensemble = self._cost_ensemble()
+        X = X.toarray() if hasattr(X, "toarray") else X
+        if X.shape[0] > COMPILED_MAX_ROWS and hasattr(self._cost_model, "apply"):
+            trees = ensemble.tree_values(local_leaves=self._cost_model.apply(X))
+        else:
+            trees = ensemble.tree_values(X)
+        if isinstance(uncertainty, str):
+            if uncertainty != "std":
+                raise ValueError(f"Unknown uncertainty measure: {uncertainty!r}")
+            return {"std": trees.std(axis=1)}
+        quantiles = [float(q) for q in uncertainty]
+        if not quantiles or any(not 0 <= q <= 1 for q in quantiles):
+            raise ValueError("Quantiles must be between 0 and 1")
+        return dict(zip(quantiles, np.quantile(trees, quantiles, axis=1)))
+
+    def predict_cross(self, products, materials, catalog_version=None, uncertainty=None):
+        """
+        Predicted cost and CO2 for every product x material pair, in the
+        order of a cross join (row p * M + m is product p with material m).
+        `products` holds one row per product with the product-side model
+        columns; `materials` one row per material. The transformed material
+        block is reused for as long as `catalog_version` stays the same
+        (None disables the cache). Same values as `predict_arrays` on the
+        cross-joined frame; with `uncertainty` a cost_spread dict is added.
+        """
+        cache = self.feature_cache
+        if cache is not None:
+            X = cache.transform(products, materials, catalog_version)
+            return self._predict_features(X, uncertainty)
+
+        n_products, n_materials = len(products), len(materials)
+        frame = pd.concat([
+            products.iloc[np.repeat(np.arange(n_products), n_materials)].reset_index(drop=True),
+            materials.iloc[np.tile(np.arange(n_materials), n_products)].reset_index(drop=True)
+        ], axis=1)
+        return self.predict_arrays(frame, uncertainty)
+
+    def predict(self, df, uncertainty=None):
+        if uncertainty is None:
+            cost, co2 = self.predict_arrays(df)
+            spread = {}
+        else:
+            cost, co2, spread = self.predict_arrays(df, uncertainty)
+        result = {
             "predicted_cost": cost.tolist(),
             "predicted_co2": co2.tolist()
         }
+        if "std" in spread:
+            result["predicted_cost_std"] = spread["std"].tolist()
+        elif spread:
+            result["predicted_cost_quantiles"] = {str(q): values.tolist() for q, values in spread.items()}
+        return result
+
+    def warm_up(self, df):
+        """Run one throwaway batch so the first real request is not the slow one."""
+        start = time.perf_counter()
+        self.predict_arrays(df)
+        self.warmup_seconds = time.perf_counter() - start
+        return self.warmup_seconds
@@ -0,0 +1,155 @@
+"""
+Process-wide registry of EcoPackPredictor instances.
+
+Every caller that needs the models asks the registry instead of loading
+artifacts itself, so each predictor is loaded once per process no matter how
+many threads hit it first. A predictor can carry a warm-up callable that
+builds a representative input frame; `warm_up` runs it once and marks the
+predictor ready, which the service exposes on /ready.
+
+Each name also carries a model version. `promote` loads and warms a new
+predictor on the calling thread while the current one keeps serving, then
+swaps it in with a single assignment; `rollback` swaps back to the version
+it replaced, which is still in memory.
+"""
+import logging
+import threading
+
+
+class PredictorRegistry:
+    """Named predictors with lazy loading and one-time warm-up."""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _new_entry(predictor, warmup, version):
+        return {
+            "predictor": predictor,
+            "warmup": warmup,
+            "version": version,
+            "ready": warmup is None and predictor.loaded,
+            "warm_lock": threading.Lock(),
+            "error": None,
+            "previous": None
+        }
+
+    def register(self, name, predictor, warmup=None, version=None):
+        """
+        Add (or replace) `predictor` under `name`. `warmup` is an optional
+        callable returning a DataFrame to run through the predictor once.
+        """
+        with self._lock:
+            self._entries[name] = self._new_entry(predictor, warmup, version)
+
+    def promote(self, name, predictor, version, warmup=None):
+        """
+        Load and warm up `predictor`, then make it the active `version` for
+        `name`. Requests keep using the current predictor until the swap;
+        the replaced one is kept for `rollback`. Raises (and leaves the
+        active version untouched) if loading or warm-up fails.
+        """
+        current = self._entry(name)
+        warmup = warmup if warmup is not None else current["warmup"]
+        entry = self._new_entry(predictor, warmup, version)
+        predictor.load()
+        if warmup is not None:
+            seconds = predictor.warm_up(warmup())
+            logging.info(f"Predictor {name!r} version {version} warmed up in {seconds * 1000:.1f} ms")
+        entry["ready"] = True
+        with self._lock:
+            previous = self._entries[name]
+            # Only one older version stays in memory
+            previous["previous"] = None
+            entry["previous"] = previous
+            self._entries[name] = entry
+        logging.info(f"Predictor {name!r} switched {previous['version']} -> {version}")
+        return entry
+
+    def rollback(self, name="default"):
+        """
+        Swap back to the version active before the last promote (or
+        rollback). Returns the now-active version; raises LookupError if
+        there is nothing to roll back to.
+        """
+        with self._lock:
+            current = self._entry(name)
+            previous = current["previous"]
+            if previous is None:
+                raise LookupError(f"No previous version of {name!r} to roll back to")
+            current["previous"] = None
+            previous["previous"] = current
+            self._entries[name] = previous
+        logging.info(f"Predictor {name!r} rolled back {current['version']} -> {previous['version']}")
+        return previous["version"]
+
+    def version(self, name="default"):
+        """Active model version for `name` (None if unversioned or unregistered)."""
+        entry = self._entries.get(name)
+        return entry["version"] if entry else None
+
+    def _entry(self, name):
+        entry = self._entries.get(name)
+        if entry is None:
+            raise KeyError(f"No predictor registered as {name!r}")
+        return entry
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def get(self, name="default"):
+        """The loaded predictor for `name` (loads it on first call)."""
+        return self._entry(name)["predictor"].load()
+
+    def warm_up(self, name="default"):
+        """
+        Load the predictor and run its warm-up batch once. Returns True when
+        the predictor is ready; a failure is logged and kept for /ready.
+        """
+        entry = self._entry(name)
+        with entry["warm_lock"]:
+            if entry["ready"]:
+                return True
+            try:
+                predictor = entry["predictor"].load()
+                if entry["warmup"] is not None:
+                    seconds = predictor.warm_up(entry["warmup"]())
+                    logging.info(f"Predictor {name!r} warmed up in {seconds * 1000:.1f} ms")
+                entry["ready"] = True
+                entry["error"] = None
+            except Exception as e:
+                entry["error"] = str(e)
+                logging.warning(f"Predictor {name!r} warm-up failed: {e}")
+            return entry["ready"]
+
+    def warm_up_async(self, name="default"):
+        """Run `warm_up` in a daemon thread so startup is not blocked."""
+        thread = threading.Thread(
+            target=self.warm_up, args=(name,), name=f"predictor-warmup-{name}", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def is_ready(self, name="default"):
+        entry = self._entries.get(name)
+        return bool(entry and entry["ready"])
+
+    def status(self):
+        """Load / warm-up state of every predictor, for the /ready endpoint."""
+        return {
+            name: {
+                "version": entry["version"],
+                "previous_version": entry["previous"]["version"] if entry["previous"] else None,
+                "loaded": entry["predictor"].loaded,
+                "ready": entry["ready"],
+                "load_seconds": entry["predictor"].load_seconds,
+                "warmup_seconds": entry["predictor"].warmup_seconds,
+                "error": entry["error"]
+            }
+            for name, entry in list(self._entries.items())
+        }
+
+
+# Shared by the API and offline tools
+REGISTRY = PredictorRegistry()
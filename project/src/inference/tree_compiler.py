@@ -0,0 +1,212 @@
+"""
+Tree ensembles flattened into contiguous NumPy node arrays.
+
+`compile_random_forest` and `compile_xgboost` export the fitted cost / CO2
+models into one `CompiledEnsemble`: every tree's nodes are concatenated
+into flat arrays (feature, threshold, left, right, value, default_left) and
+`roots` holds the index of each tree's first node. `CompiledEnsemble.predict`
+walks all trees for a whole batch at once, one tree level per step, with no
+input validation, thread-pool dispatch or DMatrix construction, which is
+what dominates single-row latency in the library `predict` calls.
+
+Split semantics follow the source library:
+- scikit-learn: go left when x <= threshold (x cast to float32), mean of leaves
+- XGBoost: go left when x < threshold, NaN follows the default branch,
+  base_score + sum of leaves (squared-error objective only)
+"""
+import json
+import os
+
+import numpy as np
+
+SKLEARN = "sklearn"
+XGBOOST = "xgboost"
+
+_ARRAYS = ("feature", "threshold", "left", "right", "value", "default_left", "roots")
+
+
+class CompiledEnsemble:
+    """Flat node arrays for a tree ensemble and a vectorized evaluator."""
+
+    def __init__(self, kind, feature, threshold, left, right, value, default_left, roots,
+                 base_score=0.0, n_features=None):
+        if kind not in (SKLEARN, XGBOOST):
+            raise ValueError(f"Unknown ensemble kind: {kind}")
+        self.kind = kind
+        self.feature = np.ascontiguousarray(feature, dtype=np.int32)
+        self.threshold = np.ascontiguousarray(threshold)
+        self.left = np.ascontiguousarray(left, dtype=np.int32)
+        self.right = np.ascontiguousarray(right, dtype=np.int32)
+        self.value = np.ascontiguousarray(value)
+        self.default_left = np.ascontiguousarray(default_left, dtype=bool)
+        self.roots = np.ascontiguousarray(roots, dtype=np.int32)
+        self.base_score = float(base_score)
+        self.n_features = n_features
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    def leaves(self, X):
+        """Leaf node index reached in every tree, shape (n_rows, n_trees)."""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        rows = np.arange(len(X))[:, None]
+        node = np.broadcast_to(self.roots, (len(X), self.n_trees)).copy()
+        while True:
+            feature = self.feature[node]
+            internal = feature >= 0
+            if not internal.any():
+                return node
+            x = X[rows, np.where(internal, feature, 0)]
+            threshold = self.threshold[node]
+            if self.kind == SKLEARN:
+                go_left = x <= threshold
+            else:
+                missing = np.isnan(x)
+                go_left = np.where(missing, self.default_left[node], x < threshold)
+            step = np.where(go_left, self.left[node], self.right[node])
+            node = np.where(internal, step, node)
+
+    def tree_values(self, X=None, local_leaves=None):
+        """
+        Every tree's output for every row, shape (n_rows, n_trees). Pass
+        `local_leaves` (per-tree node ids, e.g. from sklearn's `apply`) to
+        skip the walk.
+        """
+        if local_leaves is not None:
+            # Row-major like the walk, so per-row reductions sum in the same order
+            return self.value[np.ascontiguousarray(self.roots + np.asarray(local_leaves, dtype=np.int64))]
+        return self.value[self.leaves(X)]
+
+    def predict(self, X):
+        """Predictions in the source model's output dtype (float64 RF, float32 XGBoost)."""
+        values = self.tree_values(X)
+        if self.kind == SKLEARN:
+            return values.sum(axis=1) / self.n_trees
+        return (values.sum(axis=1, dtype=np.float32) + np.float32(self.base_score)).astype(np.float32)
+
+    def save(self, path):
+        """Write the node arrays to a single uncompressed .npz file."""
+        meta = {"kind": self.kind, "base_score": self.base_score, "n_features": self.n_features}
+        np.savez(path, meta=np.array(json.dumps(meta)),
+                 **{name: getattr(self, name) for name in _ARRAYS})
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            arrays = {name: data[name] for name in _ARRAYS}
+        return cls(meta["kind"], base_score=meta["base_score"],
+                   n_features=meta["n_features"], **arrays)
+
+    def save_dir(self, directory):
+        """Write one .npy per node array plus meta.json, so they can be memory-mapped."""
+        os.makedirs(directory, exist_ok=True)
+        for name in _ARRAYS:
+            np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(directory, "meta.json"), "w") as f:
+            json.dump({"kind": self.kind, "base_score": self.base_score,
+                       "n_features": self.n_features}, f)
+
+    @classmethod
+    def load_dir(cls, directory, mmap_mode="r"):
+        """Load arrays written by `save_dir`, memory-mapped by default."""
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+                  for name in _ARRAYS}
+        return cls(meta["kind"], base_score=meta["base_score"],
+                   n_features=meta["n_features"], **arrays)
+
+
+def compile_random_forest(model):
+    """Flatten a fitted RandomForestRegressor (or any single-output sklearn tree ensemble)."""
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        if tree.n_outputs != 1:
+            raise ValueError("Only single-output regression trees are supported")
+        leaf = tree.children_left < 0
+        roots.append(offset)
+        features.append(np.where(leaf, -1, tree.feature))
+        thresholds.append(tree.threshold)
+        lefts.append(np.where(leaf, -1, tree.children_left + offset))
+        rights.append(np.where(leaf, -1, tree.children_right + offset))
+        values.append(tree.value[:, 0, 0])
+        offset += tree.node_count
+    n_nodes = offset
+    return CompiledEnsemble(
+        SKLEARN,
+        np.concatenate(features),
+        np.concatenate(thresholds).astype(np.float64),
+        np.concatenate(lefts),
+        np.concatenate(rights),
+        np.concatenate(values).astype(np.float64),
+        np.zeros(n_nodes, dtype=bool),
+        roots,
+        n_features=getattr(model, "n_features_in_", None)
+    )
+
+
+def compile_xgboost(model):
+    """Flatten a fitted XGBRegressor / Booster with the squared-error objective."""
+    booster = model.get_booster() if hasattr(model, "get_booster") else model
+    config = json.loads(booster.save_raw("json"))
+    learner = config["learner"]
+    objective = learner["objective"]["name"]
+    if objective != "reg:squarederror":
+        raise ValueError(f"Unsupported XGBoost objective: {objective}")
+    trees = learner["gradient_booster"]["model"]["trees"]
+    best_iteration = getattr(model, "best_iteration", None) if hasattr(model, "get_booster") else None
+    if best_iteration is not None:
+        parallel = int(learner["gradient_booster"]["model"]["gbtree_model_param"]["num_parallel_tree"])
+        trees = trees[:(best_iteration + 1) * parallel]
+
+    features, thresholds, lefts, rights, values, defaults, roots = [], [], [], [], [], [], []
+    offset = 0
+    for tree in trees:
+        if any(tree.get("split_type") or []):
+            raise ValueError("Categorical splits are not supported")
+        left = np.asarray(tree["left_children"], dtype=np.int64)
+        right = np.asarray(tree["right_children"], dtype=np.int64)
+        conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+        leaf = left < 0
+        roots.append(offset)
+        features.append(np.where(leaf, -1, tree["split_indices"]))
+        thresholds.append(conditions)
+        lefts.append(np.where(leaf, -1, left + offset))
+        rights.append(np.where(leaf, -1, right + offset))
+        # Leaf outputs are stored in split_conditions
+        values.append(np.where(leaf, conditions, 0).astype(np.float32))
+        defaults.append(np.asarray(tree["default_left"], dtype=bool))
+        offset += len(left)
+
+    base_score = float(str(learner["learner_model_param"]["base_score"]).strip("[]"))
+    return CompiledEnsemble(
+        XGBOOST,
+        np.concatenate(features),
+        np.concatenate(thresholds),
+        np.concatenate(lefts),
+        np.concatenate(rights),
+        np.concatenate(values),
+        np.concatenate(defaults),
+        roots,
+        base_score=base_score,
+        n_features=int(learner["learner_model_param"]["num_feature"])
+    )
+
+
+def compile_model(model):
+    """Compile a supported regressor, dispatching on its library."""
+    if hasattr(model, "get_booster"):
+        return compile_xgboost(model)
+    if hasattr(model, "estimators_"):
+        return compile_random_forest(model)
+    raise TypeError(f"Cannot compile {type(model).__name__}")
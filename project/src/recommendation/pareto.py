@@ -0,0 +1,104 @@
+"""
+Pareto fronts (non-dominated sorting) for two or three minimized objectives.
+
+A row dominates another when it is no worse in every objective and better
+in at least one; front 1 is the non-dominated set, front 2 the set that is
+non-dominated once front 1 is removed, and so on. Identical rows never
+dominate each other and always share a front.
+
+Rows are deduplicated and sorted lexicographically once (np.unique), so a
+row can only be dominated by rows before it. Then, per segment:
+- 2 objectives: one sweep assigns every front. Each front keeps the lowest
+  second objective seen so far; these are non-decreasing across fronts, so
+  a row's front is found by binary search (O(n log n)).
+- 3 objectives: Kung's sweep finds the non-dominated rows, keeping a
+  staircase of (second, third) objectives with bisect (O(n log n)).
+  Successive fronts repeat the sweep on the remaining rows.
+
+There is no pairwise comparison, so the cost grows as n log n per front
+rather than n^2.
+"""
+from bisect import bisect_right
+
+import numpy as np
+
+
+def pareto_fronts(objectives, max_fronts=None, segments=None):
+    """
+    Front number (1 = non-dominated) of every row of `objectives`, an
+    (n, 2) or (n, 3) array where lower is better in every column. Rows with
+    a NaN objective, or beyond the first `max_fronts` fronts, get NaN.
+    With `segments` (one id per row) fronts are computed within each
+    segment, e.g. per product.
+    """
+    objectives = np.asarray(objectives, dtype=np.float64)
+    if objectives.ndim != 2 or objectives.shape[1] not in (2, 3):
+        raise ValueError("Pareto ranking needs 2 or 3 objectives")
+    if max_fronts is not None and max_fronts < 1:
+        raise ValueError("max_fronts must be a positive integer")
+
+    fronts = np.full(len(objectives), np.nan)
+    valid = np.flatnonzero(~np.isnan(objectives).any(axis=1))
+    if len(valid) == 0:
+        return fronts
+    ids = np.zeros(len(valid)) if segments is None else np.asarray(segments, dtype=np.float64)[valid]
+    # Sorted by (segment, objectives); duplicates collapse to one row
+    unique, inverse = np.unique(np.column_stack([ids, objectives[valid]]), axis=0, return_inverse=True)
+    bounds = np.append(np.flatnonzero(np.concatenate(([True], unique[1:, 0] != unique[:-1, 0]))), len(unique))
+
+    sweep = _fronts_2d if objectives.shape[1] == 2 else _fronts_3d
+    unique_fronts = np.empty(len(unique))
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        unique_fronts[start:end] = sweep(unique[start:end, 1:], max_fronts)
+    fronts[valid] = unique_fronts[inverse.ravel()]
+    return fronts
+
+
+def _fronts_2d(points, max_fronts):
+    # tails[i] = lowest second objective in front i + 1 so far (non-decreasing)
+    tails = []
+    fronts = []
+    for y in points[:, 1].tolist():
+        # First front none of whose members dominates this row
+        i = bisect_right(tails, y)
+        if i == len(tails):
+            tails.append(y)
+        else:
+            tails[i] = y
+        fronts.append(i + 1)
+    fronts = np.array(fronts, dtype=np.float64)
+    if max_fronts is not None:
+        fronts[fronts > max_fronts] = np.nan
+    return fronts
+
+
+def _fronts_3d(points, max_fronts):
+    fronts = np.full(len(points), np.nan)
+    remaining = np.arange(len(points))
+    front = 1
+    while len(remaining) and (max_fronts is None or front <= max_fronts):
+        first = _non_dominated_3d(points[remaining])
+        fronts[remaining[first]] = front
+        remaining = remaining[~first]
+        front += 1
+    return fronts
+
+
+def _non_dominated_3d(points):
+    """Mask of the non-dominated rows of lexicographically sorted unique points."""
+    # Staircase of kept rows: second objective ascending, third strictly descending
+    ys, zs = [], []
+    mask = np.zeros(len(points), dtype=bool)
+    for row, (y, z) in enumerate(zip(points[:, 1].tolist(), points[:, 2].tolist())):
+        i = bisect_right(ys, y)
+        # Lowest third objective among earlier rows with second <= y
+        if i and zs[i - 1] <= z:
+            continue
+        mask[row] = True
+        # Steps this row now covers add nothing to later queries
+        j = i
+        while j < len(ys) and zs[j] >= z:
+            j += 1
+        ys[i:j] = [y]
+        zs[i:j] = [z]
+    return mask
@@ -1,39 +1,146 @@
-
+import numpy as np
 import pandas as pd
-import yaml
 
-def rank_materials(df, config_path):
-    with open(config_path) as f:
-        cfg = yaml.safe_load(f)
+from src.recommendation.pareto import pareto_fronts
+from src.recommendation.ranking_config import RECYCLABILITY_RANKS, resolve_ranking_config
+from src.recommendation.scoring_formula import load_scoring_formulas
+from src.recommendation.segment_rank import (
+    NORMALIZATIONS, PRODUCT, dense_rank_desc, min_max, sort_segments
+)
+
+# Ranked metrics and whether lower is better (scaled as 1 - norm)
+METRICS = (("predicted_cost", True), ("predicted_co2", True), ("Material_Suitability_Score", False))
+
+# Columns added to every ranked row
+SCORE_COLUMNS = ["cost_norm", "co2_norm", "suit_norm", "ranking_score", "rank"]
+
+# Compiled once at import, like the backend's; pass `formulas` to rank with another file
+FORMULAS = load_scoring_formulas()
 
-    w = cfg["weights"]
-    c = cfg["constraints"]
-    top_n = cfg["top_n"]
 
-    def min_max(series, reverse=False):
-        norm = (series - series.min()) / (series.max() - series.min())
-        return 1 - norm if reverse else norm
+def required_columns(cfg):
+    """Input columns rank_materials reads for this config."""
+    columns = ["product_id"] + [name for name, _ in METRICS]
+    if cfg.min_recyclability_rank is not None:
+        columns.append("Recyclability_Category")
+    if cfg.min_recyclability_percent is not None:
+        columns.append("Recyclability (%)")
+    return columns
 
-    df = df.copy()
-    df["cost_norm"] = min_max(df["predicted_cost"], reverse=True)
-    df["co2_norm"] = min_max(df["predicted_co2"], reverse=True)
-    df["suit_norm"] = min_max(df["Material_Suitability_Score"])
 
-    df["ranking_score"] = (
-        w["cost"] * df["cost_norm"] +
-        w["co2"] * df["co2_norm"] +
-        w["suitability"] * df["suit_norm"]
+def ranking_scores(cost_norm, co2_norm, suit_norm, cfg, formulas=None):
+    """
+    The `ranking_score` formula (config/scoring_formulas.yaml, by default
+    the weighted sum) of the normalized metrics under the config's weights.
+    `formulas` (a ScoringFormulas) defaults to the module's FORMULAS.
+    """
+    return (formulas or FORMULAS)["ranking_score"](
+        {"cost_norm": cost_norm, "co2_norm": co2_norm, "suit_norm": suit_norm}, cfg.weights
     )
 
-    recy_map = {"A":4,"B":3,"C":2,"D":1}
-    min_recy = recy_map[c["min_recyclability"]]
 
-    df = df[
-        (df["predicted_cost"] <= c["max_cost"]) &
-        (df["Material_Suitability_Score"] >= c["min_suitability"]) &
-        (df["Recyclability_Category"].map(recy_map) >= min_recy)
-    ]
+def feasible_rows(df, cfg):
+    """
+    Boolean mask (in frame order) of rows that have a product and meet the
+    config's constraints.
+    """
+    # Rows without a product are not ranked (like groupby's dropna)
+    keep = ~pd.isna(df["product_id"].to_numpy()) if df["product_id"].hasnans else np.ones(len(df), dtype=bool)
+    if cfg.max_cost is not None:
+        keep &= df["predicted_cost"].to_numpy() <= cfg.max_cost
+    if cfg.max_co2 is not None:
+        keep &= df["predicted_co2"].to_numpy() <= cfg.max_co2
+    if cfg.min_suitability is not None:
+        keep &= df["Material_Suitability_Score"].to_numpy() >= cfg.min_suitability
+    if cfg.min_recyclability_rank is not None:
+        # Grade lookup per distinct value; code -1 (missing) hits the trailing NaN
+        codes, categories = pd.factorize(df["Recyclability_Category"])
+        lookup = np.array([RECYCLABILITY_RANKS.get(g, np.nan) for g in categories] + [np.nan])
+        keep &= lookup[codes] >= cfg.min_recyclability_rank
+    if cfg.min_recyclability_percent is not None:
+        keep &= df["Recyclability (%)"].to_numpy() >= cfg.min_recyclability_percent
+    return keep
+
+
+def rank_materials(df, config, normalize=None, formulas=None):
+    """
+    Score and rank materials per product. `config` is a preloaded
+    RankingConfig (see ranking_config) or a path to a ranking YAML file,
+    which is parsed once and cached until the file changes.
+
+    Cost, CO2 and suitability are min-max scaled per product, or over the
+    whole frame with normalize="global" (default: the config's
+    `normalization`) and combined by the `ranking_score` formula of
+    `formulas` (default: FORMULAS, compiled at import). Rows are grouped by
+    product_id once and every step runs on contiguous arrays (see
+    segment_rank).
+    """
+    cfg = resolve_ranking_config(config)
+    normalize = normalize or cfg.normalization
+    if normalize not in NORMALIZATIONS:
+        raise ValueError(f"normalize must be one of {', '.join(NORMALIZATIONS)}")
+
+    order, starts, ids = sort_segments(df["product_id"].to_numpy())
+
+    def column(name):
+        values = df[name].to_numpy()
+        return values if order is None else values[order]
+
+    segments = starts if normalize == PRODUCT else None
+    cost = column("predicted_cost")
+    co2 = column("predicted_co2")
+    suitability = column("Material_Suitability_Score")
+    cost_norm = min_max(cost, segments, reverse=True)
+    co2_norm = min_max(co2, segments, reverse=True)
+    suit_norm = min_max(suitability, segments)
+    score = ranking_scores(cost_norm, co2_norm, suit_norm, cfg, formulas)
+
+    keep = feasible_rows(df, cfg)
+    if order is not None:
+        keep = keep[order]
+
+    rank = dense_rank_desc(np.where(keep, score, np.nan), ids, starts)
+    selected = keep & (rank <= cfg.top_n) if cfg.top_n is not None else keep & ~np.isnan(rank)
+
+    # Grouped by product already; order by rank within each product (stable)
+    rows = np.flatnonzero(selected)
+    rows = rows[np.lexsort((rank[rows], ids[rows]))]
+    result = df.iloc[rows if order is None else order[rows]].copy()
+    result["cost_norm"] = cost_norm[rows]
+    result["co2_norm"] = co2_norm[rows]
+    result["suit_norm"] = suit_norm[rows]
+    result["ranking_score"] = score[rows]
+    result["rank"] = rank[rows]
+    return result
+
+
+def pareto_rank_materials(df, config, fronts=1, objectives=None):
+    """
+    Non-dominated materials per product instead of a weighted sum. Every
+    material on the first `fronts` Pareto fronts over `objectives` (default:
+    predicted cost and CO2, lower is better, and suitability, higher is
+    better) is returned with its `front` number (1 = non-dominated), ordered
+    by product, front, then input order. Constraints apply as in
+    rank_materials; weights, normalization and top_n do not.
+    """
+    cfg = resolve_ranking_config(config)
+    lower_is_better = dict(METRICS)
+    objectives = list(objectives or lower_is_better)
+    unknown = [name for name in objectives if name not in lower_is_better]
+    if unknown:
+        raise ValueError(f"Unknown Pareto objectives: {', '.join(unknown)} "
+                         f"(expected {', '.join(lower_is_better)})")
 
-    df["rank"] = df.groupby("product_id")["ranking_score"]                    .rank(ascending=False, method="dense")
+    # Minimized objectives; infeasible rows are NaN and get no front
+    values = np.column_stack([
+        df[name].to_numpy(dtype=np.float64) * (1 if lower_is_better[name] else -1) for name in objectives
+    ])
+    values[~feasible_rows(df, cfg)] = np.nan
+    codes, _ = pd.factorize(df["product_id"], sort=True)
+    front = pareto_fronts(values, fronts, segments=codes)
 
-    return df[df["rank"] <= top_n].sort_values(["product_id","rank"])
+    rows = np.flatnonzero(~np.isnan(front))
+    rows = rows[np.lexsort((front[rows], codes[rows]))]
+    result = df.iloc[rows].copy()
+    result["front"] = front[rows]
+    return result
@@ -0,0 +1,170 @@
+"""
+Parsed, validated ranking configuration for rank_materials.
+
+`load_ranking_config(path)` parses the YAML once and caches the result per
+path; the file is only parsed again when its mtime changes. The returned
+`RankingConfig` is immutable, with the weights as a read-only vector in
+WEIGHT_KEYS order and the constraints as ready-to-compare thresholds, so
+callers that rank in a loop pay for neither file I/O nor YAML parsing.
+
+Both config schemas in config/ are accepted:
+- ranker schema (material_ranking.yaml): weights cost / co2 / suitability,
+  min_recyclability as a grade A (best) .. D
+- API schema (ranking_weights.yaml): weights cost / co2_impact /
+  sustainability, min_recyclability as a percentage
+
+`normalization` selects global (the default when the key is absent, as
+before it existed) or per-product min-max scaling of the ranked metrics;
+see segment_rank.
+"""
+import os
+import threading
+from types import MappingProxyType
+
+import numpy as np
+import yaml
+
+from src.recommendation.segment_rank import GLOBAL, NORMALIZATIONS
+
+# Order of RankingConfig.weight_vector
+WEIGHT_KEYS = ("cost", "co2", "suitability")
+
+# API-schema weight names -> ranker names
+WEIGHT_ALIASES = {"co2_impact": "co2", "sustainability": "suitability"}
+
+# Recyclability grades, best first
+RECYCLABILITY_RANKS = {"A": 4, "B": 3, "C": 2, "D": 1}
+
+_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+
+
+class RankingConfig:
+    """Immutable ranking configuration; build with `from_dict` or `load_ranking_config`."""
+
+    __slots__ = ("weights", "weight_vector", "max_cost", "max_co2", "min_suitability",
+                 "min_recyclability_rank", "min_recyclability_percent", "top_n",
+                 "normalization", "path", "mtime")
+
+    def __init__(self, weights, max_cost=None, max_co2=None, min_suitability=None,
+                 min_recyclability_rank=None, min_recyclability_percent=None, top_n=None,
+                 normalization=GLOBAL, path=None, mtime=None):
+        vector = np.array([weights[k] for k in WEIGHT_KEYS], dtype=np.float64)
+        vector.flags.writeable = False
+        values = {
+            "weights": MappingProxyType(dict(zip(WEIGHT_KEYS, vector.tolist()))),
+            "weight_vector": vector,
+            "max_cost": max_cost,
+            "max_co2": max_co2,
+            "min_suitability": min_suitability,
+            "min_recyclability_rank": min_recyclability_rank,
+            "min_recyclability_percent": min_recyclability_percent,
+            "top_n": top_n,
+            "normalization": normalization,
+            "path": path,
+            "mtime": mtime
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("RankingConfig is immutable")
+
+    def __repr__(self):
+        return f"RankingConfig(weights={dict(self.weights)}, top_n={self.top_n}, path={self.path!r})"
+
+    @classmethod
+    def from_dict(cls, cfg, path=None, mtime=None):
+        """Validate a parsed config dict. Raises ValueError on bad or missing values."""
+        if not isinstance(cfg, dict):
+            raise ValueError("Ranking config must be a mapping")
+
+        raw_weights = cfg.get("weights")
+        if not isinstance(raw_weights, dict):
+            raise ValueError("Ranking config needs a 'weights' mapping")
+        weights = {}
+        for key, value in raw_weights.items():
+            name = WEIGHT_ALIASES.get(key, key)
+            if name not in WEIGHT_KEYS:
+                raise ValueError(f"Unknown ranking weight {key!r} (expected {', '.join(WEIGHT_KEYS)})")
+            if name in weights:
+                raise ValueError(f"Ranking weight {name!r} is given twice")
+            weights[name] = _number(value, f"weights.{key}", minimum=0)
+        missing = [k for k in WEIGHT_KEYS if k not in weights]
+        if missing:
+            raise ValueError(f"Missing ranking weights: {', '.join(missing)}")
+        if not any(weights.values()):
+            raise ValueError("At least one ranking weight must be positive")
+
+        constraints = cfg.get("constraints") or {}
+        if not isinstance(constraints, dict):
+            raise ValueError("'constraints' must be a mapping")
+        rank = percent = None
+        recyclability = constraints.get("min_recyclability")
+        if isinstance(recyclability, str):
+            if recyclability.upper() not in RECYCLABILITY_RANKS:
+                raise ValueError(f"Unknown recyclability grade {recyclability!r} (expected A-D)")
+            rank = RECYCLABILITY_RANKS[recyclability.upper()]
+        elif recyclability is not None:
+            percent = _number(recyclability, "constraints.min_recyclability", minimum=0)
+
+        top_n = cfg.get("top_n")
+        if top_n is not None and (isinstance(top_n, bool) or not isinstance(top_n, int) or top_n < 1):
+            raise ValueError("top_n must be a positive integer")
+        normalization = cfg.get("normalization", GLOBAL)
+        if normalization not in NORMALIZATIONS:
+            raise ValueError(f"normalization must be one of {', '.join(NORMALIZATIONS)}")
+
+        return cls(
+            weights,
+            max_cost=_optional_number(constraints, "max_cost"),
+            max_co2=_optional_number(constraints, "max_co2"),
+            min_suitability=_optional_number(constraints, "min_suitability"),
+            min_recyclability_rank=rank,
+            min_recyclability_percent=percent,
+            top_n=top_n,
+            normalization=normalization,
+            path=path,
+            mtime=mtime
+        )
+
+
+def _number(value, name, minimum=None):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{name} must be a number")
+    if minimum is not None and value < minimum:
+        raise ValueError(f"{name} must be >= {minimum}")
+    return float(value)
+
+
+def _optional_number(constraints, key):
+    value = constraints.get(key)
+    return None if value is None else _number(value, f"constraints.{key}")
+
+
+def load_ranking_config(path):
+    """
+    RankingConfig for the YAML file at `path`, parsed at most once per file
+    modification (cached by path + mtime).
+    """
+    path = os.path.abspath(os.fspath(path))
+    mtime = os.stat(path).st_mtime_ns
+    with _CACHE_LOCK:
+        cached = _CACHE.get(path)
+    if cached is not None and cached.mtime == mtime:
+        return cached
+
+    with open(path) as f:
+        config = RankingConfig.from_dict(yaml.safe_load(f), path=path, mtime=mtime)
+    with _CACHE_LOCK:
+        _CACHE[path] = config
+    return config
+
+
+def resolve_ranking_config(config):
+    """Accept a RankingConfig, a parsed dict or a path to a YAML file."""
+    if isinstance(config, RankingConfig):
+        return config
+    if isinstance(config, dict):
+        return RankingConfig.from_dict(config)
+    return load_ranking_config(config)
@@ -0,0 +1,294 @@
+"""
+Declarative scoring formulas compiled to vectorized closures.
+
+Every score the service computes (heuristic sustainability, CO2
+performance and composite score, the ML ranking score and the
+rank_materials score) is declared once in config/scoring_formulas.yaml
+(override with ECOPACK_SCORING_FORMULAS) instead of in code. A formula is
+
+    score = round(clip(multiplier * (offset + sum(weight_i * term_i)), lo, hi))
+
+where each term reads an input array or another formula's result and can
+map it through a lookup table, divide it by a scale, invert it (1 - x) and
+clip it:
+
+    formulas:
+      co2_performance:
+        offset: 100
+        terms:
+          co2_emissions: {scale: max_co2, weight: -100}
+        defaults: {max_co2: 50}
+        clip: [0, 100]
+        round: 2
+
+A string `weight` or `scale` names a parameter, resolved per call from the
+inputs, then the ranking weights (either config schema), then the
+formula's `defaults`. `load_scoring_formulas(path)` parses and compiles the
+file once per modification into closures over NumPy arrays; the operations
+run in the order written, so a formula that restates existing arithmetic
+gives bit-identical results.
+"""
+import hashlib
+import numbers
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from src.recommendation.ranking_config import WEIGHT_ALIASES
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # project root
+DEFAULT_FORMULAS_PATH = os.path.join(BASE_DIR, "config", "scoring_formulas.yaml")
+
+_FORMULA_KEYS = {"description", "offset", "terms", "multiplier", "clip", "round", "defaults"}
+_TERM_KEYS = {"input", "lookup", "default", "scale", "invert", "clip", "weight"}
+
+_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def round_half_even(values, ndigits=2):
+    """
+    Element-wise equivalent of Python's built-in round(x, ndigits).
+
+    np.round scales, rounds and unscales, which disagrees with Python's
+    correctly-rounded round() only when the scaled value lands within
+    float error of a .5 tie. Those few elements are re-rounded with the
+    built-in so results match the scalar code exactly.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    scale = 10.0 ** ndigits
+    scaled = values * scale
+    # asarray: 0-d inputs yield NumPy scalars, which reshape would copy
+    rounded = np.asarray(np.rint(scaled) / scale)
+
+    distance_to_tie = np.abs(scaled - np.floor(scaled) - 0.5)
+    near_tie = distance_to_tie <= 1e-7 * np.maximum(1.0, np.abs(scaled))
+    if near_tie.any():
+        flat_values = values.reshape(-1)
+        flat_rounded = rounded.reshape(-1)
+        for i in np.flatnonzero(near_tie.reshape(-1)):
+            flat_rounded[i] = round(float(flat_values[i]), ndigits)
+    return rounded
+
+
+class ScoringFormulas:
+    """Immutable set of compiled formulas; build with `from_dict` or `load_scoring_formulas`."""
+
+    __slots__ = ("formulas", "version", "path", "mtime")
+
+    def __init__(self, formulas, version, path=None, mtime=None):
+        object.__setattr__(self, "formulas", formulas)
+        object.__setattr__(self, "version", version)
+        object.__setattr__(self, "path", path)
+        object.__setattr__(self, "mtime", mtime)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ScoringFormulas is immutable")
+
+    def __contains__(self, name):
+        return name in self.formulas
+
+    def __getitem__(self, name):
+        """Compiled formula: `formula(inputs, weights=None)` -> float64 array."""
+        try:
+            return self.formulas[name]
+        except KeyError:
+            raise KeyError(f"Unknown scoring formula {name!r}") from None
+
+    def __repr__(self):
+        return f"ScoringFormulas({sorted(self.formulas)}, version={self.version!r})"
+
+    @classmethod
+    def from_dict(cls, spec, version=None, path=None, mtime=None):
+        """Validate and compile a parsed formulas file. Raises ValueError on bad specs."""
+        if not isinstance(spec, dict) or not isinstance(spec.get("formulas"), dict) or not spec["formulas"]:
+            raise ValueError("Scoring formulas need a non-empty 'formulas' mapping")
+        specs = spec["formulas"]
+        compiled = {}
+        for name in specs:
+            _compile(name, specs, compiled, ())
+        if version is None:
+            version = hashlib.sha256(yaml.safe_dump(spec, sort_keys=True).encode()).hexdigest()[:12]
+        return cls(compiled, version, path, mtime)
+
+
+def _compile(name, specs, compiled, stack):
+    """Compile formula `name` (and the formulas it reads) into `compiled`."""
+    if name in compiled:
+        return compiled[name]
+    if name in stack:
+        raise ValueError(f"Scoring formula cycle: {' -> '.join(stack + (name,))}")
+    spec = specs[name]
+    if not isinstance(spec, dict) or not isinstance(spec.get("terms"), dict) or not spec["terms"]:
+        raise ValueError(f"Formula {name!r} needs a non-empty 'terms' mapping")
+    unknown = set(spec) - _FORMULA_KEYS
+    if unknown:
+        raise ValueError(f"Formula {name!r} has unknown keys: {', '.join(sorted(unknown))}")
+
+    defaults = spec.get("defaults") or {}
+    for key, value in defaults.items():
+        _number(value, f"{name}.defaults.{key}")
+    offset = _number(spec.get("offset", 0), f"{name}.offset")
+    multiplier = spec.get("multiplier")
+    if multiplier is not None:
+        multiplier = _number(multiplier, f"{name}.multiplier")
+    low, high = _bounds(spec.get("clip"), f"{name}.clip")
+    ndigits = spec.get("round")
+    if ndigits is not None and (isinstance(ndigits, bool) or not isinstance(ndigits, int)):
+        raise ValueError(f"{name}.round must be an integer")
+
+    terms = [
+        _compile_term(f"{name}.{term}", term, term_spec, specs, compiled, stack + (name,), defaults)
+        for term, term_spec in spec["terms"].items()
+    ]
+
+    def formula(inputs, weights=None):
+        score = None
+        for term in terms:
+            value = term(inputs, weights)
+            score = value if score is None else score + value
+        if offset:
+            score = offset + score
+        if multiplier is not None:
+            score = score * multiplier
+        if low is not None or high is not None:
+            score = np.clip(score, low, high)
+        if ndigits is not None:
+            score = round_half_even(score, ndigits)
+        return np.asarray(score, dtype=np.float64)
+
+    formula.__name__ = name
+    formula.__doc__ = spec.get("description")
+    compiled[name] = formula
+    return formula
+
+
+def _compile_term(label, term, spec, specs, compiled, stack, defaults):
+    if not isinstance(spec, dict):
+        spec = {"weight": spec}
+    unknown = set(spec) - _TERM_KEYS
+    if unknown:
+        raise ValueError(f"Term {label!r} has unknown keys: {', '.join(sorted(unknown))}")
+    if "weight" not in spec:
+        raise ValueError(f"Term {label!r} needs a weight")
+
+    source = spec.get("input", term)
+    if source in specs:
+        # Another formula, unless the caller passes its value directly
+        dependency = _compile(source, specs, compiled, stack)
+
+        def read(inputs, weights):
+            return inputs[source] if source in inputs else dependency(inputs, weights)
+    else:
+        def read(inputs, weights):
+            try:
+                return inputs[source]
+            except KeyError:
+                raise ValueError(f"Scoring formula input {source!r} is missing") from None
+
+    lookup = _lookup(spec["lookup"], spec.get("default", np.nan), label) if "lookup" in spec else None
+    scale = _parameter(spec.get("scale"), f"{label}.scale", defaults)
+    invert = bool(spec.get("invert", False))
+    low, high = _bounds(spec.get("clip"), f"{label}.clip")
+    weight = _parameter(spec["weight"], f"{label}.weight", defaults)
+
+    def evaluate(inputs, weights):
+        value = read(inputs, weights)
+        if lookup is not None:
+            value = lookup(value)
+        else:
+            value = np.asarray(value, dtype=np.float64)
+        if scale is not None:
+            value = value / scale(inputs, weights)
+        if invert:
+            value = 1 - value
+        if low is not None:
+            value = np.maximum(low, value)
+        if high is not None:
+            value = np.minimum(high, value)
+        return weight(inputs, weights) * value
+
+    return evaluate
+
+
+def _lookup(table, default, label):
+    """Vectorized table lookup; values missing from the table map to `default`."""
+    if not isinstance(table, dict) or not table:
+        raise ValueError(f"{label}.lookup must be a non-empty mapping")
+    keys = pd.Index(list(table), dtype=object)
+    values = np.array([_number(v, f"{label}.lookup") for v in table.values()] +
+                      [np.nan if default is None else _number(default, f"{label}.default")])
+
+    def apply(value):
+        value = np.asarray(value)
+        codes = keys.get_indexer(value.ravel().astype(object))
+        return values[codes].reshape(value.shape)
+
+    return apply
+
+
+def _parameter(value, label, defaults):
+    """Number, or a closure resolving a named parameter per call."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        name = value
+
+        def resolve(inputs, weights):
+            if name in inputs:
+                return inputs[name]
+            if weights is not None:
+                canonical = WEIGHT_ALIASES.get(name, name)
+                for key, weight in weights.items():
+                    if WEIGHT_ALIASES.get(key, key) == canonical:
+                        return weight
+            if name in defaults:
+                return defaults[name]
+            raise ValueError(f"Scoring formula parameter {name!r} ({label}) is not set")
+
+        return resolve
+    number = _number(value, label)
+    return lambda inputs, weights: number
+
+
+def _number(value, label):
+    if isinstance(value, bool) or not isinstance(value, numbers.Real):
+        raise ValueError(f"{label} must be a number")
+    return float(value)
+
+
+def _bounds(clip, label):
+    if clip is None:
+        return None, None
+    if not isinstance(clip, (list, tuple)) or len(clip) != 2:
+        raise ValueError(f"{label} must be [low, high] (null for open)")
+    low, high = (None if v is None else _number(v, label) for v in clip)
+    if low is not None and high is not None and low > high:
+        raise ValueError(f"{label} low must be <= high")
+    return low, high
+
+
+def load_scoring_formulas(path=None):
+    """
+    Compiled formulas for the YAML file at `path` (default:
+    ECOPACK_SCORING_FORMULAS or config/scoring_formulas.yaml), parsed at
+    most once per file modification (cached by path + mtime).
+    """
+    path = os.path.abspath(os.fspath(path or os.getenv("ECOPACK_SCORING_FORMULAS") or DEFAULT_FORMULAS_PATH))
+    mtime = os.stat(path).st_mtime_ns
+    with _CACHE_LOCK:
+        cached = _CACHE.get(path)
+    if cached is not None and cached.mtime == mtime:
+        return cached
+
+    with open(path, "rb") as f:
+        raw = f.read()
+    formulas = ScoringFormulas.from_dict(
+        yaml.safe_load(raw), version=hashlib.sha256(raw).hexdigest()[:12], path=path, mtime=mtime
+    )
+    with _CACHE_LOCK:
+        _CACHE[path] = formulas
+    return formulas
@@ -0,0 +1,183 @@
+"""
+Per-product normalization and dense ranking over contiguous NumPy arrays.
+
+Rows are ordered by product id once (skipped when already sorted), which
+turns every product into a contiguous segment. Per-product minima and
+maxima then come from one `np.fmin.reduceat` / `np.fmax.reduceat` each,
+and dense ranks from sorting each segment's scores (as the rows of one
+padded 2-D array, or one lexsort over (segment, score)) plus a running
+count of distinct scores per segment. There is no Python loop and no
+pandas groupby, so the cost grows with the row count rather than with the
+number of products.
+
+Semantics follow the pandas ranker: min-max normalization skips NaN, rows
+with a NaN score get no rank, and equal scores share a dense rank. A
+segment whose values are all equal (a product with one candidate, or a
+metric tied across its materials) has no range to scale by; it gets the
+neutral 1.0 in either direction instead of NaN, so the metric does not
+separate its rows but does not drop them either.
+"""
+import numpy as np
+import pandas as pd
+
+PRODUCT = "product"
+GLOBAL = "global"
+NORMALIZATIONS = (PRODUCT, GLOBAL)
+
+
+def sort_segments(keys):
+    """
+    Group equal keys into contiguous segments, in ascending key order.
+
+    Returns (order, starts, ids): the stable row order (None when `keys` is
+    already sorted), the first position of every segment in that order and
+    the segment number of every ordered row. Missing keys form the last
+    segment.
+    """
+    keys = np.asarray(keys)
+    n_rows = len(keys)
+    if n_rows == 0:
+        return None, np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+    if keys.dtype.kind in "iu" or (keys.dtype.kind == "f" and not np.isnan(keys).any()):
+        if np.all(keys[1:] >= keys[:-1]):
+            starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+            return None, starts, segment_ids(starts, n_rows)
+
+    # Hash the keys to dense codes in key order, then sort the codes in O(n)
+    codes, uniques = pd.factorize(keys, sort=True)
+    codes[codes < 0] = len(uniques)
+    order = _radix_argsort(codes)
+    ids = codes[order]
+    starts = np.flatnonzero(np.concatenate(([True], ids[1:] != ids[:-1])))
+    return order, starts, ids
+
+
+def _radix_argsort(codes):
+    """Stable argsort of non-negative int codes via 16-bit radix passes."""
+    order = np.argsort((codes & 0xFFFF).astype(np.uint16), kind="stable")
+    shift = 16
+    while shift < 64 and (codes.max() >> shift) > 0:
+        digit = ((codes[order] >> shift) & 0xFFFF).astype(np.uint16)
+        order = order[np.argsort(digit, kind="stable")]
+        shift += 16
+    return order
+
+
+def segment_ids(starts, n_rows):
+    """Segment number of every row."""
+    ids = np.zeros(n_rows, dtype=np.intp)
+    ids[starts[1:]] = 1
+    return np.cumsum(ids)
+
+
+def uniform_width(starts, n_rows):
+    """Common segment length when every segment has the same size, else None."""
+    if len(starts) == 0 or n_rows % len(starts):
+        return None
+    width = n_rows // len(starts)
+    return width if np.all(starts == np.arange(len(starts)) * width) else None
+
+
+def segment_bounds(values, starts):
+    """Per-segment (min, max) of grouped rows, skipping NaN; `values` may be 2-D (rows, columns)."""
+    return np.fmin.reduceat(values, starts, axis=0), np.fmax.reduceat(values, starts, axis=0)
+
+
+def scale(values, low, high, reverse=False):
+    """
+    Min-max scale with precomputed bounds; 1.0 where high == low (NaN
+    values stay NaN). `reverse` (1 - norm) may be a boolean per column of
+    2-D `values`.
+    """
+    span = high - low
+    with np.errstate(invalid="ignore", divide="ignore"):
+        norm = (values - low) / span
+    if np.ndim(reverse):
+        norm = np.where(reverse, 1 - norm, norm)
+    elif reverse:
+        norm = 1 - norm
+    return np.where((span == 0) & ~np.isnan(values), 1.0, norm)
+
+
+def min_max(values, starts=None, reverse=False):
+    """
+    Min-max scale `values` to 0..1, per segment when `starts` is given
+    (rows grouped by segment), else over all rows.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if starts is None:
+        if len(values) == 0 or np.isnan(values).all():
+            low = high = np.nan
+        else:
+            low, high = np.nanmin(values), np.nanmax(values)
+    elif uniform_width(starts, len(values)):
+        # Equal-sized segments: reduce the rows of a (segments, width) view
+        grid = values.reshape(len(starts), -1)
+        low = np.fmin.reduce(grid, axis=1)[:, None]
+        high = np.fmax.reduce(grid, axis=1)[:, None]
+        return scale(grid, low, high, reverse).ravel()
+    else:
+        lengths = np.diff(np.append(starts, len(values)))
+        low, high = segment_bounds(values, starts)
+        low, high = np.repeat(low, lengths), np.repeat(high, lengths)
+    return scale(values, low, high, reverse)
+
+
+def dense_rank_desc(scores, ids, starts=None):
+    """
+    Dense rank (1 = highest score) within each segment, as float64 like
+    pandas; NaN scores get NaN. `ids` is the segment number of every row.
+    With the segment `starts` of grouped rows, segments are sorted as the
+    rows of a padded 2-D array when that stays small (the usual case of
+    every product having about the same number of materials), which avoids
+    a global sort.
+    """
+    n_rows = len(scores)
+    ranks = np.full(n_rows, np.nan)
+    if n_rows == 0:
+        return ranks
+    if starts is not None:
+        lengths = np.diff(np.append(starts, n_rows))
+        width = int(lengths.max())
+        if len(starts) * width <= _PAD_FACTOR * n_rows:
+            return _dense_rank_padded(scores, ids, starts, width, ranks)
+
+    valid = np.flatnonzero(~np.isnan(scores))
+    if len(valid) == 0:
+        return ranks
+    order = valid[np.lexsort((-scores[valid], ids[valid]))]
+    s, g = scores[order], ids[order]
+    new_segment = np.concatenate(([True], g[1:] != g[:-1]))
+    new_value = new_segment | np.concatenate(([True], s[1:] != s[:-1]))
+    distinct = np.cumsum(new_value)
+    # Running distinct count restarted at every segment
+    base = np.maximum.accumulate(np.where(new_segment, distinct - 1, 0))
+    ranks[order] = distinct - base
+    return ranks
+
+
+# Padded 2-D sort only when it needs at most this many cells per row
+_PAD_FACTOR = 2
+
+
+def _dense_rank_padded(scores, ids, starts, width, ranks):
+    # Negated so an ascending sort puts the best score first; NaN and padding sort last
+    negated = np.where(np.isnan(scores), np.inf, -scores)
+    uniform = uniform_width(starts, len(scores)) is not None
+    if uniform:
+        grid = negated.reshape(len(starts), width)
+    else:
+        position = np.arange(len(scores)) - starts[ids]
+        grid = np.full((len(starts), width), np.inf)
+        grid[ids, position] = negated
+    # Equal scores get the same dense rank in any order, so no stable sort is needed
+    order = np.argsort(grid, axis=1)
+    ordered = np.take_along_axis(grid, order, axis=1)
+    new_value = np.ones(ordered.shape, dtype=bool)
+    new_value[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    dense = np.cumsum(new_value, axis=1).astype(np.float64)
+    dense[np.isinf(ordered)] = np.nan
+    rank_grid = np.empty_like(dense)
+    np.put_along_axis(rank_grid, order, dense, axis=1)
+    ranks[:] = rank_grid.ravel() if uniform else rank_grid[ids, position]
+    return ranks
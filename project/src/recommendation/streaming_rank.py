@@ -0,0 +1,220 @@
+"""
+Out-of-core rank_materials over a Parquet file of scored rows.
+
+`rank_parquet(path, config)` never holds the whole file: it reads record
+batches with column projection (only the columns the ranker needs for the
+config, plus any requested `columns`) in two passes.
+
+1. Min-max bounds: per-product minima and maxima of cost, CO2 and
+   suitability are reduced per batch and merged into one small table keyed
+   by product (or a single global row with normalize="global").
+2. Running top-N: every batch is scaled with those bounds and scored with
+   the same float operations as rank_materials. Only rows within the top N
+   of their product inside the batch can be in the final top N, so just
+   those are kept as candidates; candidates are re-ranked per product and
+   trimmed to the top N whenever they outgrow the batch size.
+
+Memory is bounded by the batch size plus the per-product state (bounds and
+at most top_n candidates per product, more only for tied scores), not by
+the file size. Arrow decodes one row group at a time, so files written with
+very large row groups raise the floor. The result equals rank_materials on the same columns read in
+full, including row order and the index (the row's position in the file).
+"""
+import numpy as np
+import pandas as pd
+
+from src.recommendation.ranker import (
+    METRICS, SCORE_COLUMNS, feasible_rows, ranking_scores, required_columns
+)
+from src.recommendation.ranking_config import resolve_ranking_config
+from src.recommendation.segment_rank import (
+    NORMALIZATIONS, PRODUCT, dense_rank_desc, scale, segment_bounds, sort_segments
+)
+
+METRIC_COLUMNS = [name for name, _ in METRICS]
+REVERSED = np.array([reverse for _, reverse in METRICS])
+
+
+def rank_parquet(path, config, normalize=None, batch_size=65536, columns=None, formulas=None):
+    """
+    rank_materials over the Parquet file at `path`, streamed in record
+    batches of `batch_size` rows. `columns` adds input columns to carry into
+    the result (e.g. "Material ID"); by default only the ranked ones are read.
+    `formulas` is passed on as in rank_materials.
+    """
+    import pyarrow.parquet as pq
+
+    cfg = resolve_ranking_config(config)
+    normalize = normalize or cfg.normalization
+    if normalize not in NORMALIZATIONS:
+        raise ValueError(f"normalize must be one of {', '.join(NORMALIZATIONS)}")
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+
+    parquet = pq.ParquetFile(path)
+    wanted = set(required_columns(cfg)) | set(columns or ())
+    missing = wanted - set(parquet.schema_arrow.names)
+    if missing:
+        raise ValueError(f"{path} is missing columns: {', '.join(sorted(missing))}")
+    # File order, so the result's columns match rank_materials on the file
+    projection = [name for name in parquet.schema_arrow.names if name in wanted]
+
+    bounds = _Bounds(batch_size)
+    for batch in parquet.iter_batches(batch_size=batch_size, columns=["product_id"] + METRIC_COLUMNS):
+        bounds.add(batch.to_pandas())
+    lookup = bounds.lookup(normalize)
+
+    top = _RunningTopN(cfg.top_n, batch_size)
+    offset = 0
+    for batch in parquet.iter_batches(batch_size=batch_size, columns=projection):
+        frame = batch.to_pandas()
+        frame.index = pd.RangeIndex(offset, offset + len(frame))
+        offset += len(frame)
+        top.add(_score_batch(frame, cfg, lookup, formulas))
+    return top.result()
+
+
+class _Bounds:
+    """Per-product (and global) minima / maxima of the ranked metrics."""
+
+    def __init__(self, batch_size):
+        self._batch_size = batch_size
+        self._pending = []
+        self._pending_rows = 0
+        self._state = None
+        self._low = np.full(len(METRICS), np.nan)
+        self._high = np.full(len(METRICS), np.nan)
+
+    def add(self, frame):
+        values = frame[METRIC_COLUMNS].to_numpy(dtype=np.float64)
+        if len(values) == 0:
+            return
+        # Global bounds include rows without a product, like rank_materials
+        self._low = np.fmin(self._low, np.fmin.reduce(values, axis=0))
+        self._high = np.fmax(self._high, np.fmax.reduce(values, axis=0))
+
+        self._pending.append(_reduce(frame["product_id"].to_numpy(), values, values))
+        self._pending_rows += len(self._pending[-1][0])
+        if self._pending_rows > max(self._batch_size, len(self._state[0]) if self._state else 0):
+            self._compact()
+
+    def _compact(self):
+        parts = ([self._state] if self._state else []) + self._pending
+        if parts:
+            keys, lows, highs = (np.concatenate(p) for p in zip(*parts))
+            self._state = _reduce(keys, lows, highs)
+        self._pending, self._pending_rows = [], 0
+
+    def lookup(self, normalize):
+        """
+        Function mapping product keys to per-row (low, high) arrays, or the
+        global bounds.
+        """
+        if normalize != PRODUCT:
+            return lambda keys: (self._low, self._high)
+        self._compact()
+        keys, lows, highs = self._state or (np.zeros(0), np.zeros((0, len(METRICS))), np.zeros((0, len(METRICS))))
+        index = pd.Index(keys)
+        # Position -1 (a product not seen in pass 1 or a missing key) hits the trailing NaN row
+        nan_row = np.full((1, len(METRICS)), np.nan)
+        lows, highs = np.vstack([lows, nan_row]), np.vstack([highs, nan_row])
+
+        def bounds_for(product_ids):
+            positions = index.get_indexer(product_ids)
+            return lows[positions], highs[positions]
+
+        return bounds_for
+
+
+def _reduce(keys, lows, highs):
+    """Merge (key, low, high) rows to one row per non-missing key."""
+    order, starts, _ = sort_segments(keys)
+    if order is not None:
+        keys, lows, highs = keys[order], lows[order], highs[order]
+    low, _ = segment_bounds(lows, starts)
+    _, high = segment_bounds(highs, starts)
+    keys = keys[starts]
+    present = ~pd.isna(keys)
+    return keys[present], low[present], high[present]
+
+
+def _score_batch(frame, cfg, lookup, formulas=None):
+    """Scored candidate rows of one batch: feasible and in the batch's per-product top N."""
+    low, high = lookup(frame["product_id"].to_numpy())
+    values = frame[METRIC_COLUMNS].to_numpy(dtype=np.float64)
+    norm = scale(values, low, high, REVERSED)
+    score = ranking_scores(norm[:, 0], norm[:, 1], norm[:, 2], cfg, formulas)
+
+    keep = feasible_rows(frame, cfg) & ~np.isnan(score)
+    if cfg.top_n is not None and keep.any():
+        keep &= _batch_rank(frame["product_id"].to_numpy(), np.where(keep, score, np.nan)) <= cfg.top_n
+    rows = np.flatnonzero(keep)
+    candidates = frame.iloc[rows].copy()
+    for i, name in enumerate(SCORE_COLUMNS[:3]):
+        candidates[name] = norm[rows, i]
+    candidates["ranking_score"] = score[rows]
+    return candidates
+
+
+def _batch_rank(product_ids, scores):
+    """Dense rank per product, in row order."""
+    order, starts, ids = sort_segments(product_ids)
+    if order is None:
+        return dense_rank_desc(scores, ids, starts)
+    ranks = np.empty(len(scores))
+    ranks[order] = dense_rank_desc(scores[order], ids, starts)
+    return ranks
+
+
+class _RunningTopN:
+    """
+    Candidate rows of every product, kept in file order and trimmed to the
+    per-product top N once they outgrow the batch size (or the last trim).
+    """
+
+    def __init__(self, top_n, batch_size):
+        self.top_n = top_n
+        self._batch_size = batch_size
+        self._parts = []
+        self._pending_rows = 0
+        self._state_rows = 0
+        self._template = None
+
+    def add(self, candidates):
+        if self._template is None:
+            self._template = candidates.iloc[:0]
+        if len(candidates) == 0:
+            return
+        self._parts.append(candidates)
+        self._pending_rows += len(candidates)
+        if self.top_n is not None and self._pending_rows > max(self._batch_size, self._state_rows):
+            self._trim()
+
+    def _combined(self):
+        if not self._parts:
+            return self._template if self._template is not None else pd.DataFrame(columns=SCORE_COLUMNS)
+        return self._parts[0] if len(self._parts) == 1 else pd.concat(self._parts)
+
+    def _trim(self):
+        combined = self._combined()
+        rank = _batch_rank(combined["product_id"].to_numpy(), combined["ranking_score"].to_numpy())
+        self._parts = [combined[rank <= self.top_n]]
+        self._state_rows, self._pending_rows = len(self._parts[0]), 0
+
+    def result(self):
+        combined = self._combined()
+        if len(combined) == 0:
+            result = combined.copy()
+            result["rank"] = np.zeros(0)
+            return result
+        # Candidates are feasible with their scores set, so ranking them on
+        # their own reproduces the in-memory ranks and row order
+        order, starts, ids = sort_segments(combined["product_id"].to_numpy())
+        scores = combined["ranking_score"].to_numpy()
+        rank = dense_rank_desc(scores if order is None else scores[order], ids, starts)
+        selected = rank <= self.top_n if self.top_n is not None else ~np.isnan(rank)
+        rows = np.flatnonzero(selected)
+        rows = rows[np.lexsort((rank[rows], ids[rows]))]
+        result = combined.iloc[rows if order is None else order[rows]].copy()
+        result["rank"] = rank[rows]
+        return result
@@ -0,0 +1,172 @@
+"""
+What-if ranking under many weight vectors at once.
+
+Tuning the ranking weights used to mean re-running rank_materials once
+per candidate vector. `weight_sweep(df, weights)` normalizes the cost, CO2
+and suitability columns once, like rank_materials, and evaluates the
+`ranking_score` formula (config/scoring_formulas.yaml) once for all K
+vectors: the normalized metrics are (1, R) rows and each weight a (K, 1)
+column, so the formula's operations broadcast to the (K, R) score matrix.
+Dense ranks per (vector, product) come from one row-wise sort of that
+matrix (segment_rank.dense_rank_desc).
+
+The formula runs the same float operations as in rank_materials, so each
+vector's scores and ranking equal rank_materials run with those weights.
+`WeightSweep.stability(top_n)` summarizes, per material row, how often it
+reaches the top N or first place and the spread of its rank across the
+vectors.
+"""
+import numpy as np
+import pandas as pd
+
+from src.recommendation.ranker import FORMULAS, METRICS, SCORE_COLUMNS, feasible_rows
+from src.recommendation.ranking_config import WEIGHT_ALIASES, WEIGHT_KEYS, resolve_ranking_config
+from src.recommendation.segment_rank import (
+    NORMALIZATIONS, PRODUCT, dense_rank_desc, min_max, segment_ids, sort_segments
+)
+
+
+def weight_vectors(weights):
+    """
+    (K, 3) float array in WEIGHT_KEYS order from a (K, 3) array-like or a
+    list of weight mappings (either config schema). Raises ValueError on
+    bad shapes, unknown keys, negative or non-finite values.
+    """
+    if weights is None or isinstance(weights, (str, bytes, dict)) or len(weights) == 0:
+        raise ValueError("weights must be a non-empty list of weight vectors")
+    if all(isinstance(w, dict) for w in weights):
+        rows = []
+        for w in weights:
+            named = {WEIGHT_ALIASES.get(k, k): v for k, v in w.items()}
+            unknown = set(named) - set(WEIGHT_KEYS)
+            if unknown or len(named) != len(w):
+                raise ValueError(f"Weight keys must be {', '.join(WEIGHT_KEYS)} (or their aliases)")
+            rows.append([named.get(k, 0) for k in WEIGHT_KEYS])
+        weights = rows
+    try:
+        matrix = np.array(weights, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError("weights must be numbers") from None
+    if matrix.ndim != 2 or matrix.shape[1] != len(WEIGHT_KEYS):
+        raise ValueError(f"Each weight vector needs {len(WEIGHT_KEYS)} values ({', '.join(WEIGHT_KEYS)})")
+    if not np.isfinite(matrix).all() or (matrix < 0).any():
+        raise ValueError("weights must be finite and non-negative")
+    return matrix
+
+
+class WeightSweep:
+    """
+    Scores and dense ranks of the ranked rows under K weight vectors.
+
+    `scores` and `ranks` have shape (K, R); column r is the row at `index`
+    (labels of the input frame, grouped by product). A metric that is
+    constant within a product scales to 1.0, as in rank_materials.
+    """
+
+    def __init__(self, index, product_ids, weights, scores, ranks):
+        self.index = index
+        self.product_ids = product_ids
+        self.weights = weights
+        self.scores = scores
+        self.ranks = ranks
+        self._segments = segment_ids(_starts(product_ids), len(product_ids))
+
+    def __len__(self):
+        return len(self.weights)
+
+    def rankings(self, top_n=None):
+        """
+        Per weight vector, the column positions ranked within the top N,
+        ordered by product, rank, then input order.
+        """
+        ranks = self.ranks
+        keep = ~np.isnan(ranks) if top_n is None else ranks <= top_n
+        # Sort only the kept cells: by vector, product, rank, then position
+        vectors, positions = np.nonzero(keep)
+        order = np.lexsort((positions, ranks[vectors, positions], self._segments[positions], vectors))
+        positions = positions[order].tolist()
+        bounds = np.concatenate(([0], np.cumsum(keep.sum(axis=1)))).tolist()
+        return [positions[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+    def stability(self, top_n=1):
+        """
+        Per ranked row: share of weight vectors placing it in the top N and
+        first, and its mean / std / best / worst rank over the vectors that
+        ranked it.
+        """
+        ranks = self.ranks
+        counts = np.count_nonzero(~np.isnan(ranks), axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.nansum(ranks, axis=0) / counts
+            variance = np.nansum(ranks * ranks, axis=0) / counts - mean * mean
+        return pd.DataFrame({
+            "product_id": self.product_ids,
+            "top_n_rate": (ranks <= top_n).mean(axis=0),
+            "first_rate": (ranks == 1).mean(axis=0),
+            "mean_rank": mean,
+            "rank_std": np.sqrt(np.maximum(variance, 0)),
+            # fmin / fmax skip NaN (unranked) cells
+            "best_rank": np.fmin.reduce(ranks, axis=0),
+            "worst_rank": np.fmax.reduce(ranks, axis=0)
+        }, index=self.index)
+
+
+def weight_sweep(df, weights, config=None, normalize=None, formulas=None):
+    """
+    Rank `df` (rank_materials columns) under every weight vector in
+    `weights` (see weight_vectors) in one pass. `config` (RankingConfig,
+    dict or YAML path) supplies the constraints and default normalization;
+    its weights are ignored. `formulas` is used as in rank_materials.
+    Returns a WeightSweep.
+    """
+    weights = weight_vectors(weights)
+    cfg = resolve_ranking_config(config) if config is not None else None
+    normalize = normalize or (cfg.normalization if cfg is not None else PRODUCT)
+    if normalize not in NORMALIZATIONS:
+        raise ValueError(f"normalize must be one of {', '.join(NORMALIZATIONS)}")
+
+    order, starts, _ = sort_segments(df["product_id"].to_numpy())
+    rows = np.arange(len(df)) if order is None else order
+    segments = starts if normalize == PRODUCT else None
+    # Normalized over every row (constraints filter afterwards, as in rank_materials)
+    features = np.column_stack([
+        min_max(df[name].to_numpy()[rows], segments, reverse=lower_is_better)
+        for name, lower_is_better in METRICS
+    ])
+
+    if cfg is not None:
+        keep = feasible_rows(df, cfg)[rows]
+    else:
+        keep = ~pd.isna(df["product_id"].to_numpy()[rows])
+    rows, features = rows[keep], features[keep]
+    product_ids = df["product_id"].to_numpy()[rows]
+
+    scores = sweep_scores(features, weights, formulas)
+    # One segment per (vector, product): ids k * P + p over the flattened (K, R) matrix
+    starts = _starts(product_ids)
+    n_rows = len(rows)
+    vector = np.arange(len(weights))[:, None]
+    ids = (vector * len(starts) + segment_ids(starts, n_rows)).ravel()
+    ranks = dense_rank_desc(scores.ravel(), ids, (vector * n_rows + starts).ravel()).reshape(scores.shape)
+    return WeightSweep(df.index[rows], product_ids, weights, scores, ranks)
+
+
+def sweep_scores(features, weights, formulas=None):
+    """
+    (K, R) `ranking_score` formula values for the (R, 3) normalized metrics
+    under the (K, 3) weight vectors.
+    """
+    formula = (formulas or FORMULAS)["ranking_score"]
+    scores = formula(
+        {name: features[:, i][None, :] for i, name in enumerate(SCORE_COLUMNS[:len(METRICS)])},
+        {key: weights[:, i][:, None] for i, key in enumerate(WEIGHT_KEYS)}
+    )
+    # A formula that ignores the weights scores every vector alike
+    return np.ascontiguousarray(np.broadcast_to(scores, (len(weights), len(features))))
+
+
+def _starts(grouped_keys):
+    """First position of every run of equal keys."""
+    if len(grouped_keys) == 0:
+        return np.zeros(0, dtype=np.intp)
+    return np.flatnonzero(np.concatenate(([True], grouped_keys[1:] != grouped_keys[:-1])))
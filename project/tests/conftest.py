@@ -7,6 +7,11 @@ from playwright.sync_api import Browser, BrowserContext, Page
 import os
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
 
 @pytest.fixture(scope="session")
 def browser_context_args(browser_context_args):
@@ -72,6 +77,65 @@ def downloads_dir(test_output_dir):
     return downloads_dir
 
 
+@pytest.fixture(scope="session")
+def materials_catalog_df():
+    """Material catalog from data/directory, widened with jittered copies"""
+    base = pd.read_csv(PROJECT_ROOT / "data" / "directory" / "materials.csv")
+    rng = np.random.default_rng(7)
+    copies = []
+    for i in range(3):
+        copy = base.copy()
+        copy["material_type"] = copy["material_type"] + ("" if i == 0 else f"_{i}")
+        for col in ["strength_mpa", "weight_capacity", "co2_emission_score", "cost_per_kg"]:
+            copy[col] = copy[col] * rng.uniform(0.8, 1.2, len(copy))
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+@pytest.fixture(scope="session")
+def synthetic_models(materials_catalog_df):
+    """
+    Small preprocessing pipeline + RF/XGB models trained on product x material
+    rows, with the same structure as the shipped artifacts (notebook 02/06/07).
+    Returns (pipeline, rf_cost_model, xgb_co2_model, training_frame).
+    """
+    from sklearn.compose import ColumnTransformer
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.impute import SimpleImputer
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
+    from xgboost import XGBRegressor
+
+    rng = np.random.default_rng(42)
+    n = 600
+    materials = materials_catalog_df.sample(n, replace=True, random_state=1).reset_index(drop=True)
+    frame = pd.DataFrame({
+        "product_weight": rng.uniform(0.05, 15, n),
+        "fragility_index": rng.uniform(0, 1, n),
+        "category": rng.choice(["Food", "Electronics", "Cosmetics", "Pharmacy"], n),
+        "shipping_type": rng.choice(["Air", "Road", "Sea"], n),
+    })
+    frame = pd.concat([frame, materials.drop(columns=["industry_use_case"])], axis=1)
+    frame.loc[rng.choice(n, 30, replace=False), "strength_mpa"] = np.nan
+
+    numeric = ["product_weight", "fragility_index", "strength_mpa", "weight_capacity",
+               "biodegradability_percent", "co2_emission_score", "recyclability_percent", "cost_per_kg"]
+    categorical = ["category", "shipping_type", "material_type"]
+    pipeline = ColumnTransformer([
+        ("num", Pipeline([("imputer", SimpleImputer(strategy="median")),
+                          ("scaler", StandardScaler())]), numeric),
+        ("cat", Pipeline([("imputer", SimpleImputer(strategy="most_frequent")),
+                          ("encoder", OneHotEncoder(handle_unknown="ignore", sparse_output=False))]), categorical),
+    ])
+    X = pipeline.fit_transform(frame)
+    cost = frame["cost_per_kg"] * frame["product_weight"].clip(0.1) * (1 + frame["fragility_index"])
+    co2 = frame["co2_emission_score"] * frame["product_weight"] / 10 + rng.normal(0, 0.5, n)
+
+    rf = RandomForestRegressor(n_estimators=25, max_depth=8, random_state=42, n_jobs=1).fit(X, cost)
+    xgb = XGBRegressor(n_estimators=40, max_depth=4, learning_rate=0.1, random_state=42, n_jobs=1).fit(X, co2)
+    return pipeline, rf, xgb, frame
+
+
 def pytest_configure(config):
     """Pytest hook for configuration"""
     # Create reports directory
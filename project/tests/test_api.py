@@ -53,3 +53,32 @@ def test_predict_valid_request():
     assert len(data["predictions"]) > 0
     assert "status" in data
     assert data["status"] == "success"
+
+def test_predict_top_n_override():
+    """Test per-request top_n override and validation"""
+    client = app.test_client()
+    payload = {
+        "product_name": "Test Product",
+        "product_weight_kg": 1.0,
+        "category": "Food",
+        "fragility_index": 0.2,
+        "shipping_type": "Road",
+        "top_n": 2
+    }
+    response = client.post("/predict", json=payload)
+    assert response.status_code == 200
+    assert [p["rank"] for p in response.get_json()["predictions"]] == [1, 2]
+
+    response = client.post("/predict", json=dict(payload, top_n=0))
+    assert response.status_code == 400
+
+    # The query parameter is validated like the body field
+    body_error = response.get_json()["error"]
+    del payload["top_n"]
+    assert client.post("/predict?top_n=3", json=payload).get_json()["predictions"][-1]["rank"] == 3
+    for path in ("/predict", "/predict/batch", "/predict/sweep"):
+        for value in ("abc", "0", "-2", "1.5"):
+            body = [payload] if path == "/predict/batch" else payload
+            response = client.post(f"{path}?top_n={value}", json=body)
+            assert response.status_code == 400, (path, value)
+            assert response.get_json()["error"] == body_error
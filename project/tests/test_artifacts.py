@@ -0,0 +1,71 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import joblib
+import numpy as np
+import pytest
+
+import predict  # noqa: F401  (puts the project root on sys.path)
+from src.inference.artifacts import convert_artifacts, load_artifacts
+from src.inference.predictor import EcoPackPredictor
+
+
+@pytest.fixture
+def converted(tmp_path, synthetic_models):
+    pipeline, rf, xgb, _ = synthetic_models
+    paths = []
+    for name, obj in [("pipeline.pkl", pipeline), ("rf.joblib", rf), ("xgb.joblib", xgb)]:
+        joblib.dump(obj, tmp_path / name)
+        paths.append(str(tmp_path / name))
+    out_dir = tmp_path / "fast"
+    convert_artifacts(*paths, str(out_dir))
+    return paths, str(out_dir)
+
+
+def test_converted_artifacts_match_originals(converted, synthetic_models):
+    pipeline, rf, xgb, frame = synthetic_models
+    _, out_dir = converted
+    transformer, cost_model, co2_model = load_artifacts(out_dir)
+    # Node arrays are views over the memory-mapped files, not private copies
+    assert not cost_model.threshold.flags.owndata
+
+    X = transformer.transform(frame)
+    assert X.tobytes() == pipeline.transform(frame).tobytes()
+    np.testing.assert_allclose(cost_model.predict(X), rf.predict(X), rtol=1e-12, atol=1e-9)
+    np.testing.assert_allclose(co2_model.predict(X), xgb.predict(X), rtol=1e-5, atol=1e-4)
+
+    _, _, native = load_artifacts(out_dir, native_xgboost=True)
+    assert native.predict(X).tolist() == xgb.predict(X).tolist()
+
+
+def test_predictor_prefers_converted_artifacts(converted, synthetic_models):
+    _, rf, _, frame = synthetic_models
+    paths, out_dir = converted
+    predictor = EcoPackPredictor(*paths, artifact_dir=out_dir).load()
+    assert predictor._pipeline is None and predictor.uses_fast_transform
+    cost, _ = predictor.predict_arrays(frame.head(10))
+    np.testing.assert_allclose(cost, EcoPackPredictor(*paths).predict_arrays(frame.head(10))[0], rtol=1e-12)
+
+    # The sklearn pipeline is still there for callers that need it
+    assert predictor.pipeline is not None and predictor.uses_fast_transform
+
+    fallback = EcoPackPredictor(*paths, artifact_dir=str(Path(out_dir) / "missing")).load()
+    assert fallback._pipeline is not None
+
+
+def test_stale_artifacts_fall_back_to_the_pickles(converted, synthetic_models, caplog):
+    _, rf, _, frame = synthetic_models
+    paths, out_dir = converted
+    # Retrained after the conversion: the cost pickle no longer matches the manifest
+    joblib.dump(rf, paths[1], compress=3)
+    predictor = EcoPackPredictor(*paths, artifact_dir=out_dir).load()
+    assert predictor._pipeline is not None and "rf_cost" in caplog.text
+    assert predictor.cost_model is not rf and type(predictor.cost_model) is type(rf)
+    assert predictor.predict_arrays(frame.head(5))[0].tolist() == rf.predict(
+        predictor.pipeline.transform(frame.head(5))).tolist()
+
+    # Artifact-only deployments have nothing to compare against
+    for path in paths:
+        Path(path).unlink()
+    assert EcoPackPredictor(*paths, artifact_dir=out_dir).load()._pipeline is None
@@ -0,0 +1,83 @@
+import sys
+import json
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app import app
+
+PRODUCTS = [
+    {"product_name": "Mug", "product_weight_kg": 0.45, "category": "Food", "fragility_index": 0.8, "shipping_type": "Air"},
+    {"product_name": "Phone", "product_weight_kg": 2, "category": "Electronics", "fragility_index": 0.5, "shipping_type": "Sea"},
+    {"product_name": "Crate", "product_weight_kg": 14.0, "category": "Pharmacy", "fragility_index": 0.95, "shipping_type": "Road"},
+]
+
+
+def test_batch_matches_single_predictions():
+    client = app.test_client()
+    response = client.post("/predict/batch", json=PRODUCTS)
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["count"] == len(PRODUCTS)
+    assert data["errors"] == 0
+
+    for product, result in zip(PRODUCTS, data["results"]):
+        single = client.post("/predict", json=product).get_json()
+        assert result["status"] == "success"
+        assert result["product_name"] == product["product_name"]
+        assert result["predictions"] == single["predictions"]
+
+
+def test_batch_reports_per_item_errors():
+    client = app.test_client()
+    items = [PRODUCTS[0], {"product_name": "Bad", "product_weight_kg": 1, "category": "Toys",
+                           "fragility_index": 0.2, "shipping_type": "Air"}, 42]
+    data = client.post("/predict/batch", json=items).get_json()
+    statuses = [r["status"] for r in data["results"]]
+    assert statuses == ["success", "error", "error"]
+    assert data["results"][1]["error"] == "Invalid category value"
+    assert data["errors"] == 2
+
+
+def test_batch_accepts_ndjson():
+    client = app.test_client()
+    body = "\n".join(json.dumps(p) for p in PRODUCTS) + "\nnot json\n"
+    response = client.post("/predict/batch", data=body, content_type="application/x-ndjson")
+    data = response.get_json()
+    assert [r["index"] for r in data["results"]] == [0, 1, 2, 3]
+    assert data["results"][3]["error"] == "Invalid JSON"
+
+
+def test_batch_rejects_non_batch_body():
+    client = app.test_client()
+    response = client.post("/predict/batch", data="hello", content_type="text/plain")
+    assert response.status_code == 400
+
+
+def test_batch_of_only_invalid_items():
+    client = app.test_client()
+    for body in ([1, 2], [{"product_name": "x"}]):
+        response = client.post("/predict/batch", json=body)
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["errors"] == data["count"] == len(body)
+        assert {r["status"] for r in data["results"]} == {"error"}
+
+        streamed = client.post("/predict/batch?stream=1", json=body)
+        assert streamed.status_code == 200
+        lines = [json.loads(line) for line in streamed.get_data(as_text=True).splitlines()]
+        assert [r["status"] for r in lines] == ["error"] * len(body)
+
+
+def test_batch_accepts_one_pretty_printed_object():
+    client = app.test_client()
+    body = json.dumps(PRODUCTS[0], indent=2)
+    response = client.post("/predict/batch", data=body, content_type="application/json")
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["count"] == 1 and data["errors"] == 0
+    assert data["results"][0]["predictions"] == client.post("/predict", json=PRODUCTS[0]).get_json()["predictions"]
+
+    for body in ("42", '"text"', "null"):
+        response = client.post("/predict/batch", data=body, content_type="application/json")
+        assert response.status_code == 400
+        assert response.get_json()["error"] == "Request body must be a JSON array or NDJSON"
@@ -0,0 +1,68 @@
+import sys
+import threading
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import predict
+from src.inference.batching import MicroBatcher
+from src.inference.predictor import EcoPackPredictor
+
+
+def test_concurrent_requests_share_batches():
+    calls = []
+
+    def predict_fn(frame):
+        calls.append(len(frame))
+        return frame["x"].to_numpy() * 2, frame["x"].to_numpy() + 1
+
+    batcher = MicroBatcher(predict_fn, max_wait_ms=50, max_batch_rows=1000)
+    results = {}
+    barrier = threading.Barrier(8)
+
+    def client(i):
+        barrier.wait()
+        results[i] = batcher.predict(pd.DataFrame({"x": [i, i + 100]}), timeout=5)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    batcher.stop()
+
+    for i, (doubled, shifted) in results.items():
+        assert doubled.tolist() == [2 * i, 2 * (i + 100)]
+        assert shifted.tolist() == [i + 1, i + 101]
+    assert sum(calls) == 16 and len(calls) < 8
+    stats = batcher.stats()
+    assert stats["requests"] == 8 and stats["rows"] == 16
+    assert stats["batches"] == len(calls) and stats["queue_depth"] == 0
+
+
+def test_errors_reach_every_waiting_request():
+    def predict_fn(frame):
+        raise ValueError("model failed")
+
+    batcher = MicroBatcher(predict_fn, max_wait_ms=1)
+    with pytest.raises(ValueError, match="model failed"):
+        batcher.predict(pd.DataFrame({"x": [1]}), timeout=5)
+    batcher.stop()
+
+
+def test_scheduled_ml_path_matches_direct(monkeypatch, synthetic_models, materials_catalog_df):
+    pipeline, rf, xgb, _ = synthetic_models
+    predictor = EcoPackPredictor.from_objects(pipeline, rf, xgb)
+    monkeypatch.setattr(predict.REGISTRY, "get", lambda name="default": predictor)
+    monkeypatch.setattr(predict, "ranking_config", {"weights": {"cost": 0.3, "co2": 0.4, "suitability": 0.3}, "top_n": 4})
+    monkeypatch.setattr(predict, "USE_ADVANCED_RANKING", True)
+    product = {"product_weight_kg": 2.5, "fragility_index": 0.6, "category": "Food", "shipping_type": "Sea"}
+
+    batcher = MicroBatcher(predictor.predict_arrays, max_wait_ms=2)
+    scheduled = predict.predict_with_models_batch([product], materials_catalog_df, batcher)
+    batcher.stop()
+    assert scheduled == predict.predict_with_models_batch([product], materials_catalog_df)
+    assert np.isfinite([p["predicted_cost"] for p in scheduled[0]]).all()
@@ -0,0 +1,66 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import cache_backends
+import predict
+from app import app, cache
+from cache_backends import LRUCache
+
+PAYLOAD = {
+    "product_name": "Cached Product",
+    "product_weight_kg": 3.0,
+    "category": "Cosmetics",
+    "fragility_index": 0.35,
+    "shipping_type": "Sea"
+}
+
+
+def test_repeated_predict_is_served_from_cache():
+    cache.clear()
+    client = app.test_client()
+    before = client.get("/cache/stats").get_json()
+
+    first = client.post("/predict", json=PAYLOAD).get_json()
+    second = client.post("/predict", json=dict(PAYLOAD, product_name="Other name")).get_json()
+    assert first == second
+
+    after = client.get("/cache/stats").get_json()
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
+
+
+def test_cache_key_tracks_inputs_and_versions():
+    key = predict.prediction_cache_key(PAYLOAD, "catalog-a")
+    assert key == predict.prediction_cache_key(dict(PAYLOAD, product_name="x"), "catalog-a")
+    assert key != predict.prediction_cache_key(PAYLOAD, "catalog-b")
+    assert key != predict.prediction_cache_key(dict(PAYLOAD, fragility_index=0.36), "catalog-a")
+
+
+def test_quantized_products_share_a_bucket():
+    a = predict.quantize_product(dict(PAYLOAD, product_weight_kg=3.04), weight_step=0.1, fragility_step=0.05)
+    b = predict.quantize_product(dict(PAYLOAD, product_weight_kg=2.96), weight_step=0.1, fragility_step=0.05)
+    assert a["product_weight_kg"] == b["product_weight_kg"] == 3.0
+    assert predict.prediction_cache_key(a, "v") == predict.prediction_cache_key(b, "v")
+
+
+def test_lru_eviction_and_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_backends.time, "monotonic", lambda: now[0])
+    lru = LRUCache(threshold=2, default_timeout=10)
+
+    lru.set("a", 1)
+    lru.set("b", 2)
+    assert lru.get("a") == 1          # "a" is now most recently used
+    lru.set("c", 3)                   # evicts "b"
+    assert lru.get("b") is None
+    assert lru.get("c") == 3
+
+    now[0] += 11
+    assert lru.get("a") is None       # expired
+
+    stats = lru.stats()
+    assert stats["evictions"] == 1
+    assert stats["expirations"] == 1
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
@@ -0,0 +1,79 @@
+import os
+import sys
+import shutil
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import pytest
+import yaml
+
+from app import app
+import predict
+from catalog import CatalogStore
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CATALOG_YAML = PROJECT_ROOT / "config" / "materials_catalog.yaml"
+MATERIALS_CSV = PROJECT_ROOT / "data" / "directory" / "materials.csv"
+CATEGORIES = ["Food", "Electronics", "Cosmetics", "Pharmacy"]
+SHIPPING = ["Air", "Road", "Sea"]
+
+
+@pytest.fixture
+def catalog_files(tmp_path):
+    yaml_path = tmp_path / "materials_catalog.yaml"
+    csv_path = tmp_path / "materials.csv"
+    shutil.copy(CATALOG_YAML, yaml_path)
+    shutil.copy(MATERIALS_CSV, csv_path)
+    return yaml_path, csv_path
+
+
+def test_snapshot_is_immutable(catalog_files):
+    store = CatalogStore(*map(str, catalog_files), CATEGORIES, SHIPPING, poll_interval=0)
+    with pytest.raises(AttributeError):
+        store.snapshot.version = "tampered"
+
+
+def test_reload_swaps_snapshot_on_change(catalog_files):
+    yaml_path, csv_path = catalog_files
+    store = CatalogStore(str(yaml_path), str(csv_path), CATEGORIES, SHIPPING, poll_interval=0)
+    before = store.snapshot
+    material_count = len(before.heuristic)
+
+    # Unchanged sources keep the same snapshot object
+    assert store.reload() is False
+    assert store.snapshot is before
+
+    config = yaml.safe_load(yaml_path.read_text())
+    config["materials"] = config["materials"][:2]
+    yaml_path.write_text(yaml.safe_dump(config))
+    os.utime(yaml_path, ns=(1, 1))
+
+    assert store.reload() is True
+    assert store.snapshot.version != before.version
+    assert len(store.snapshot.heuristic) == 2
+    # The old snapshot is untouched for requests still holding it
+    assert len(before.heuristic) == material_count
+
+
+def test_failed_reload_keeps_previous_snapshot(catalog_files):
+    yaml_path, csv_path = catalog_files
+    store = CatalogStore(str(yaml_path), str(csv_path), CATEGORIES, SHIPPING, poll_interval=0)
+    before = store.snapshot
+    yaml_path.write_text("materials: []\n")
+    os.utime(yaml_path, ns=(1, 1))
+    assert store.reload() is False
+    assert store.snapshot is before
+
+
+def test_predict_reports_catalog_version():
+    client = app.test_client()
+    payload = {
+        "product_name": "Test Product",
+        "product_weight_kg": 2.0,
+        "category": "Food",
+        "fragility_index": 0.5,
+        "shipping_type": "Road"
+    }
+    response = client.post("/predict", json=payload)
+    assert response.status_code == 200
+    assert response.get_json()["catalog_version"] == predict.CATALOG.version
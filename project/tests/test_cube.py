@@ -0,0 +1,112 @@
+import sys
+import itertools
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import pytest
+
+import predict
+from app import app, cache
+from cube import RecommendationCube, build_cube, load_cube
+from scoring import score_materials
+
+
+@pytest.fixture(scope="module")
+def cube(tmp_path_factory):
+    snapshot = predict.CATALOG.snapshot
+    out_dir = tmp_path_factory.mktemp("cube")
+    build_cube(snapshot.heuristic, snapshot.version, str(out_dir),
+               weight_max=16, weight_step=0.5, fragility_step=0.1)
+    return RecommendationCube(str(out_dir))
+
+
+def test_grid_points_match_exact_scoring(cube):
+    catalog = predict.CATALOG.snapshot.heuristic
+    for weight, fragility, category, shipping in itertools.product(
+            [0, 0.5, 2.0, 7.5, 15.5], [0, 0.3, 0.5, 0.8, 1.0],
+            predict.VALID_CATEGORIES, predict.VALID_SHIPPING):
+        expected = score_materials(catalog, weight, fragility, category, shipping)
+        assert cube.lookup(catalog, weight, fragility, category, shipping) == expected
+
+
+def test_lookup_uses_nearest_cell_and_rejects_outside_grid(cube):
+    catalog = predict.CATALOG.snapshot.heuristic
+    nearest = cube.lookup(catalog, 2.2, 0.52, "Food", "Road")
+    assert nearest == score_materials(catalog, 2.0, 0.5, "Food", "Road")
+    assert cube.lookup(catalog, 40, 0.5, "Food", "Road") is None
+
+
+def test_cube_is_tied_to_catalog_version(cube):
+    assert cube.serves(predict.CATALOG.version)
+    assert not cube.serves("some-other-version")
+
+
+def test_missing_cube_loads_as_none(tmp_path):
+    assert load_cube(str(tmp_path)) is None
+
+
+def test_predict_serves_from_cube_unless_exact(cube, monkeypatch):
+    monkeypatch.setattr(predict, "CUBE", cube)
+    cache.clear()
+    client = app.test_client()
+    payload = {"product_name": "Box", "product_weight_kg": 2.2, "category": "Food",
+               "fragility_index": 0.52, "shipping_type": "Road"}
+
+    from_cube = client.post("/predict", json=payload).get_json()
+    assert from_cube["served_from"] == "cube"
+
+    exact = client.post("/predict?exact=1", json=payload).get_json()
+    assert exact["served_from"] == "exact"
+    catalog = predict.CATALOG.snapshot.heuristic
+    assert exact["predictions"] == score_materials(
+        catalog, 2.2, 0.52, "Food", "Road", predict.RANKING_CONSTRAINTS, predict.DEFAULT_TOP_N)
+    assert from_cube["predictions"] == cube.lookup(
+        catalog, 2.2, 0.52, "Food", "Road", predict.RANKING_CONSTRAINTS, predict.DEFAULT_TOP_N)
+
+
+def test_cube_applies_constraints_like_exact_scoring(cube):
+    catalog = predict.CATALOG.snapshot.heuristic
+    constraints = {"max_cost": 150, "max_co2": 8, "min_recyclability": 80}
+    for weight, fragility, shipping in itertools.product([0.5, 2.0, 6.0], [0.2, 0.8], predict.VALID_SHIPPING):
+        for top_n in [None, 1, 3]:
+            expected = score_materials(catalog, weight, fragility, "Food", shipping, constraints, top_n)
+            assert cube.lookup(catalog, weight, fragility, "Food", shipping, constraints, top_n) == expected
+
+
+def test_batch_answers_like_single_predict_with_cube(cube, monkeypatch):
+    monkeypatch.setattr(predict, "CUBE", cube)
+    cache.clear()
+    client = app.test_client()
+    products = [
+        {"product_name": "Box", "product_weight_kg": 2.2, "category": "Food",
+         "fragility_index": 0.52, "shipping_type": "Road"},
+        {"product_name": "Crate", "product_weight_kg": 40, "category": "Pharmacy",
+         "fragility_index": 0.9, "shipping_type": "Sea"},
+        {"product_name": "Exact", "product_weight_kg": 3.3, "category": "Electronics",
+         "fragility_index": 0.31, "shipping_type": "Air", "exact": True},
+    ]
+    results = client.post("/predict/batch", json=products).get_json()["results"]
+    assert [r["served_from"] for r in results] == ["cube", "exact", "exact"]
+    for product, result in zip(products, results):
+        single = client.post("/predict", json=product).get_json()
+        assert result["predictions"] == single["predictions"]
+        assert result["served_from"] == single["served_from"]
+
+    forced = client.post("/predict/batch?exact=1", json=products[:1]).get_json()["results"][0]
+    assert forced["served_from"] == "exact"
+    assert forced["predictions"] == client.post("/predict?exact=1", json=products[0]).get_json()["predictions"]
+
+
+def test_inputs_past_a_feasibility_threshold_are_scored_exactly(cube):
+    catalog = predict.CATALOG.snapshot.heuristic
+    # Just past Bagasse's 6 kg and Recycled Cardboard's 15 kg limits, and the 0.7 protection step
+    for weight, fragility in [(6.04, 0.5), (15.04, 0.5), (2.0, 0.704)]:
+        assert cube.lookup(catalog, weight, fragility, "Food", "Road") is None
+
+    weights = sorted({w for t in catalog.max_weight if t <= 16 for w in (t - 0.04, t + 0.04)})
+    for weight, fragility, category, shipping in itertools.product(
+            weights, [0.396, 0.404, 0.696, 0.704], predict.VALID_CATEGORIES, predict.VALID_SHIPPING):
+        served = cube.lookup(catalog, weight, fragility, category, shipping)
+        if served is not None:
+            exact = score_materials(catalog, weight, fragility, category, shipping)
+            assert {p["material"] for p in served} == {p["material"] for p in exact}
@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import numpy as np
+import pytest
+
+import predict  # noqa: F401  (puts the project root on sys.path)
+from src.inference.fast_transform import compile_column_transformer
+from src.inference.predictor import EcoPackPredictor
+
+
+def test_fast_transform_is_bit_for_bit(synthetic_models):
+    pipeline, _, _, frame = synthetic_models
+    frame = frame.copy()
+    frame.loc[3, "category"] = np.nan
+    frame.loc[5, "material_type"] = "Unseen material"
+    frame.loc[7, "product_weight"] = np.nan
+    fast = compile_column_transformer(pipeline)
+    for rows in (frame.head(1), frame.head(4), frame):
+        expected = pipeline.transform(rows)
+        actual = fast.transform(rows)
+        assert actual.dtype == expected.dtype and actual.shape == expected.shape
+        assert actual.tobytes() == expected.tobytes()
+
+
+def test_unsupported_pipelines_are_rejected(synthetic_models):
+    from sklearn.compose import ColumnTransformer
+    from sklearn.preprocessing import MinMaxScaler
+
+    _, _, _, frame = synthetic_models
+    unsupported = ColumnTransformer([("num", MinMaxScaler(), ["product_weight"])]).fit(frame)
+    with pytest.raises(ValueError):
+        compile_column_transformer(unsupported)
+
+
+def test_predictor_uses_fast_transform_automatically(synthetic_models):
+    pipeline, rf, xgb, frame = synthetic_models
+    fast = EcoPackPredictor.from_objects(pipeline, rf, xgb)
+    slow = EcoPackPredictor.from_objects(pipeline, rf, xgb, fast_transform=False)
+    assert fast.uses_fast_transform and not slow.uses_fast_transform
+    for a, b in zip(fast.predict_arrays(frame.head(12)), slow.predict_arrays(frame.head(12))):
+        assert a.tolist() == b.tolist()
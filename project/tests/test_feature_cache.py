@@ -0,0 +1,55 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import numpy as np
+
+import predict
+from src.inference.fast_transform import compile_column_transformer
+from src.inference.feature_cache import MaterialFeatureCache
+from src.inference.predictor import EcoPackPredictor
+
+PRODUCTS = [
+    {"product_weight_kg": 0.45, "category": "Food", "fragility_index": 0.8, "shipping_type": "Air"},
+    {"product_weight_kg": 2, "category": "Electronics", "fragility_index": 0.5, "shipping_type": "Sea"},
+    {"product_weight_kg": 14.0, "category": "Pharmacy", "fragility_index": 0.95, "shipping_type": "Road"},
+]
+
+
+def test_cached_material_block_is_bit_for_bit(synthetic_models, materials_catalog_df):
+    pipeline, _, _, _ = synthetic_models
+    cache = MaterialFeatureCache(compile_column_transformer(pipeline))
+    materials = materials_catalog_df[predict.MATERIAL_FEATURES]
+    expected = pipeline.transform(predict.build_model_frame(PRODUCTS, materials_catalog_df))
+    for _ in range(2):
+        actual = cache.transform(predict.build_product_frame(PRODUCTS), materials, "v1")
+        assert actual.dtype == expected.dtype and actual.shape == expected.shape
+        assert actual.tobytes() == expected.tobytes()
+    assert cache.stats() == {"versions": 1, "hits": 1, "misses": 1}
+
+
+def test_new_catalog_version_invalidates_block(synthetic_models, materials_catalog_df):
+    pipeline, _, _, _ = synthetic_models
+    cache = MaterialFeatureCache(compile_column_transformer(pipeline), max_versions=1)
+    products = predict.build_product_frame(PRODUCTS[:1])
+    materials = materials_catalog_df[predict.MATERIAL_FEATURES]
+    cache.transform(products, materials, "v1")
+
+    changed = materials.copy()
+    changed["cost_per_kg"] = changed["cost_per_kg"] * 2
+    actual = cache.transform(products, changed, "v2")
+    expected = pipeline.transform(predict.build_model_frame(PRODUCTS[:1], changed))
+    assert actual.tobytes() == expected.tobytes()
+    assert cache.stats()["versions"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_predict_cross_matches_full_frame(synthetic_models, materials_catalog_df):
+    pipeline, rf, xgb, _ = synthetic_models
+    frame = predict.build_model_frame(PRODUCTS, materials_catalog_df)
+    products = predict.build_product_frame(PRODUCTS)
+    materials = materials_catalog_df[predict.MATERIAL_FEATURES]
+    for predictor in (EcoPackPredictor.from_objects(pipeline, rf, xgb),
+                      EcoPackPredictor.from_objects(pipeline, rf, xgb, fast_transform=False)):
+        cost, co2 = predictor.predict_cross(products, materials, "v1")
+        expected_cost, expected_co2 = predictor.predict_arrays(frame)
+        assert np.array_equal(cost, expected_cost) and np.array_equal(co2, expected_co2)
@@ -0,0 +1,83 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import pandas as pd
+import pytest
+
+import predict
+from src.inference.predictor import EcoPackPredictor
+from src.inference.registry import PredictorRegistry
+
+RANKING_CONFIG = {"weights": {"cost": 0.3, "co2": 0.4, "suitability": 0.3}, "top_n": 4}
+
+PRODUCTS = [
+    {"product_name": "Mug", "product_weight_kg": 0.45, "category": "Food", "fragility_index": 0.8, "shipping_type": "Air"},
+    {"product_name": "Phone", "product_weight_kg": 2, "category": "Electronics", "fragility_index": 0.5, "shipping_type": "Sea"},
+    {"product_name": "Crate", "product_weight_kg": 14.0, "category": "Pharmacy", "fragility_index": 0.95, "shipping_type": "Road"},
+]
+
+
+@pytest.fixture
+def ml_models(monkeypatch, synthetic_models):
+    pipeline, rf, xgb, _ = synthetic_models
+    monkeypatch.setattr(predict, "REGISTRY", PredictorRegistry())
+    predict.REGISTRY.register("default", EcoPackPredictor.from_objects(pipeline, rf, xgb))
+    monkeypatch.setattr(predict, "ranking_config", RANKING_CONFIG)
+    monkeypatch.setattr(predict, "USE_ADVANCED_RANKING", True)
+    return pipeline, rf, xgb
+
+
+def per_row_predictions(data, materials_df, pipeline, rf, xgb):
+    """Original one-row-per-material ML loop"""
+    w = RANKING_CONFIG["weights"]
+    predictions = []
+    for _, material in materials_df.iterrows():
+        input_data = pd.DataFrame([{
+            'product_weight': data["product_weight_kg"],
+            'fragility_index': data["fragility_index"],
+            'category': data["category"],
+            'shipping_type': data["shipping_type"],
+            'material_type': material['material_type'],
+            'strength_mpa': material['strength_mpa'],
+            'weight_capacity': material['weight_capacity'],
+            'biodegradability_percent': material['biodegradability_percent'],
+            'co2_emission_score': material['co2_emission_score'],
+            'recyclability_percent': material['recyclability_percent'],
+            'cost_per_kg': material['cost_per_kg']
+        }])
+        X = pipeline.transform(input_data)
+        predicted_cost = rf.predict(X)[0]
+        predicted_co2 = xgb.predict(X)[0]
+        ranking_score = (
+            w["cost"] * max(0, 1 - (predicted_cost / 100)) +
+            w["co2"] * max(0, 1 - (predicted_co2 / 50)) +
+            w["suitability"] * max(0, material['strength_mpa'] / 30)
+        )
+        predictions.append({
+            "material": material['material_type'],
+            "predicted_cost": round(float(predicted_cost), 2),
+            "co2": round(float(predicted_co2), 2),
+            "sustainability_score": round(float(max(0, min(100, ranking_score * 100))), 2)
+        })
+    predictions.sort(key=lambda x: x["sustainability_score"], reverse=True)
+    predictions = predictions[:RANKING_CONFIG["top_n"]]
+    for idx, pred in enumerate(predictions, 1):
+        pred["rank"] = idx
+    return predictions
+
+
+def test_model_frame_is_product_by_material_cross_join(materials_catalog_df):
+    frame = predict.build_model_frame(PRODUCTS, materials_catalog_df)
+    n = len(materials_catalog_df)
+    assert len(frame) == len(PRODUCTS) * n
+    assert (frame["product_weight"].iloc[n:2 * n] == 2).all()
+    assert frame["material_type"].iloc[n:2 * n].tolist() == materials_catalog_df["material_type"].tolist()
+
+
+def test_batched_ml_path_matches_per_row(ml_models, materials_catalog_df):
+    pipeline, rf, xgb = ml_models
+    batched = predict.predict_with_models_batch(PRODUCTS, materials_catalog_df)
+    for product, result in zip(PRODUCTS, batched):
+        assert result == per_row_predictions(product, materials_catalog_df, pipeline, rf, xgb)
+        assert result == predict.predict_with_models(product, materials_catalog_df)
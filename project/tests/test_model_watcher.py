@@ -0,0 +1,133 @@
+import sys
+import threading
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import joblib
+import pytest
+
+import predict
+from app import app
+from src.inference.model_watcher import PICKLE_FILES, ModelWatcher, available_versions
+from src.inference.predictor import EcoPackPredictor
+from src.inference.registry import PredictorRegistry
+
+
+@pytest.fixture
+def deploy(tmp_path, synthetic_models):
+    """Write a pickled model version under tmp_path/versions/<version>."""
+    pipeline, rf, xgb, _ = synthetic_models
+
+    def write(version, models=(pipeline, rf, xgb)):
+        directory = tmp_path / "versions" / version
+        directory.mkdir(parents=True)
+        for name, obj in zip(PICKLE_FILES, models):
+            joblib.dump(obj, directory / name)
+        return directory
+
+    return write
+
+
+def make_watcher(tmp_path, synthetic_models):
+    registry = PredictorRegistry()
+    pipeline, rf, xgb, frame = synthetic_models
+    registry.register("default", EcoPackPredictor.from_objects(pipeline, rf, xgb),
+                      warmup=lambda: frame.head(8), version="v1")
+    build = lambda d: EcoPackPredictor(*[str(Path(d) / name) for name in PICKLE_FILES])
+    return registry, ModelWatcher(registry, str(tmp_path / "versions"), build, poll_interval=0)
+
+
+def test_versions_sort_naturally_and_skip_incomplete(tmp_path, deploy):
+    for version in ("v2", "v10", "v9"):
+        deploy(version)
+    (tmp_path / "versions" / "v11").mkdir()
+    deploy("_v12")
+    assert available_versions(str(tmp_path / "versions")) == ["v2", "v9", "v10"]
+
+
+def test_new_version_is_promoted_and_can_be_rolled_back(tmp_path, deploy, synthetic_models):
+    registry, watcher = make_watcher(tmp_path, synthetic_models)
+    old = registry.get()
+    assert watcher.check() is None
+
+    deploy("v2")
+    assert watcher.check() == "v2"
+    assert registry.version() == "v2" and registry.get() is not old
+    assert registry.status()["default"]["ready"]
+
+    assert registry.rollback() == "v1" and registry.get() is old
+    # A rolled-back version is not promoted again by the watcher
+    assert watcher.check() is None and registry.version() == "v1"
+    assert registry.rollback() == "v2"
+
+
+def test_failed_version_keeps_active_one(tmp_path, deploy, synthetic_models):
+    registry, watcher = make_watcher(tmp_path, synthetic_models)
+    directory = deploy("v2")
+    (directory / PICKLE_FILES[1]).write_bytes(b"not a pickle")
+    assert watcher.check() is None
+    assert registry.version() == "v1"
+    assert "v2" in watcher.status()["failed_versions"]
+    with pytest.raises(LookupError):
+        registry.rollback()
+
+
+def test_requests_are_served_during_swap(tmp_path, deploy, synthetic_models):
+    registry, watcher = make_watcher(tmp_path, synthetic_models)
+    frame = synthetic_models[3].head(4)
+    errors, done = [], threading.Event()
+
+    def client():
+        while not done.is_set():
+            try:
+                registry.get().predict_arrays(frame)
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=client) for _ in range(4)]
+    for t in threads:
+        t.start()
+    deploy("v2")
+    assert watcher.check() == "v2"
+    done.set()
+    for t in threads:
+        t.join()
+    assert errors == []
+
+
+def test_admin_endpoints(monkeypatch, tmp_path, deploy, synthetic_models):
+    registry, watcher = make_watcher(tmp_path, synthetic_models)
+    monkeypatch.setattr(predict, "REGISTRY", registry)
+    monkeypatch.setattr(predict, "MODEL_WATCHER", watcher)
+    client = app.test_client()
+    admin = {"X-Admin-Token": "s3cret"}
+
+    assert client.get("/admin/models").get_json()["active_version"] == "v1"
+    # Disabled without a configured token, refused with a wrong one
+    monkeypatch.delenv("ECOPACK_ADMIN_TOKEN", raising=False)
+    assert client.post("/admin/models/rollback", headers=admin).status_code == 403
+    monkeypatch.setenv("ECOPACK_ADMIN_TOKEN", "s3cret")
+    assert client.post("/admin/models/reload").status_code == 401
+    assert client.post("/admin/models/rollback", headers={"X-Admin-Token": "guess"}).status_code == 401
+    assert client.post("/admin/models/rollback", headers=admin).status_code == 409
+
+    deploy("v2")
+    body = client.post("/admin/models/reload", headers=admin).get_json()
+    assert body["promoted"] == "v2" and body["active_version"] == "v2"
+    assert body["previous_version"] == "v1"
+
+    body = client.post("/admin/models/rollback", headers=admin).get_json()
+    assert body["active_version"] == "v1" and body["previous_version"] == "v2"
+
+
+def test_predict_reports_model_version(monkeypatch, tmp_path, synthetic_models):
+    registry, _ = make_watcher(tmp_path, synthetic_models)
+    monkeypatch.setattr(predict, "REGISTRY", registry)
+    monkeypatch.setattr(predict, "USE_ML_MODELS", True)
+    monkeypatch.setattr(predict, "USE_ADVANCED_RANKING", True)
+    monkeypatch.setattr(predict, "ranking_config", {"weights": {"cost": 0.3, "co2": 0.4, "suitability": 0.3}})
+    product = {"product_name": "Mug", "product_weight_kg": 0.45, "category": "Food",
+               "fragility_index": 0.8, "shipping_type": "Air"}
+    response = app.test_client().post("/predict", json=product)
+    assert response.status_code == 200
+    assert response.get_json()["model_version"] == "v1"
@@ -0,0 +1,105 @@
+import os
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import predict
+from src.inference import offline_scoring
+from src.inference.predictor import EcoPackPredictor
+
+CONFIG = str(Path(__file__).parent.parent / "config" / "material_ranking.yaml")
+MATERIALS = Path(__file__).parent.parent / "data" / "final" / "materials_engineered.parquet"
+
+
+def make_inputs(tmp_path, n_products=30):
+    rng = np.random.default_rng(3)
+    products = pd.DataFrame({
+        "product_weight": rng.uniform(0.1, 20, n_products),
+        "fragility_index": rng.integers(0, 10, n_products),
+        "category": rng.choice(["Food", "Home"], n_products),
+        "shipping_type": rng.choice(["Air", "Road", "Sea"], n_products),
+    })
+    products_path = tmp_path / "products.csv"
+    products.to_csv(products_path, index=False)
+    materials_path = tmp_path / "materials.parquet"
+    pd.read_parquet(MATERIALS).head(40).to_parquet(materials_path)
+    return str(products_path), str(materials_path)
+
+
+def test_offline_scoring_writes_and_resumes_partitions(tmp_path):
+    products_path, materials_path = make_inputs(tmp_path)
+    out_dir = tmp_path / "out"
+    logs = []
+    summary = offline_scoring.run(products_path, materials_path, CONFIG, str(out_dir), predict.MODEL_PATHS,
+                                  chunk_size=10, workers=2, log=logs.append)
+    parts = sorted(out_dir.glob("part-*.parquet"))
+    assert [p.name for p in parts] == [f"part-00000{i}.parquet" for i in range(3)]
+    assert summary["products_scored"] == 30 and len(logs) == 3
+
+    result = pd.concat([pd.read_parquet(p) for p in parts], ignore_index=True)
+    assert result["rank"].max() <= 4
+    assert sorted(result["product_id"].unique()) == list(range(30))
+
+    # Same ranking as scoring the products in one process
+    predictor = EcoPackPredictor(*predict.MODEL_PATHS)
+    materials = offline_scoring.load_materials(materials_path)
+    products = next(offline_scoring.iter_product_chunks(products_path, 100))[1]
+    direct = offline_scoring.score_chunk(products, predictor, materials, CONFIG)
+    pd.testing.assert_frame_equal(result, direct)
+
+    parts[1].unlink()
+    resumed = offline_scoring.run(products_path, materials_path, CONFIG, str(out_dir), predict.MODEL_PATHS,
+                                  chunk_size=10, workers=2, log=logs.append)
+    assert resumed["chunks_skipped"] == 2 and resumed["products_scored"] == 10
+    assert parts[1].exists()
+
+
+def test_memory_ceiling_splits_chunks_into_sub_batches():
+    materials = offline_scoring.load_materials(str(MATERIALS))
+    small = offline_scoring.products_per_batch(materials, 16)
+    large = offline_scoring.products_per_batch(materials, 1024)
+    assert 1 <= small < large
+    assert offline_scoring.products_per_batch(materials, None) is None
+
+
+def test_resume_refuses_partitions_of_a_different_run(tmp_path):
+    products_path, materials_path = make_inputs(tmp_path, n_products=10)
+    out_dir = tmp_path / "out"
+    args = (products_path, materials_path, CONFIG, str(out_dir), predict.MODEL_PATHS)
+    offline_scoring.run(*args, chunk_size=5, workers=1, log=lambda _: None)
+    assert (out_dir / offline_scoring.RUN_MANIFEST).exists()
+
+    with pytest.raises(ValueError, match="chunk_size"):
+        offline_scoring.run(*args, chunk_size=4, workers=1, log=lambda _: None)
+
+    # Same path, new contents: partition i no longer covers the same products
+    make_inputs(tmp_path, n_products=12)
+    with pytest.raises(ValueError, match="products"):
+        offline_scoring.run(*args, chunk_size=5, workers=1, log=lambda _: None)
+
+    (out_dir / offline_scoring.RUN_MANIFEST).unlink()
+    with pytest.raises(ValueError, match="without"):
+        offline_scoring.run(*args, chunk_size=5, workers=1, log=lambda _: None)
+
+
+def test_offline_scoring_rejects_global_normalization(tmp_path):
+    products_path, materials_path = make_inputs(tmp_path, n_products=5)
+    config = tmp_path / "global.yaml"
+    config.write_text(Path(CONFIG).read_text().replace("normalization: product", "normalization: global"))
+    with pytest.raises(ValueError, match="per-product"):
+        offline_scoring.run(products_path, materials_path, str(config), str(tmp_path / "out"),
+                            predict.MODEL_PATHS, chunk_size=5, workers=1, log=lambda _: None)
+    assert not (tmp_path / "out").exists()
+
+
+def test_run_manifest_records_the_artifact_dir(tmp_path):
+    products_path, materials_path = make_inputs(tmp_path, n_products=5)
+    manifest = offline_scoring.run_manifest(products_path, materials_path, CONFIG, predict.MODEL_PATHS, 5,
+                                            artifact_dir="fast")
+    assert manifest["artifact_dir"] == os.path.abspath("fast")
+    assert offline_scoring.run_manifest(products_path, materials_path, CONFIG, predict.MODEL_PATHS,
+                                        5)["artifact_dir"] is None
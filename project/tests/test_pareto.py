@@ -0,0 +1,126 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import predict
+from app import app
+from src.recommendation.pareto import pareto_fronts
+from src.recommendation.ranker import pareto_rank_materials
+from test_ranker import CONFIG_DIR, ranked_frame
+
+PRODUCT = {
+    "product_name": "Test Product",
+    "product_weight_kg": 2.0,
+    "category": "Food",
+    "fragility_index": 0.5,
+    "shipping_type": "Road"
+}
+
+
+def brute_force_fronts(points):
+    """Successive fronts by pairwise dominance checks"""
+    fronts = np.zeros(len(points))
+    remaining = set(range(len(points)))
+    front = 1
+    while remaining:
+        first = [i for i in remaining if not any(
+            (points[j] <= points[i]).all() and (points[j] < points[i]).any() for j in remaining
+        )]
+        fronts[first] = front
+        remaining -= set(first)
+        front += 1
+    return fronts
+
+
+@pytest.mark.parametrize("n_objectives", [2, 3])
+def test_fronts_match_pairwise_dominance(n_objectives):
+    rng = np.random.default_rng(n_objectives)
+    for _ in range(100):
+        # Small integer grid, so ties and duplicate rows are common
+        points = rng.integers(0, 6, (rng.integers(1, 50), n_objectives)).astype(float)
+        expected = brute_force_fronts(points)
+        np.testing.assert_array_equal(pareto_fronts(points), expected)
+        np.testing.assert_array_equal(pareto_fronts(points, max_fronts=2),
+                                      np.where(expected <= 2, expected, np.nan))
+
+
+def test_fronts_per_segment_and_nan():
+    rng = np.random.default_rng(7)
+    points = rng.integers(0, 5, (60, 3)).astype(float)
+    points[::9, 1] = np.nan
+    segments = rng.integers(0, 4, 60)
+    fronts = pareto_fronts(points, segments=segments)
+    assert np.isnan(fronts[::9]).all()
+    for s in range(4):
+        rows = np.flatnonzero((segments == s) & ~np.isnan(points).any(axis=1))
+        np.testing.assert_array_equal(fronts[rows], brute_force_fronts(points[rows]))
+    with pytest.raises(ValueError):
+        pareto_fronts(points[:, :1])
+
+
+def test_pareto_rank_materials():
+    df = ranked_frame().sample(frac=1, random_state=4)
+    ranked = pareto_rank_materials(df, str(CONFIG_DIR / "material_ranking.yaml"), fronts=2)
+    assert set(ranked["front"]) == {1.0, 2.0}
+    feasible = df[(df["predicted_cost"] <= 200) & (df["Material_Suitability_Score"] >= 50) &
+                  df["Recyclability_Category"].isin(["A", "B"])]
+    for product_id, group in feasible.groupby("product_id"):
+        points = group[["predicted_cost", "predicted_co2", "Material_Suitability_Score"]].to_numpy(copy=True)
+        points[:, 2] *= -1
+        fronts = pd.Series(brute_force_fronts(points), index=group.index)
+        expected = fronts[fronts <= 2].sort_values(kind="stable")
+        got = ranked[ranked["product_id"] == product_id]
+        pd.testing.assert_index_equal(got.index, expected.index)
+        np.testing.assert_array_equal(got["front"].to_numpy(), expected.to_numpy())
+    assert ranked["product_id"].is_monotonic_increasing
+
+    two = pareto_rank_materials(df, str(CONFIG_DIR / "material_ranking.yaml"),
+                                objectives=["predicted_cost", "predicted_co2"])
+    assert (two["front"] == 1).all()
+    with pytest.raises(ValueError):
+        pareto_rank_materials(df, str(CONFIG_DIR / "material_ranking.yaml"), objectives=["price", "co2"])
+
+
+def test_predict_pareto_option():
+    client = app.test_client()
+    full = client.post("/predict?top_n=1000&exact=1", json=PRODUCT).get_json()["predictions"]
+    response = client.post("/predict", json=dict(PRODUCT, ranking="pareto", fronts=2))
+    assert response.status_code == 200
+    predictions = response.get_json()["predictions"]
+
+    objectives = np.array([[p["predicted_cost"], p["co2"], -p["sustainability_score"]] for p in full])
+    expected = brute_force_fronts(objectives)
+    assert sorted(p["material"] for p in predictions) == sorted(
+        p["material"] for p, front in zip(full, expected) if front <= 2
+    )
+    assert [p["front"] for p in predictions] == sorted(p["front"] for p in predictions)
+
+    query = client.post("/predict?ranking=pareto", json=PRODUCT).get_json()["predictions"]
+    assert query and all(p["front"] == 1 for p in query)
+
+    for body in ({"ranking": "best"}, {"ranking": "pareto", "fronts": 0}):
+        assert client.post("/predict", json=dict(PRODUCT, **body)).status_code == 400
+
+
+def test_predict_pareto_on_ml_branch(monkeypatch, synthetic_models):
+    from src.inference.predictor import EcoPackPredictor
+    from src.inference.registry import PredictorRegistry
+
+    pipeline, rf, xgb, _ = synthetic_models
+    monkeypatch.setattr(predict, "REGISTRY", PredictorRegistry())
+    predict.REGISTRY.register("default", EcoPackPredictor.from_objects(pipeline, rf, xgb))
+    monkeypatch.setattr(predict, "USE_ML_MODELS", True)
+    monkeypatch.setattr(predict, "USE_ADVANCED_RANKING", True)
+    monkeypatch.setattr(predict, "ranking_config", {"weights": {"cost": 0.3, "co2": 0.4, "suitability": 0.3},
+                                                    "top_n": 2})
+    client = app.test_client()
+    full = client.post("/predict?top_n=1000", json=PRODUCT).get_json()["predictions"]
+    predictions = client.post("/predict", json=dict(PRODUCT, ranking="pareto")).get_json()["predictions"]
+    objectives = np.array([[p["predicted_cost"], p["co2"], -p["sustainability_score"]] for p in full])
+    expected = [p["material"] for p, front in zip(full, brute_force_fronts(objectives)) if front == 1]
+    # Every material enters the front, not just the configured top 2
+    assert [p["material"] for p in predictions] == expected
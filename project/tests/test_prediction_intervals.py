@@ -0,0 +1,73 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import numpy as np
+import pytest
+
+import predict
+from app import app
+from src.inference.predictor import COMPILED_MAX_ROWS, EcoPackPredictor
+from src.inference.registry import PredictorRegistry
+
+PRODUCT = {"product_name": "Mug", "product_weight_kg": 0.45, "category": "Food",
+           "fragility_index": 0.8, "shipping_type": "Air"}
+
+
+def per_tree(rf, X):
+    return np.stack([tree.predict(X) for tree in rf.estimators_], axis=1)
+
+
+@pytest.mark.parametrize("rows", [3, COMPILED_MAX_ROWS + 50])
+def test_spread_matches_per_tree_loop(synthetic_models, rows):
+    pipeline, rf, xgb, frame = synthetic_models
+    predictor = EcoPackPredictor.from_objects(pipeline, rf, xgb)
+    X = pipeline.transform(frame.head(rows))
+    trees = per_tree(rf, X)
+    assert np.array_equal(predictor.cost_spread(X, "std")["std"], trees.std(axis=1))
+    spread = predictor.cost_spread(X, [0.1, 0.9])
+    assert np.array_equal(spread[0.1], np.quantile(trees, 0.1, axis=1))
+    assert np.array_equal(spread[0.9], np.quantile(trees, 0.9, axis=1))
+
+
+def test_predict_adds_spread(synthetic_models):
+    pipeline, rf, xgb, frame = synthetic_models
+    predictor = EcoPackPredictor.from_objects(pipeline, rf, xgb)
+    plain = predictor.predict(frame.head(5))
+    with_std = predictor.predict(frame.head(5), uncertainty="std")
+    assert with_std["predicted_cost"] == plain["predicted_cost"]
+    assert len(with_std["predicted_cost_std"]) == 5
+    quantiles = predictor.predict(frame.head(5), uncertainty=(0.05, 0.95))["predicted_cost_quantiles"]
+    assert set(quantiles) == {"0.05", "0.95"}
+    with pytest.raises(ValueError):
+        predictor.predict(frame.head(5), uncertainty=[1.5])
+
+
+def test_non_forest_cost_model_is_rejected(synthetic_models):
+    pipeline, _, xgb, frame = synthetic_models
+    predictor = EcoPackPredictor.from_objects(pipeline, xgb, xgb)
+    with pytest.raises(ValueError):
+        predictor.predict(frame.head(2), uncertainty="std")
+
+
+def test_predict_endpoint_uncertainty(monkeypatch, synthetic_models):
+    client = app.test_client()
+    assert client.post("/predict", json=dict(PRODUCT, uncertainty="std")).status_code == 400
+
+    pipeline, rf, xgb, _ = synthetic_models
+    monkeypatch.setattr(predict, "REGISTRY", PredictorRegistry())
+    predict.REGISTRY.register("default", EcoPackPredictor.from_objects(pipeline, rf, xgb))
+    monkeypatch.setattr(predict, "USE_ML_MODELS", True)
+    monkeypatch.setattr(predict, "USE_ADVANCED_RANKING", True)
+    monkeypatch.setattr(predict, "ranking_config", {"weights": {"cost": 0.3, "co2": 0.4, "suitability": 0.3}})
+
+    plain = client.post("/predict", json=PRODUCT).get_json()["predictions"]
+    response = client.post("/predict?uncertainty=0.1,0.9", json=PRODUCT)
+    assert response.status_code == 200
+    ranged = response.get_json()["predictions"]
+    for a, b in zip(plain, ranged):
+        assert b.pop("predicted_cost_quantiles").keys() == {"0.1", "0.9"}
+        assert a == b
+    std = client.post("/predict", json=dict(PRODUCT, uncertainty="std")).get_json()["predictions"]
+    assert all(p["predicted_cost_std"] >= 0 for p in std)
+    assert client.post("/predict", json=dict(PRODUCT, uncertainty=["x"])).status_code == 400
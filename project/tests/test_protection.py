@@ -0,0 +1,30 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app import app
+from protection import protection
+from protection.protection import _STATE
+
+
+def test_requests_read_cached_verification(monkeypatch):
+    calls = []
+    monkeypatch.setattr(protection._P, "verify", lambda *a, **k: calls.append(1) or True)
+    client = app.test_client()
+    for _ in range(5):
+        assert client.get("/health").status_code == 200
+    assert calls == []
+
+
+def test_refresh_records_result_and_cost(monkeypatch):
+    checks = _STATE.checks
+    monkeypatch.setattr(protection._P, "verify", lambda *a, **k: False)
+    assert _STATE.refresh() is False
+    stats = app.test_client().get("/protection/stats").get_json()
+    assert stats["valid"] is False
+    assert stats["checks"] == checks + 1
+    assert stats["last_duration_ms"] >= 0
+
+    monkeypatch.setattr(protection._P, "verify", lambda *a, **k: True)
+    assert _STATE.refresh() is True
+    assert _STATE.stats()["valid"] is True
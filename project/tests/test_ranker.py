@@ -0,0 +1,203 @@
+import os
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+import predict  # noqa: F401  (puts the project root on sys.path)
+from src.recommendation import ranking_config
+from src.recommendation.ranker import rank_materials
+from src.recommendation.ranking_config import RankingConfig, load_ranking_config
+
+CONFIG_DIR = Path(__file__).parent.parent / "config"
+
+
+def ranked_frame(n_products=20, n_materials=15, seed=0):
+    rng = np.random.default_rng(seed)
+    n = n_products * n_materials
+    return pd.DataFrame({
+        "product_id": np.repeat(np.arange(n_products), n_materials),
+        "Material ID": np.tile([f"MAT_{m:04d}" for m in range(n_materials)], n_products),
+        "predicted_cost": rng.uniform(0, 250, n).round(1),
+        "predicted_co2": rng.uniform(0, 30, n).round(1),
+        "Material_Suitability_Score": rng.uniform(20, 100, n).round(0),
+        "Recyclability_Category": rng.choice(list("ABCD"), n),
+        "Recyclability (%)": rng.uniform(0, 100, n).round(0),
+    })
+
+
+def original_rank_materials(df, cfg):
+    """rank_materials before the config loader (ranker schema only)"""
+    w = cfg["weights"]
+    c = cfg["constraints"]
+
+    def min_max(series, reverse=False):
+        norm = (series - series.min()) / (series.max() - series.min())
+        return 1 - norm if reverse else norm
+
+    df = df.copy()
+    df["cost_norm"] = min_max(df["predicted_cost"], reverse=True)
+    df["co2_norm"] = min_max(df["predicted_co2"], reverse=True)
+    df["suit_norm"] = min_max(df["Material_Suitability_Score"])
+    df["ranking_score"] = (w["cost"] * df["cost_norm"] + w["co2"] * df["co2_norm"] +
+                           w["suitability"] * df["suit_norm"])
+    recy_map = {"A": 4, "B": 3, "C": 2, "D": 1}
+    df = df[
+        (df["predicted_cost"] <= c["max_cost"]) &
+        (df["Material_Suitability_Score"] >= c["min_suitability"]) &
+        (df["Recyclability_Category"].map(recy_map) >= recy_map[c["min_recyclability"]])
+    ].copy()
+    df["rank"] = df.groupby("product_id")["ranking_score"].rank(ascending=False, method="dense")
+    return df[df["rank"] <= cfg["top_n"]].sort_values(["product_id", "rank"])
+
+
+def per_product_reference(df, cfg):
+    """Per-product min-max scaling with pandas groupby, then the original filters and rank"""
+    df = df.copy()
+    groups = df.groupby("product_id")
+
+    def min_max(column, reverse=False):
+        low, high = groups[column].transform("min"), groups[column].transform("max")
+        norm = (df[column] - low) / (high - low)
+        norm = 1 - norm if reverse else norm
+        # A product whose values are all equal is neutral on that metric
+        return norm.mask(high == low, 1.0)
+
+    w = cfg["weights"]
+    score = (w["cost"] * min_max("predicted_cost", True) + w["co2"] * min_max("predicted_co2", True) +
+             w["suitability"] * min_max("Material_Suitability_Score"))
+    return score
+
+
+@pytest.mark.parametrize("shuffle", [False, True])
+def test_global_normalization_matches_original_ranker(shuffle):
+    path = CONFIG_DIR / "material_ranking.yaml"
+    df = ranked_frame()
+    if shuffle:
+        df = df.sample(frac=1, random_state=1)
+    expected = original_rank_materials(df, yaml.safe_load(path.read_text()))
+    pd.testing.assert_frame_equal(rank_materials(df, str(path), normalize="global"), expected)
+    pd.testing.assert_frame_equal(rank_materials(df, load_ranking_config(path), normalize="global"), expected)
+
+
+def test_per_product_normalization():
+    path = CONFIG_DIR / "material_ranking.yaml"
+    cfg = yaml.safe_load(path.read_text())
+    df = ranked_frame().sample(frac=1, random_state=2)
+    # Ties inside a product share a dense rank
+    df.loc[df.index[:40], "predicted_cost"] = 10.0
+    ranked = rank_materials(df, str(path))
+    score = per_product_reference(df, cfg)
+    np.testing.assert_array_equal(ranked["ranking_score"].to_numpy(), score.loc[ranked.index].to_numpy())
+
+    expected = df.assign(ranking_score=score)
+    grades = expected["Recyclability_Category"].map({"A": 4, "B": 3, "C": 2, "D": 1})
+    expected = expected[(expected["predicted_cost"] <= 200) & (expected["Material_Suitability_Score"] >= 50) &
+                        (grades >= 3)].copy()
+    expected["rank"] = expected.groupby("product_id")["ranking_score"].rank(ascending=False, method="dense")
+    expected = expected[expected["rank"] <= cfg["top_n"]].sort_values(["product_id", "rank"])
+    pd.testing.assert_index_equal(ranked.index, expected.index)
+    np.testing.assert_array_equal(ranked["rank"].to_numpy(), expected["rank"].to_numpy())
+
+
+def test_empty_and_constant_frames():
+    path = CONFIG_DIR / "material_ranking.yaml"
+    assert rank_materials(ranked_frame().head(0), str(path)).empty
+
+
+def test_single_candidate_and_tied_products_are_ranked():
+    config = RankingConfig.from_dict({"weights": {"cost": 0.3, "co2": 0.4, "suitability": 0.3}, "top_n": 3,
+                                      "normalization": "product"})
+    df = ranked_frame(n_products=3, n_materials=4)
+    # Product 0 has one candidate, product 1 ties on CO2 across its materials
+    df = df[(df["product_id"] != 0) | (df["Material ID"] == "MAT_0000")].copy()
+    df.loc[df["product_id"] == 1, "predicted_co2"] = 5.0
+
+    ranked = rank_materials(df, config)
+    single = ranked[ranked["product_id"] == 0]
+    assert len(single) == 1 and single["rank"].tolist() == [1.0]
+    assert single[["cost_norm", "co2_norm", "suit_norm"]].values.tolist() == [[1.0, 1.0, 1.0]]
+    assert single["ranking_score"].iloc[0] == pytest.approx(1.0)
+
+    tied = ranked[ranked["product_id"] == 1]
+    assert len(tied) == 3 and (tied["co2_norm"] == 1.0).all()
+    # CO2 adds the same 0.4 to every row; cost and suitability decide the order
+    score = per_product_reference(df, {"weights": dict(config.weights)})
+    np.testing.assert_array_equal(ranked["ranking_score"].to_numpy(), score.loc[ranked.index].to_numpy())
+
+    # Global normalization of a frame with a constant column: neutral, not dropped
+    constant = ranked_frame(n_products=2, n_materials=3).assign(predicted_co2=2.0)
+    ranked = rank_materials(constant, config, normalize="global")
+    assert len(ranked) == 6 and (ranked["co2_norm"] == 1.0).all()
+
+
+def test_api_schema_is_accepted():
+    config = load_ranking_config(CONFIG_DIR / "ranking_weights.yaml")
+    assert dict(config.weights) == {"cost": 0.2, "co2": 0.3, "suitability": 0.5}
+    assert config.max_co2 == 20 and config.min_recyclability_percent == 50
+    ranked = rank_materials(ranked_frame(), config)
+    assert (ranked["predicted_co2"] <= 20).all() and (ranked["Recyclability (%)"] >= 50).all()
+    assert (ranked["rank"] <= 4).all()
+
+
+def test_config_is_immutable():
+    config = load_ranking_config(CONFIG_DIR / "material_ranking.yaml")
+    with pytest.raises(AttributeError):
+        config.top_n = 10
+    with pytest.raises(TypeError):
+        config.weights["cost"] = 1.0
+    with pytest.raises(ValueError):
+        config.weight_vector[0] = 1.0
+
+
+def test_config_is_parsed_once_per_mtime(tmp_path, monkeypatch):
+    path = tmp_path / "ranking.yaml"
+    path.write_text(yaml.safe_dump({"weights": {"cost": 0.3, "co2": 0.4, "suitability": 0.3}, "top_n": 3}))
+    parses = []
+    real_load = yaml.safe_load
+    monkeypatch.setattr(ranking_config.yaml, "safe_load", lambda f: parses.append(1) or real_load(f))
+
+    first = load_ranking_config(path)
+    assert load_ranking_config(str(path)) is first and len(parses) == 1
+
+    path.write_text(yaml.safe_dump({"weights": {"cost": 0.3, "co2": 0.4, "suitability": 0.3}, "top_n": 5}))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, first.mtime + 1_000_000))
+    assert load_ranking_config(path).top_n == 5 and len(parses) == 2
+
+
+@pytest.mark.parametrize("cfg", [
+    {"weights": {"cost": 0.5, "co2": 0.5}},
+    {"weights": {"cost": 0.5, "co2": 0.5, "suitability": 0.1, "price": 1}},
+    {"weights": {"cost": -1, "co2": 0.5, "suitability": 0.1}},
+    {"weights": {"cost": 0, "co2": 0, "suitability": 0}},
+    {"weights": {"cost": 1, "co2": 1, "suitability": 1}, "constraints": {"min_recyclability": "Z"}},
+    {"weights": {"cost": 1, "co2": 1, "suitability": 1}, "top_n": 0},
+    {"weights": {"cost": 1, "co2": 1, "co2_impact": 1, "suitability": 1}},
+])
+def test_invalid_configs_are_rejected(cfg):
+    with pytest.raises(ValueError):
+        RankingConfig.from_dict(cfg)
+
+
+@pytest.mark.parametrize("sizes", [[5] * 30, [1, 7, 3, 40, 2, 9] * 5, [200, 1, 1, 1]])
+def test_segment_dense_rank_matches_pandas(sizes):
+    from src.recommendation.segment_rank import dense_rank_desc, sort_segments
+
+    rng = np.random.default_rng(len(sizes))
+    keys = rng.permutation(np.repeat(np.arange(len(sizes)), sizes))
+    scores = rng.integers(0, 6, len(keys)).astype(float)
+    scores[rng.random(len(keys)) < 0.1] = np.nan
+    order, starts, ids = sort_segments(keys)
+    ranks = np.empty(len(keys))
+    ranks[order] = dense_rank_desc(scores[order], ids, starts)
+    expected = pd.Series(scores).groupby(keys).rank(ascending=False, method="dense").to_numpy()
+    np.testing.assert_array_equal(ranks, expected)
+    # Lexsort path (no segment starts) agrees with the padded one
+    fallback = np.empty(len(keys))
+    fallback[order] = dense_rank_desc(scores[order], ids)
+    np.testing.assert_array_equal(fallback, expected)
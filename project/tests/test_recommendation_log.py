@@ -0,0 +1,243 @@
+import sys
+import threading
+import time
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import pytest
+import sqlalchemy as sa
+from flask import Flask
+
+import predict
+from recommendation_log import RecommendationLogWriter, SQLAlchemyLogSink
+
+PRODUCT = {
+    "product_name": "Test Product",
+    "product_weight_kg": 2.0,
+    "category": "Food",
+    "fragility_index": 0.5,
+    "shipping_type": "Road"
+}
+
+
+def predictions(n, material="PLA"):
+    return [{"material": material, "predicted_cost": 10.0 + i, "co2": 1.5, "rank": i + 1} for i in range(n)]
+
+
+class ListSink:
+    """Collects written batches; `gate` (when set) holds writes until released."""
+
+    def __init__(self, failures=0):
+        self.batches = []
+        self.failures = failures
+        self.gate = None
+
+    def __call__(self, rows):
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database unavailable")
+        self.batches.append(rows)
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_flushes_on_size_and_on_time():
+    sink = ListSink()
+    writer = RecommendationLogWriter(sink, batch_rows=6, flush_interval=60)
+    writer.log(7, predictions(4))
+    time.sleep(0.05)
+    assert sink.batches == [] and writer.stats()["queued_rows"] == 4
+    writer.log(None, predictions(2))
+    wait_for(lambda: writer.written_rows == 6)
+    assert len(sink.batches) == 1
+    product_id, material, cost, co2, rank, created_at = sink.batches[0][0]
+    assert (product_id, material, cost, co2, rank) == (7, "PLA", 10.0, 1.5, 1)
+    assert sink.batches[0][4][0] is None
+    writer.close()
+
+    sink = ListSink()
+    writer = RecommendationLogWriter(sink, batch_rows=1000, flush_interval=0.05)
+    writer.log(1, predictions(3))
+    wait_for(lambda: writer.written_rows == 3)
+    stats = writer.stats()
+    assert stats["batches"] == 1 and stats["queued_rows"] == 0 and stats["last_flush_lag_ms"] >= 50
+    writer.close()
+
+
+def test_drop_policy_bounds_the_queue():
+    sink = ListSink()
+    sink.gate = threading.Event()
+    writer = RecommendationLogWriter(sink, max_queue_rows=10, batch_rows=4, flush_interval=0)
+    assert writer.log(1, predictions(4))
+    wait_for(lambda: not writer._queue)
+    accepted = [writer.log(1, predictions(3)) for _ in range(4)]
+    assert accepted == [True, True, False, False]
+    stats = writer.stats()
+    assert stats["queued_rows"] == 10 and stats["dropped_rows"] == 6 and stats["lag_ms"] > 0
+    sink.gate.set()
+    assert writer.flush(timeout=5)
+    assert writer.written_rows == 10 and sum(len(b) for b in sink.batches) == 10
+    writer.close()
+
+
+def test_block_policy_waits_for_room():
+    sink = ListSink()
+    sink.gate = threading.Event()
+    writer = RecommendationLogWriter(sink, max_queue_rows=4, batch_rows=4, flush_interval=0,
+                                     policy="block", block_timeout=2)
+    writer.log(1, predictions(4))
+    threading.Timer(0.1, sink.gate.set).start()
+    started = time.monotonic()
+    assert writer.log(1, predictions(4))
+    assert time.monotonic() - started >= 0.05
+    assert writer.flush(timeout=5) and writer.dropped_rows == 0 and writer.written_rows == 8
+
+    sink.gate.clear()
+    writer.block_timeout = 0.05
+    writer.log(1, predictions(4))
+    # Rows being written still count against the bound; the wait times out
+    wait_for(lambda: not writer._queue)
+    assert not writer.log(1, predictions(1)) and writer.dropped_rows == 1
+    sink.gate.set()
+    writer.close()
+    with pytest.raises(ValueError):
+        RecommendationLogWriter(sink, policy="newest")
+
+
+def test_failed_writes_are_retried_then_dropped():
+    sink = ListSink(failures=2)
+    writer = RecommendationLogWriter(sink, batch_rows=2, flush_interval=0.01, max_retries=3)
+    writer.log(1, predictions(2))
+    assert writer.flush(timeout=5)
+    assert writer.written_rows == 2 and writer.write_errors == 2 and writer.failed_rows == 0
+
+    sink.failures = 10
+    writer.log(1, predictions(3))
+    assert writer.flush(timeout=5)
+    stats = writer.stats()
+    assert stats["failed_rows"] == 3 and stats["write_errors"] == 6 and stats["queued_rows"] == 0
+    writer.close()
+
+
+def test_close_writes_queued_rows():
+    sink = ListSink()
+    writer = RecommendationLogWriter(sink, batch_rows=100, flush_interval=60)
+    for product_id in range(5):
+        writer.log(product_id, predictions(3))
+    writer.close()
+    assert sum(len(b) for b in sink.batches) == 15
+    assert not writer.log(9, predictions(1)) and writer.dropped_rows == 1
+
+
+def test_sqlalchemy_sink_bulk_inserts(tmp_path):
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'logs.db'}")
+    sink = SQLAlchemyLogSink(engine)
+    with engine.begin() as connection:
+        connection.execute(sa.text("INSERT INTO materials (material_id, material_type) VALUES (3, 'PLA')"))
+        connection.execute(sa.text("INSERT INTO products (product_id) VALUES (11)"))
+
+    writer = RecommendationLogWriter(sink, batch_rows=50, flush_interval=0.01)
+    writer.log(11, predictions(2))
+    writer.log(None, predictions(1, material="Kraft Paper"))
+    assert writer.flush(timeout=5)
+    writer.close()
+    with engine.connect() as connection:
+        rows = connection.execute(sa.text(
+            "SELECT product_id, recommended_material_id, cost_prediction, co2_prediction, material_rank, "
+            "created_at FROM recommendation_logs ORDER BY rec_id"
+        )).all()
+    assert [tuple(r[:5]) for r in rows] == [(11, 3, 10.0, 1.5, 1), (11, 3, 11.0, 1.5, 2), (None, None, 10.0, 1.5, 1)]
+    assert all(r[5] is not None for r in rows)
+
+
+def foreign_key_engine(path):
+    engine = sa.create_engine(f"sqlite:///{path}")
+
+    @sa.event.listens_for(engine, "connect")
+    def enforce_foreign_keys(dbapi_connection, _):
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    return engine
+
+
+def test_sqlalchemy_sink_logs_heuristic_rankings_with_foreign_keys(tmp_path):
+    engine = foreign_key_engine(tmp_path / "logs.db")
+    sink = SQLAlchemyLogSink(engine)
+    writer = RecommendationLogWriter(sink, batch_rows=1000, flush_interval=60, max_retries=0)
+    flask_app = Flask(__name__)
+    predict.register_prediction_routes(flask_app, None, writer)
+    client = flask_app.test_client()
+
+    served = client.post("/predict?exact=1", json=PRODUCT).get_json()["predictions"]
+    with engine.begin() as connection:
+        connection.execute(sa.text("INSERT INTO products (product_id) VALUES (42)"))
+        connection.execute(sa.text("INSERT INTO materials (material_id, material_type) VALUES (7, :name)"),
+                           {"name": served[0]["material"]})
+    # One batch: a known product, an unknown one and none at all
+    for product_id in (42, 999, None):
+        body = dict(PRODUCT) if product_id is None else dict(PRODUCT, product_id=product_id)
+        assert client.post("/predict?exact=1", json=body).status_code == 200
+    assert writer.flush(timeout=5)
+    writer.close()
+    assert writer.failed_rows == 0 and writer.write_errors == 0
+
+    with engine.connect() as connection:
+        rows = connection.execute(sa.text(
+            "SELECT product_id, recommended_material, recommended_material_id, material_rank "
+            "FROM recommendation_logs ORDER BY rec_id"
+        )).all()
+    n = len(served)
+    assert len(rows) == 4 * n
+    # Heuristic catalog names are kept even when no materials row matches them
+    assert [r[1] for r in rows] == [p["material"] for p in served] * 4
+    assert all(r[2] == (7 if r[1] == served[0]["material"] else None) for r in rows)
+    assert [r[0] for r in rows] == [None] * n + [42] * n + [None] * (2 * n)
+
+
+def test_sqlalchemy_sink_adds_the_material_name_column(tmp_path):
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'logs.db'}")
+    with engine.begin() as connection:
+        # recommendation_logs as created by an older schema.sql
+        connection.execute(sa.text(
+            "CREATE TABLE recommendation_logs (rec_id INTEGER PRIMARY KEY, product_id INT, "
+            "recommended_material_id INT, cost_prediction FLOAT, co2_prediction FLOAT, "
+            "material_rank INT, created_at TIMESTAMP)"
+        ))
+    sink = SQLAlchemyLogSink(engine)
+    sink([(None, "Kraft Paper", 1.0, 2.0, 1, None)])
+    SQLAlchemyLogSink(engine)
+    with engine.connect() as connection:
+        assert connection.execute(sa.text("SELECT recommended_material FROM recommendation_logs")).all() == [
+            ("Kraft Paper",)
+        ]
+
+
+def test_predict_routes_log_served_rankings():
+    sink = ListSink()
+    writer = RecommendationLogWriter(sink, batch_rows=1000, flush_interval=60)
+    flask_app = Flask(__name__)
+    predict.register_prediction_routes(flask_app, None, writer)
+    client = flask_app.test_client()
+
+    served = client.post("/predict", json=dict(PRODUCT, product_id=42)).get_json()["predictions"]
+    streamed = client.post("/predict?stream=1&exact=1", json=PRODUCT).get_data(as_text=True)
+    batch = client.post("/predict/batch", json=[dict(PRODUCT, product_id=5), {"product_name": "bad"}])
+    assert batch.status_code == 200
+    assert writer.flush(timeout=5)
+
+    rows = [row for rows in sink.batches for row in rows]
+    n_streamed = len(streamed.strip().splitlines())
+    assert len(rows) == len(served) * 2 + n_streamed
+    assert [r[:5] for r in rows[:len(served)]] == [
+        (42, p["material"], p["predicted_cost"], p["co2"], p["rank"]) for p in served
+    ]
+    assert {r[0] for r in rows[len(served):len(served) + n_streamed]} == {None}
+    assert {r[0] for r in rows[-len(served):]} == {5}
+    writer.close()
@@ -0,0 +1,68 @@
+import sys
+import threading
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import joblib
+import pytest
+
+import predict
+from app import app
+from src.inference.predictor import EcoPackPredictor
+from src.inference.registry import PredictorRegistry
+
+
+@pytest.fixture
+def artifact_paths(tmp_path, synthetic_models):
+    pipeline, rf, xgb, _ = synthetic_models
+    paths = []
+    for name, obj in [("pipeline.pkl", pipeline), ("rf.joblib", rf), ("xgb.joblib", xgb)]:
+        joblib.dump(obj, tmp_path / name)
+        paths.append(str(tmp_path / name))
+    return paths
+
+
+def test_predictor_loads_lazily_and_once(artifact_paths, monkeypatch, synthetic_models):
+    loads = []
+    real_load = joblib.load
+    monkeypatch.setattr(joblib, "load", lambda *a, **k: loads.append(a[0]) or real_load(*a, **k))
+
+    predictor = EcoPackPredictor(*artifact_paths, mmap_mode="r")
+    assert not predictor.loaded and loads == []
+
+    threads = [threading.Thread(target=predictor.load) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(loads) == 3
+
+    frame = synthetic_models[3].head(5)
+    cost, co2 = predictor.predict_arrays(frame)
+    pipeline, rf, xgb, _ = synthetic_models
+    X = pipeline.transform(frame)
+    assert cost.tolist() == rf.predict(X).tolist()
+    assert co2.tolist() == xgb.predict(X).tolist()
+
+
+def test_registry_warm_up_marks_ready(artifact_paths, synthetic_models):
+    registry = PredictorRegistry()
+    registry.register("default", EcoPackPredictor(*artifact_paths),
+                      warmup=lambda: synthetic_models[3].head(16))
+    assert not registry.is_ready()
+    assert registry.warm_up() is True
+    status = registry.status()["default"]
+    assert status["loaded"] and status["ready"]
+    assert status["warmup_seconds"] is not None
+
+
+def test_ready_endpoint_reports_warm_up_state(monkeypatch):
+    client = app.test_client()
+    assert client.get("/ready").status_code == 200
+
+    monkeypatch.setattr(predict, "USE_ML_MODELS", True)
+    monkeypatch.setattr(predict, "REGISTRY", PredictorRegistry())
+    predict.REGISTRY.register("default", EcoPackPredictor("missing", "missing", "missing"))
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.get_json()["status"] == "WARMING_UP"
@@ -0,0 +1,128 @@
+import sys
+import itertools
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import numpy as np
+
+import predict
+from scoring import MaterialCatalog, evaluate, score_materials, round_half_even
+
+
+def sustainability_score(biodegradability, recyclability, is_renewable):
+    """Original 40/40/20 split, spelled out rather than read from the formulas file"""
+    renewability_score = 80 if is_renewable else 20
+    score = biodegradability * 0.40 + recyclability * 0.40 + renewability_score * 0.20
+    return round(max(0, min(100, score)), 2)
+
+
+def co2_performance_score(co2_emissions, max_co2=50):
+    return round(max(0, min(100, 100 - (co2_emissions / max_co2 * 100))), 2)
+
+
+def final_ranking_score(sustainability, co2_performance, alpha=0.6, beta=0.4):
+    return round(max(0, min(100, (alpha * sustainability) + (beta * co2_performance))), 2)
+
+
+def reference_ranking(materials_data, data):
+    """Original per-material loop from the /predict heuristic branch"""
+    required_protection = 6 if data["fragility_index"] > 0.7 else (4 if data["fragility_index"] > 0.4 else 2)
+    feasible = [
+        mat for mat in materials_data
+        if data["product_weight_kg"] <= mat["max_weight"]
+        and mat["fragility_protection"] >= required_protection
+        and mat["shipping_suitability"].get(data["shipping_type"], 0) >= 0.7
+    ] or materials_data
+
+    predictions = []
+    for mat in feasible:
+        weight_factor = 1 + (data["product_weight_kg"] / mat["max_weight"]) * 0.5
+        fragility_factor = 1 + (data["fragility_index"] * mat["strength_factor"])
+        required_thickness = 1.0 * weight_factor * fragility_factor
+        multiplier = {"Air": 3.5, "Road": 1.5, "Sea": 0.8}.get(data["shipping_type"], 1.5)
+        co2_emissions = mat["base_co2_per_kg"] * data["product_weight_kg"] * required_thickness * multiplier
+        cost = 45 * data["product_weight_kg"] * required_thickness * (1 / mat["strength_factor"])
+        modifier = mat["category_bonus"].get(data["category"], 1.0)
+        sustainability = sustainability_score(
+            min(100, mat["biodegradability"] * modifier),
+            min(100, mat["recyclability"] * modifier),
+            mat["is_renewable"]
+        )
+        co2_performance = co2_performance_score(co2_emissions, max_co2=50)
+        predictions.append({
+            "rank": 0,
+            "material": mat["name"],
+            "predicted_cost": round(cost, 2),
+            "co2": round(co2_emissions, 2),
+            "sustainability_score": final_ranking_score(sustainability, co2_performance),
+            "biodegradability": mat["biodegradability"],
+            "recyclability": mat["recyclability"],
+            "co2_performance": co2_performance
+        })
+    predictions.sort(key=lambda x: x["sustainability_score"], reverse=True)
+    for idx, pred in enumerate(predictions, 1):
+        pred["rank"] = idx
+    return predictions
+
+
+def test_round_half_even_matches_builtin():
+    rng = np.random.default_rng(0)
+    values = np.concatenate([
+        rng.uniform(-1000, 1000, 5000),
+        np.array([0.125, 0.375, 2.675, 1.005, 0.285, 100.0, 0.0, 12.345])
+    ])
+    expected = [round(float(v), 2) for v in values]
+    assert round_half_even(values).tolist() == expected
+
+
+def test_vectorized_ranking_matches_reference():
+    weights = [0.05, 0.5, 1, 2.0, 3.3, 5.9, 6, 7.25, 9.99, 12, 15, 20]
+    fragilities = [0, 0.1, 0.4, 0.41, 0.55, 0.7, 0.71, 0.9, 1]
+    catalog = predict.CATALOG.snapshot.heuristic
+    for weight, fragility, category, shipping in itertools.product(
+            weights, fragilities, predict.VALID_CATEGORIES, predict.VALID_SHIPPING):
+        data = {
+            "product_weight_kg": weight,
+            "fragility_index": fragility,
+            "category": category,
+            "shipping_type": shipping
+        }
+        expected = reference_ranking(list(catalog.records), data)
+        actual = score_materials(catalog, weight, fragility, category, shipping)
+        assert actual == expected, data
+
+
+def test_catalog_arrays_are_read_only():
+    records = predict.CATALOG.snapshot.heuristic.records
+    catalog = MaterialCatalog(records, predict.VALID_CATEGORIES, predict.VALID_SHIPPING)
+    assert len(catalog) == len(records)
+    assert catalog.shipping_suitability.shape == (len(catalog), len(predict.VALID_SHIPPING))
+    assert not catalog.max_weight.flags.writeable
+
+
+def test_top_n_selection_matches_full_sort():
+    catalog = predict.CATALOG.snapshot.heuristic
+    for weight, shipping in itertools.product([0.3, 2.0, 5.0], predict.VALID_SHIPPING):
+        full = score_materials(catalog, weight, 0.3, "Cosmetics", shipping)
+        for top_n in range(1, len(full) + 2):
+            assert score_materials(catalog, weight, 0.3, "Cosmetics", shipping, top_n=top_n) == full[:top_n]
+
+
+def test_constraints_prefilter_candidates():
+    catalog = predict.CATALOG.snapshot.heuristic
+    unconstrained = score_materials(catalog, 4.0, 0.5, "Food", "Air")
+    constraints = {"max_cost": 400, "max_co2": 30, "min_recyclability": 85}
+    constrained = score_materials(catalog, 4.0, 0.5, "Food", "Air", constraints)
+
+    expected = [p for p in unconstrained
+                if p["predicted_cost"] <= 400 and p["co2"] <= 30 and p["recyclability"] >= 85]
+    assert [p["material"] for p in constrained] == [p["material"] for p in expected]
+    assert [p["rank"] for p in constrained] == list(range(1, len(expected) + 1))
+
+
+def test_unsatisfiable_constraints_fall_back_to_feasible_set():
+    catalog = predict.CATALOG.snapshot.heuristic
+    scores = evaluate(catalog, [2.0], [0.5], ["Food"], ["Road"], {"max_cost": 0})
+    assert scores.constraints_relaxed.tolist() == [True]
+    assert score_materials(catalog, 2.0, 0.5, "Food", "Road", {"max_cost": 0}) == \
+        score_materials(catalog, 2.0, 0.5, "Food", "Road")
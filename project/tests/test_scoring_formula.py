@@ -0,0 +1,130 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import numpy as np
+import pytest
+import yaml
+
+import predict
+from src.recommendation.ranker import rank_materials
+from src.recommendation.scoring_formula import ScoringFormulas, load_scoring_formulas
+from test_ranker import CONFIG_DIR, ranked_frame
+
+
+def test_default_formulas_match_hand_written_arithmetic():
+    rng = np.random.default_rng(0)
+    bio, recy, co2 = rng.random(500) * 100, rng.random(500) * 100, rng.random(500) * 80
+    renewable = rng.random(500) < 0.5
+    formulas = load_scoring_formulas()
+
+    sustainability = formulas["sustainability"](
+        {"biodegradability": bio, "recyclability": recy, "is_renewable": renewable}
+    )
+    expected = [round(max(0, min(100, b * 0.40 + r * 0.40 + (80 if n else 20) * 0.20)), 2)
+                for b, r, n in zip(bio, recy, renewable)]
+    np.testing.assert_array_equal(sustainability, expected)
+
+    performance = formulas["co2_performance"]({"co2_emissions": co2})
+    np.testing.assert_array_equal(performance, [round(max(0, min(100, 100 - (c / 50 * 100))), 2) for c in co2])
+    np.testing.assert_array_equal(
+        formulas["final_score"]({"sustainability": sustainability, "co2_performance": performance}),
+        [round(max(0, min(100, 0.6 * s + 0.4 * p)), 2) for s, p in zip(sustainability, performance)]
+    )
+    # Dependencies are evaluated when their value is not passed in
+    np.testing.assert_array_equal(
+        formulas["final_score"]({"biodegradability": bio, "recyclability": recy,
+                                 "is_renewable": renewable, "co2_emissions": co2}),
+        formulas["final_score"]({"sustainability": sustainability, "co2_performance": performance})
+    )
+
+    cost, strength = rng.random(500) * 150, rng.random(500) * 40
+    w = {"cost": 0.3, "co2": 0.4, "suitability": 0.3}
+    expected = (w["cost"] * np.maximum(0, 1 - (cost / 100)) + w["co2"] * np.maximum(0, 1 - (co2 / 50)) +
+                w["suitability"] * np.maximum(0, strength / 30)) * 100
+    inputs = {"predicted_cost": cost, "predicted_co2": co2, "strength_mpa": strength}
+    np.testing.assert_array_equal(formulas["model_ranking_score"](inputs, w), expected)
+    # The API schema names resolve to the same weights
+    np.testing.assert_array_equal(
+        formulas["model_ranking_score"](inputs, {"cost": 0.3, "co2_impact": 0.4, "sustainability": 0.3}),
+        expected
+    )
+
+
+def test_scalar_helpers_use_the_formulas():
+    assert predict.calculate_sustainability_score(90, 85, True) == round(90 * 0.4 + 85 * 0.4 + 16, 2)
+    assert predict.calculate_sustainability_score(90, 85, False) == round(90 * 0.4 + 85 * 0.4 + 4, 2)
+    assert predict.calculate_co2_performance_score(30) == 40.0
+    assert predict.calculate_co2_performance_score(30, max_co2=60) == 50.0
+    assert predict.calculate_co2_performance_score(80) == 0.0
+    assert predict.calculate_final_ranking_score(80, 50) == 68.0
+    assert predict.calculate_final_ranking_score(80, 50, alpha=0.5, beta=0.5) == 65.0
+
+
+def test_terms_lookup_invert_clip_and_parameters():
+    formulas = ScoringFormulas.from_dict({"formulas": {
+        "grade": {
+            "offset": 10,
+            "terms": {
+                "label": {"lookup": {"A": 1, "B": 0.5}, "default": 0, "weight": "w_label"},
+                "cost": {"scale": "budget", "invert": True, "clip": [0, 1], "weight": 20},
+            },
+            "defaults": {"w_label": 40, "budget": 100},
+            "multiplier": 2,
+            "clip": [None, 100],
+        }
+    }})
+    inputs = {"label": np.array(["A", "B", "C", "A"]), "cost": np.array([50, 150, -50, 0])}
+    np.testing.assert_array_equal(formulas["grade"](inputs), [100, 60, 60, 100])
+    np.testing.assert_array_equal(formulas["grade"](dict(inputs, budget=200)), [100, 70, 60, 100])
+    np.testing.assert_array_equal(formulas["grade"](inputs, {"w_label": 10}), [60, 30, 60, 80])
+
+
+@pytest.mark.parametrize("spec", [
+    None,
+    {"formulas": {}},
+    {"formulas": {"a": {"terms": {}}}},
+    {"formulas": {"a": {"terms": {"x": 1}, "scale": 2}}},
+    {"formulas": {"a": {"terms": {"x": {"invert": True}}}}},
+    {"formulas": {"a": {"terms": {"x": {"weight": 1, "power": 2}}}}},
+    {"formulas": {"a": {"terms": {"x": "1"}, "clip": [100, 0]}}},
+    {"formulas": {"a": {"terms": {"x": {"weight": 1, "lookup": {}}}}}},
+    {"formulas": {"a": {"terms": {"x": True}}}},
+    {"formulas": {"a": {"terms": {"b": 1}}, "b": {"terms": {"a": 1}}}},
+])
+def test_invalid_formulas(spec):
+    with pytest.raises(ValueError):
+        ScoringFormulas.from_dict(spec)
+
+
+def test_missing_inputs_and_parameters():
+    formulas = ScoringFormulas.from_dict({"formulas": {"a": {"terms": {"x": "w"}}}})
+    with pytest.raises(ValueError, match="input 'x'"):
+        formulas["a"]({})
+    with pytest.raises(ValueError, match="parameter 'w'"):
+        formulas["a"]({"x": 1})
+    with pytest.raises(KeyError):
+        formulas["b"]
+
+
+def test_formula_file_drives_rank_materials(tmp_path, monkeypatch):
+    df = ranked_frame()
+    config = yaml.safe_load((CONFIG_DIR / "material_ranking.yaml").read_text())
+    default = rank_materials(df, config)
+
+    spec = yaml.safe_load(Path(predict.FORMULAS.path).read_text())
+    spec["formulas"]["ranking_score"]["terms"] = {"suit_norm": 1}
+    path = tmp_path / "formulas.yaml"
+    path.write_text(yaml.safe_dump(spec))
+    monkeypatch.setenv("ECOPACK_SCORING_FORMULAS", str(path))
+    custom = load_scoring_formulas()
+    assert custom is load_scoring_formulas() and custom.version != predict.FORMULAS.version
+
+    # The compiled default is untouched; passing the custom set re-ranks by
+    # suitability alone, without any code change
+    assert rank_materials(df, config).equals(default)
+    ranked = rank_materials(df, config, formulas=custom)
+    np.testing.assert_array_equal(ranked["ranking_score"], ranked["suit_norm"])
+    assert not ranked.index.equals(default.index)
+    for product_id, group in ranked.groupby("product_id"):
+        assert group["suit_norm"].is_monotonic_decreasing
@@ -0,0 +1,55 @@
+import sys
+import json
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import predict
+from app import app, cache
+
+PAYLOAD = {
+    "product_name": "Streamed Product",
+    "product_weight_kg": 1.5,
+    "category": "Electronics",
+    "fragility_index": 0.6,
+    "shipping_type": "Air"
+}
+
+
+def read_ndjson(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_predict_streams_rows_with_accept_header():
+    cache.clear()
+    client = app.test_client()
+    expected = client.post("/predict", json=dict(PAYLOAD, exact=True)).get_json()
+
+    cache.clear()
+    response = client.post("/predict", json=dict(PAYLOAD, exact=True),
+                           headers={"Accept": "application/x-ndjson"})
+    assert response.mimetype == "application/x-ndjson"
+    assert response.headers["X-Catalog-Version"] == predict.CATALOG.version
+    assert read_ndjson(response) == expected["predictions"]
+
+    # A response cached by a non-stream call streams the same rows
+    cache.clear()
+    client.post("/predict", json=dict(PAYLOAD, exact=True))
+    before = client.get("/cache/stats").get_json()
+    response = client.post("/predict?stream=1", json=dict(PAYLOAD, exact=True))
+    assert read_ndjson(response) == expected["predictions"]
+    assert response.headers["X-Catalog-Version"] == predict.CATALOG.version
+    assert client.get("/cache/stats").get_json()["hits"] == before["hits"] + 1
+
+
+def test_batch_streams_result_blocks_in_order(monkeypatch):
+    monkeypatch.setattr(predict, "BATCH_CHUNK_SIZE", 2)
+    client = app.test_client()
+    items = [dict(PAYLOAD, product_weight_kg=w) for w in (0.5, 1, 2, 4, 8)]
+    items.insert(2, {"product_name": "Broken"})
+
+    blocks = read_ndjson(client.post("/predict/batch?stream=1", json=items))
+    assert [b["index"] for b in blocks] == list(range(len(items)))
+    assert blocks[2]["status"] == "error"
+
+    batch = client.post("/predict/batch", json=items).get_json()
+    assert blocks == batch["results"]
@@ -0,0 +1,83 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import predict  # noqa: F401  (puts the project root on sys.path)
+from src.recommendation.ranker import rank_materials
+from src.recommendation.ranking_config import RankingConfig, load_ranking_config
+from src.recommendation.streaming_rank import rank_parquet
+from test_ranker import CONFIG_DIR, ranked_frame
+
+
+def write_shuffled(tmp_path, df, seed=3):
+    path = tmp_path / "scored.parquet"
+    df.sample(frac=1, random_state=seed).to_parquet(path, index=False, row_group_size=64)
+    return path
+
+
+@pytest.mark.parametrize("normalize", ["product", "global"])
+@pytest.mark.parametrize("batch_size", [1, 37, 10_000])
+def test_matches_in_memory_ranking(tmp_path, normalize, batch_size):
+    df = ranked_frame(n_products=25, n_materials=12)
+    # Ties across batch boundaries and rows without a product
+    df.loc[df.index[::7], "predicted_cost"] = 50.0
+    df.loc[df.index[:5], "product_id"] = np.nan
+    path = write_shuffled(tmp_path, df)
+    config = load_ranking_config(CONFIG_DIR / "material_ranking.yaml")
+    columns = ["Material ID"]
+
+    streamed = rank_parquet(path, config, normalize=normalize, batch_size=batch_size, columns=columns)
+    full = pd.read_parquet(path)
+    expected = rank_materials(full[[c for c in full.columns if c != "Recyclability (%)"]], config,
+                              normalize=normalize)
+    pd.testing.assert_frame_equal(streamed, expected)
+
+
+def test_single_candidate_and_tied_products(tmp_path):
+    df = ranked_frame(n_products=6, n_materials=5)
+    df = df[(df["product_id"] != 2) | (df["Material ID"] == "MAT_0001")].copy()
+    df.loc[df["product_id"] == 4, "Material_Suitability_Score"] = 60.0
+    path = write_shuffled(tmp_path, df)
+    config = RankingConfig.from_dict({"weights": {"cost": 0.3, "co2": 0.4, "suitability": 0.3},
+                                      "normalization": "product"})
+
+    streamed = rank_parquet(path, config, batch_size=7)
+    full = pd.read_parquet(path)
+    pd.testing.assert_frame_equal(streamed, rank_materials(full[streamed.columns[:4]], config))
+    assert set(streamed["product_id"]) == set(range(6))
+    assert (streamed.loc[streamed["product_id"] == 4, "suit_norm"] == 1.0).all()
+
+
+def test_api_schema_and_no_top_n(tmp_path):
+    path = write_shuffled(tmp_path, ranked_frame())
+    full = pd.read_parquet(path)
+    config = load_ranking_config(CONFIG_DIR / "ranking_weights.yaml")
+    expected = rank_materials(full.drop(columns=["Material ID", "Recyclability_Category"]), config)
+    pd.testing.assert_frame_equal(rank_parquet(path, config, batch_size=50), expected)
+
+    unbounded = RankingConfig.from_dict({"weights": {"cost": 1, "co2": 1, "suitability": 1}})
+    streamed = rank_parquet(path, unbounded, batch_size=50)
+    assert len(streamed) == len(full)
+    pd.testing.assert_frame_equal(streamed, rank_materials(full[streamed.columns[:4]], unbounded))
+
+
+def test_projection_and_errors(tmp_path):
+    path = write_shuffled(tmp_path, ranked_frame())
+    config = load_ranking_config(CONFIG_DIR / "material_ranking.yaml")
+    ranked = rank_parquet(path, config)
+    assert list(ranked.columns) == [
+        "product_id", "predicted_cost", "predicted_co2", "Material_Suitability_Score",
+        "Recyclability_Category", "cost_norm", "co2_norm", "suit_norm", "ranking_score", "rank"
+    ]
+    with pytest.raises(ValueError, match="missing columns"):
+        rank_parquet(path, config, columns=["Material Type"])
+    with pytest.raises(ValueError):
+        rank_parquet(path, config, batch_size=0)
+
+    empty = tmp_path / "empty.parquet"
+    ranked_frame().head(0).to_parquet(empty, index=False)
+    assert rank_parquet(empty, config).empty
@@ -0,0 +1,46 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import numpy as np
+
+import predict  # noqa: F401  (puts the project root on sys.path)
+from src.inference.predictor import EcoPackPredictor
+from src.inference.tree_compiler import CompiledEnsemble, compile_model
+
+
+def test_compiled_forest_matches_sklearn(synthetic_models):
+    pipeline, rf, _, frame = synthetic_models
+    X = pipeline.transform(frame)
+    compiled = compile_model(rf)
+    assert compiled.n_trees == len(rf.estimators_)
+    np.testing.assert_allclose(compiled.predict(X), rf.predict(X), rtol=1e-12, atol=1e-9)
+    np.testing.assert_allclose(compiled.predict(X[0]), rf.predict(X[:1]), rtol=1e-12)
+
+
+def test_compiled_xgboost_matches_booster(synthetic_models):
+    pipeline, _, xgb, frame = synthetic_models
+    X = pipeline.transform(frame).astype(np.float32)
+    X[::5, 2] = np.nan
+    compiled = compile_model(xgb)
+    expected = xgb.predict(X)
+    actual = compiled.predict(X)
+    assert actual.dtype == expected.dtype
+    np.testing.assert_allclose(actual, expected, rtol=1e-5, atol=1e-4)
+
+
+def test_compiled_ensemble_round_trips_through_npz(tmp_path, synthetic_models):
+    pipeline, rf, _, frame = synthetic_models
+    X = pipeline.transform(frame.head(20))
+    compiled = compile_model(rf)
+    compiled.save(tmp_path / "rf.npz")
+    restored = CompiledEnsemble.load(tmp_path / "rf.npz")
+    assert restored.predict(X).tolist() == compiled.predict(X).tolist()
+
+
+def test_predictor_uses_compiled_trees(synthetic_models):
+    pipeline, rf, xgb, frame = synthetic_models
+    library = EcoPackPredictor.from_objects(pipeline, rf, xgb)
+    compiled = EcoPackPredictor.from_objects(pipeline, rf, xgb, compile_trees=True)
+    for expected, actual in zip(library.predict_arrays(frame.head(8)), compiled.predict_arrays(frame.head(8))):
+        np.testing.assert_allclose(actual, expected, rtol=1e-5, atol=1e-4)
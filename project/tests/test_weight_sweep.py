@@ -0,0 +1,153 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+import predict
+from app import app
+from src.recommendation.ranker import rank_materials
+from src.recommendation.scoring_formula import ScoringFormulas, load_scoring_formulas
+from src.recommendation.weight_sweep import weight_sweep, weight_vectors
+from test_ranker import CONFIG_DIR, ranked_frame
+
+PRODUCT = {
+    "product_name": "Test Product",
+    "product_weight_kg": 2.0,
+    "category": "Food",
+    "fragility_index": 0.5,
+    "shipping_type": "Road"
+}
+
+
+def continuous_frame():
+    df = ranked_frame().sample(frac=1, random_state=5)
+    df["predicted_cost"] += np.random.default_rng(5).random(len(df)) * 1e-3
+    return df
+
+
+@pytest.mark.parametrize("normalize", ["product", "global"])
+def test_matches_rank_materials_per_vector(normalize):
+    df = continuous_frame()
+    base = yaml.safe_load((CONFIG_DIR / "material_ranking.yaml").read_text())
+    weights = np.random.default_rng(6).random((40, 3))
+    sweep = weight_sweep(df, weights, base, normalize=normalize)
+    assert sweep.scores.shape == sweep.ranks.shape == (40, len(sweep.index))
+    for k, ranking in enumerate(sweep.rankings(base["top_n"])):
+        config = dict(base, weights=dict(zip(["cost", "co2", "suitability"], weights[k])))
+        expected = rank_materials(df, config, normalize=normalize)
+        pd.testing.assert_index_equal(sweep.index[ranking], expected.index)
+        np.testing.assert_array_equal(sweep.ranks[k, ranking], expected["rank"].to_numpy())
+        np.testing.assert_array_equal(sweep.scores[k, ranking], expected["ranking_score"].to_numpy())
+
+
+def test_sweep_evaluates_the_ranking_formula(tmp_path):
+    df = ranked_frame()
+    spec = yaml.safe_load(Path(predict.FORMULAS.path).read_text())
+    # Not a plain weighted sum: CO2 is clipped and the total rescaled
+    spec["formulas"]["ranking_score"]["terms"]["co2_norm"] = {"clip": [0, 0.5], "weight": "co2"}
+    spec["formulas"]["ranking_score"]["multiplier"] = 100
+    path = tmp_path / "formulas.yaml"
+    path.write_text(yaml.safe_dump(spec))
+    formulas = load_scoring_formulas(path)
+
+    weights = np.random.default_rng(9).random((6, 3))
+    sweep = weight_sweep(df, weights, formulas=formulas)
+    for k, ranking in enumerate(sweep.rankings(3)):
+        config = {"weights": dict(zip(["cost", "co2", "suitability"], weights[k])), "top_n": 3,
+                  "normalization": "product"}
+        expected = rank_materials(df, config, formulas=formulas)
+        pd.testing.assert_index_equal(sweep.index[ranking], expected.index)
+        np.testing.assert_array_equal(sweep.scores[k, ranking], expected["ranking_score"].to_numpy())
+
+    # Weight-free formulas give every vector the same scores
+    spec["formulas"]["ranking_score"] = {"terms": {"suit_norm": 1}}
+    sweep = weight_sweep(df, weights, formulas=ScoringFormulas.from_dict(spec))
+    assert sweep.scores.shape == (6, len(df)) and (sweep.scores == sweep.scores[0]).all()
+
+
+def test_single_candidate_product_is_ranked():
+    df = ranked_frame(n_products=2, n_materials=4)
+    df = df[(df["product_id"] == 0) | (df["Material ID"] == "MAT_0002")]
+    sweep = weight_sweep(df, [[1, 0, 0], [0.2, 0.3, 0.5]])
+    single = sweep.index.get_loc(df.index[df["product_id"] == 1][0])
+    assert sweep.ranks[:, single].tolist() == [1.0, 1.0]
+    assert all(single in ranking for ranking in sweep.rankings(1))
+    assert sweep.stability(1).iloc[single][["first_rate", "mean_rank", "best_rank"]].tolist() == [1.0, 1.0, 1.0]
+
+
+def test_stability_statistics():
+    df = continuous_frame()
+    weights = np.random.default_rng(7).random((25, 3))
+    sweep = weight_sweep(df, weights)
+    stability = sweep.stability(top_n=3)
+    ranks = pd.DataFrame(sweep.ranks, columns=sweep.index)
+    np.testing.assert_allclose(stability["top_n_rate"], (ranks <= 3).mean())
+    np.testing.assert_allclose(stability["first_rate"], (ranks == 1).mean())
+    np.testing.assert_allclose(stability["mean_rank"], ranks.mean())
+    np.testing.assert_allclose(stability["rank_std"], ranks.std(ddof=0))
+    np.testing.assert_array_equal(stability["best_rank"], ranks.min())
+    np.testing.assert_array_equal(stability["worst_rank"], ranks.max())
+    assert (stability["product_id"].to_numpy() == df.loc[stability.index, "product_id"].to_numpy()).all()
+
+
+@pytest.mark.parametrize("weights", [
+    None, [], [[1, 2]], [[1, -1, 0]], [[1, np.inf, 0]], [["a", 1, 1]], [{"price": 1}],
+    [{"co2": 1, "co2_impact": 1}],
+])
+def test_invalid_weights(weights):
+    with pytest.raises(ValueError):
+        weight_vectors(weights)
+
+
+def test_weight_mappings_accept_both_schemas():
+    matrix = weight_vectors([{"cost": 0.2, "co2_impact": 0.3, "sustainability": 0.5}, {"co2": 1}])
+    np.testing.assert_array_equal(matrix, [[0.2, 0.3, 0.5], [0, 1, 0]])
+
+
+def test_predict_sweep_endpoint():
+    client = app.test_client()
+    weights = np.random.default_rng(8).random((300, 3)).round(3).tolist()
+    response = client.post("/predict/sweep", json=dict(PRODUCT, weights=weights, top_n=2))
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["count"] == 300 and data["top_n"] == 2
+    materials = data["materials"]
+    assert len(data["stability"]) == len(materials)
+
+    # Same candidates as /predict, and the same ranking as rank_materials per vector
+    full = client.post("/predict?top_n=1000&exact=1", json=PRODUCT).get_json()["predictions"]
+    assert materials == [p["material"] for p in full]
+    frame = pd.DataFrame({
+        "product_id": 0,
+        "predicted_cost": [p["predicted_cost"] for p in full],
+        "predicted_co2": [p["co2"] for p in full],
+        "Material_Suitability_Score": [p["sustainability_score"] for p in full],
+    })
+    for k in range(5):
+        config = {"weights": dict(zip(["cost", "co2", "suitability"], weights[k])), "top_n": 2}
+        assert data["rankings"][k] == rank_materials(frame, config).index.tolist()
+
+    top_counts = np.zeros(len(materials))
+    for ranking in data["rankings"]:
+        top_counts[ranking] += 1
+    np.testing.assert_allclose([s["top_n_rate"] for s in data["stability"]], (top_counts / 300).round(4))
+
+    assert client.post("/predict/sweep", json=dict(PRODUCT, weights=[[1, 2]])).status_code == 400
+    assert client.post("/predict/sweep", json=dict(PRODUCT, weights=[[1, 1, 1]] * 10001)).status_code == 413
+
+
+def test_predict_sweep_single_candidate():
+    client = app.test_client()
+    # Only one material carries 14 kg: it is the ranking under every vector
+    heavy = dict(PRODUCT, product_weight_kg=14.0)
+    full = client.post("/predict?top_n=1000&exact=1", json=heavy).get_json()["predictions"]
+    assert len(full) == 1
+    data = client.post("/predict/sweep", json=dict(heavy, weights=[[1, 0, 0], [0, 1, 0], [0, 0, 1]])).get_json()
+    assert data["materials"] == [full[0]["material"]]
+    assert data["rankings"] == [[0], [0], [0]]
+    assert data["stability"] == [{"material": full[0]["material"], "top_n_rate": 1.0, "first_rate": 1.0,
+                                  "mean_rank": 1.0, "rank_std": 0.0, "best_rank": 1, "worst_rank": 1}]